@@ -19,6 +19,8 @@ from . import handles
 from . import ui
 from . import keymaps
 from . import gizmo_toolpreset_bar
+from . import draw
+from . import msgbus_dispatch
 from .fn import get_addon_prefs
 
 modules = (
@@ -39,10 +41,20 @@ modules = (
     ui,
     keymaps,
     gizmo_toolpreset_bar,
+    draw,
+)
+
+## Modules without UI, registered in background mode (storyboard generation and rendering batch API)
+background_modules = (
+    properties,
+    preferences,
+    *setup.background_modules,
 )
 
 def register():
     if bpy.app.background:
+        for mod in background_modules:
+            mod.register()
         return
 
     for mod in modules:
@@ -53,10 +65,14 @@ def register():
 
 def unregister():
     if bpy.app.background:
+        for mod in reversed(background_modules):
+            mod.unregister()
         return
 
     for mod in reversed(modules):
         mod.unregister()
 
+    msgbus_dispatch.clear_dispatch_queue()
+
 if __name__ == "__main__":
     register()
@@ -40,23 +40,62 @@ def get_import_method(space) -> str:
     library = bpy.context.preferences.filepaths.asset_libraries.get(params.asset_library_reference)
     return library.import_method if library else 'APPEND'
 
-def load_asset_id(name, data_field, library_path, local_id, link=False):
-    """Return the data-block to instantiate for an asset, None if it could not be loaded.
-    Library assets are appended (or linked), assets of the current file are returned as is"""
-    if local_id is not None:
-        return local_id
-
-    try:
-        with bpy.data.libraries.load(library_path, assets_only=True, link=link) as (data_from, data_to):
-            if name not in getattr(data_from, data_field):
-                return None
-            setattr(data_to, data_field, [name])
-    except Exception as e:
-        print(f'Storytools: Could not load asset "{name}" from "{library_path}": {e}')
+## Data-blocks appended from libraries in this session, reused with 'APPEND_REUSE' import method
+## (library path, data field, asset name) -> appended data-block name
+_appended_ids = {}
+
+def get_appended_id(library_path, data_field, name):
+    """Return the data-block previously appended for this asset, None if it was removed"""
+    id_name = _appended_ids.get((library_path, data_field, name))
+    if id_name is None:
         return None
+    id_data = getattr(bpy.data, data_field).get(id_name)
+    if id_data is None or id_data.library:
+        del _appended_ids[(library_path, data_field, name)]
+        return None
+    return id_data
+
+def load_asset_ids(requests, reuse=False) -> list:
+    """Return the data-blocks to instantiate for a list of assets, loading each library file only once.
+    requests: list of (name, data_field, library_path, local_id, link)
+    reuse: use data-blocks already appended from the same library instead of appending again
+    Return a list of (data-block or None when it could not be loaded, is_existing) in requests order.
+    is_existing is True for assets of the current file and reused data-blocks (to instantiate as copies)"""
+    results = [(None, False)] * len(requests)
+
+    ## (library path, link) -> data field -> [(request index, name)]
+    to_load = {}
+    for i, (name, data_field, library_path, local_id, link) in enumerate(requests):
+        if local_id is not None:
+            results[i] = (local_id, True)
+            continue
+        if reuse and not link and (id_data := get_appended_id(library_path, data_field, name)):
+            results[i] = (id_data, True)
+            continue
+        to_load.setdefault((library_path, link), {}).setdefault(data_field, []).append((i, name))
+
+    for (library_path, link), fields in to_load.items():
+        requested = {}
+        try:
+            with bpy.data.libraries.load(library_path, assets_only=True, link=link) as (data_from, data_to):
+                for data_field, items in fields.items():
+                    available = set(getattr(data_from, data_field))
+                    requested[data_field] = list(dict.fromkeys(name for _i, name in items if name in available))
+                    setattr(data_to, data_field, requested[data_field])
+        except Exception as e:
+            print(f'Storytools: Could not load assets from "{library_path}": {e}')
+            continue
 
-    loaded = getattr(data_to, data_field)
-    return loaded[0] if loaded else None
+        for data_field, items in fields.items():
+            loaded = dict(zip(requested[data_field], getattr(data_to, data_field)))
+            for i, name in items:
+                if (id_data := loaded.get(name)) is None:
+                    continue
+                results[i] = (id_data, False)
+                if not link:
+                    _appended_ids[(library_path, data_field, name)] = id_data.name
+
+    return results
 
 def clear_appended_asset_metadata(id_data):
     """Clear the asset metadata of an appended data-block and of the data it brought along
@@ -132,9 +171,9 @@ def get_view_matrix(scene, rv3d) -> Matrix:
 class STORYTOOLS_OT_asset_add_to_view(Operator):
     bl_idname = "storytools.asset_add_to_view"
     bl_label = "Add Asset Aligned To View"
-    bl_description = "Add active asset to the scene, aligned with adjacent 3D view\
+    bl_description = "Add selected assets to the scene, aligned with adjacent 3D view\
         \nA camera is placed right at view point and becomes the active camera\
-        \nOther assets are placed in front of the view"
+        \nOther assets are placed side by side in front of the view"
     bl_options = {"REGISTER", "UNDO"}
 
     enter_camera : bpy.props.BoolProperty(
@@ -148,26 +187,55 @@ class STORYTOOLS_OT_asset_add_to_view(Operator):
         if not space or space.type != 'FILE_BROWSER' or space.browse_mode != 'ASSETS':
             cls.poll_message_set('Only available in an asset browser')
             return False
-        if not getattr(context, 'asset', None):
+        if not getattr(context, 'asset', None) and not getattr(context, 'selected_assets', None):
             cls.poll_message_set('No active asset')
             return False
         return True
 
+    def instantiate(self, id_data, id_type, is_existing):
+        """Return a new object for a loaded asset data-block
+        Only appended data is cleaned up: an asset of the current file must stay an asset
+        (a copy is cleared instead, its source data is left untouched)"""
+        if id_type == 'COLLECTION':
+            ## Instanced through an empty: the collection itself has no transform
+            if not is_existing:
+                clear_appended_asset_metadata(id_data)
+            ob = bpy.data.objects.new(id_data.name, None)
+            ob.instance_type = 'COLLECTION'
+            ob.instance_collection = id_data
+
+        elif id_type == 'OBJECT':
+            if not is_existing:
+                ob = id_data
+                clear_appended_asset_metadata(ob)
+            else:
+                ## Asset of the current file (or reused): instantiate a copy, sharing data as an Alt+D duplicate
+                ob = id_data.copy()
+                fn.clear_asset_metadata(ob)
+
+        else:
+            ## Object data asset (camera, mesh, grease pencil...): wrap it in a new object
+            ob_data = id_data.copy() if is_existing else id_data
+            fn.clear_asset_metadata(ob_data)
+            ob = bpy.data.objects.new(ob_data.name, ob_data)
+
+        return ob
+
     def execute(self, context):
-        asset = getattr(context, 'asset', None)
-        if not asset:
+        assets = list(getattr(context, 'selected_assets', None) or [])
+        if not assets and (asset := getattr(context, 'asset', None)):
+            assets = [asset]
+        if not assets:
             self.report({'ERROR'}, 'No active asset')
             return {"CANCELLED"}
 
-        ## Asset representation can be invalidated by the library load, read everything needed now
-        asset_name = asset.name
-        id_type = asset.id_type
-        library_path = asset.full_library_path
-        local_id = asset.local_id
+        ## Asset representations can be invalidated by the library load, read everything needed now
+        infos = [(asset.name, asset.id_type, asset.full_library_path, asset.local_id) for asset in assets]
 
-        data_field = ASSET_ID_TYPES.get(id_type)
-        if not data_field:
-            self.report({'ERROR'}, f'Cannot add a "{id_type}" asset in the scene')
+        unsupported = [(name, id_type) for name, id_type, _path, _local_id in infos if id_type not in ASSET_ID_TYPES]
+        infos = [info for info in infos if info[1] in ASSET_ID_TYPES]
+        if not infos:
+            self.report({'ERROR'}, f'Cannot add a "{unsupported[0][1]}" asset in the scene')
             return {"CANCELLED"}
 
         view = get_nearest_view3d(context)
@@ -183,75 +251,77 @@ class STORYTOOLS_OT_asset_add_to_view(Operator):
 
         ## Only a collection can be linked: linked objects are not editable, so they would
         ## ignore the view placement (blender's own asset drop behaves the same way)
-        link = id_type == 'COLLECTION' and get_import_method(context.space_data) == 'LINK'
-
-        id_data = load_asset_id(asset_name, data_field, library_path, local_id, link=link)
-        if id_data is None:
-            source = library_path or 'current file'
-            self.report({'ERROR'}, f'Could not load asset "{asset_name}" from {source}')
-            return {"CANCELLED"}
-
-        ## Only appended data is cleaned up: an asset of the current file must stay an asset
-        ## (a copy is cleared instead, its source data is left untouched)
-        if id_type == 'COLLECTION':
-            ## Instanced through an empty: the collection itself has no transform
-            if local_id is None:
-                clear_appended_asset_metadata(id_data)
-            ob = bpy.data.objects.new(id_data.name, None)
-            ob.instance_type = 'COLLECTION'
-            ob.instance_collection = id_data
-
-        elif id_type == 'OBJECT':
-            if local_id is None:
-                ob = id_data
-                clear_appended_asset_metadata(ob)
+        import_method = get_import_method(context.space_data)
+        requests = [(name, ASSET_ID_TYPES[id_type], library_path, local_id,
+                     id_type == 'COLLECTION' and import_method == 'LINK')
+                    for name, id_type, library_path, local_id in infos]
+
+        ## Libraries are opened once for all assets they hold
+        loaded = load_asset_ids(requests, reuse=import_method == 'APPEND_REUSE')
+
+        new_objects = []
+        failed = []
+        for (name, id_type, library_path, _local_id), (id_data, is_existing) in zip(infos, loaded):
+            if id_data is None:
+                failed.append(f'"{name}" from {library_path or "current file"}')
+                continue
+            ob = self.instantiate(id_data, id_type, is_existing)
+
+            ## Cameras are grouped in the camera collection of the scene, as storytools created ones
+            if ob.type == 'CAMERA':
+                collection = fn.get_camera_collection(scn)
             else:
-                ## Asset of the current file: instantiate a copy, sharing data as an Alt+D duplicate
-                ob = id_data.copy()
-                fn.clear_asset_metadata(ob)
-
-        else:
-            ## Object data asset (camera, mesh, grease pencil...): wrap it in a new object
-            ob_data = id_data.copy() if local_id is not None else id_data
-            fn.clear_asset_metadata(ob_data)
-            ob = bpy.data.objects.new(ob_data.name, ob_data)
-
-        is_camera = ob.type == 'CAMERA'
+                collection = view_layer.active_layer_collection.collection
+            collection.objects.link(ob)
+            new_objects.append(ob)
 
-        ## Cameras are grouped in the camera collection of the scene, as storytools created ones
-        if is_camera:
-            collection = fn.get_camera_collection(scn)
-        else:
-            collection = view_layer.active_layer_collection.collection
-        collection.objects.link(ob)
+        if not new_objects:
+            self.report({'ERROR'}, f'Could not load asset {failed[0]}')
+            return {"CANCELLED"}
 
-        ## Placement: camera goes right at the view point, other assets in front of the view
+        ## Placement: cameras go right at the view point, other assets in front of the view,
+        ## side by side along view horizontal axis when there are several
         view_matrix = get_view_matrix(scn, rv3d)
         _view_loc, view_rot, _view_scale = view_matrix.decompose()
-        ## Keep the asset own scale, only location and rotation are defined by the view
-        _loc, _rot, scale = ob.matrix_world.decompose()
-
-        if is_camera:
-            location = view_matrix.translation
-        else:
-            # TODO: opt: expose initial_distance distance value ?
-            location = view_matrix @ Vector((0.0, 0.0, -scn.storytools_settings.initial_distance))
-            if ob.type == 'GREASEPENCIL':
-                ## Same correction as a new storytools drawing, so the canvas faces the view
-                view_rot = (view_rot.to_matrix().to_4x4() @ Matrix.Rotation(-pi/2, 4, 'X')).to_quaternion()
+        front = [ob for ob in new_objects if ob.type != 'CAMERA']
+        ## Width of each asset (at least 1 unit: collection instances have no dimensions)
+        widths = [max(ob.dimensions.x, 1.0) for ob in front]
+        spacing = 0.2
+        total_width = sum(widths) + spacing * (len(widths) - 1)
+        offsets = {}
+        x = -total_width / 2
+        for ob, width in zip(front, widths):
+            offsets[ob] = x + width / 2
+            x += width + spacing
+
+        for ob in new_objects:
+            ## Keep the asset own scale, only location and rotation are defined by the view
+            _loc, _rot, scale = ob.matrix_world.decompose()
+            rot = view_rot
+            if ob.type == 'CAMERA':
+                location = view_matrix.translation
+            else:
+                # TODO: opt: expose initial_distance distance value ?
+                location = view_matrix @ Vector((offsets[ob], 0.0, -scn.storytools_settings.initial_distance))
+                if ob.type == 'GREASEPENCIL':
+                    ## Same correction as a new storytools drawing, so the canvas faces the view
+                    rot = (view_rot.to_matrix().to_4x4() @ Matrix.Rotation(-pi/2, 4, 'X')).to_quaternion()
 
-        ob.matrix_world = Matrix.LocRotScale(location, view_rot, scale)
+            ob.matrix_world = Matrix.LocRotScale(location, rot, scale)
 
         ## Changing the active object while painting/drawing would break the mode
         active = view_layer.objects.active
-        if ob.name in view_layer.objects and (active is None or active.mode == 'OBJECT'):
-            for other in list(view_layer.objects.selected):
-                other.select_set(False)
-            ob.select_set(True)
-            view_layer.objects.active = ob
-
-        if is_camera:
-            scn.camera = ob
+        if active is None or active.mode == 'OBJECT':
+            selectable = [ob for ob in new_objects if ob.name in view_layer.objects]
+            if selectable:
+                for other in list(view_layer.objects.selected):
+                    other.select_set(False)
+                for ob in selectable:
+                    ob.select_set(True)
+                view_layer.objects.active = selectable[-1]
+
+        if cameras := [ob for ob in new_objects if ob.type == 'CAMERA']:
+            scn.camera = cameras[-1]
             if self.enter_camera:
                 rv3d.view_perspective = 'CAMERA'
 
@@ -259,7 +329,13 @@ class STORYTOOLS_OT_asset_add_to_view(Operator):
             fn.update_ui_prop_index(context)
         area.tag_redraw()
 
-        self.report({'INFO'}, f'{ob.name} Added')
+        if failed or unsupported:
+            skipped = failed + [f'"{name}" ({id_type} type)' for name, id_type in unsupported]
+            self.report({'WARNING'}, f'{len(new_objects)} added, skipped: {", ".join(skipped)}')
+        elif len(new_objects) == 1:
+            self.report({'INFO'}, f'{new_objects[0].name} Added')
+        else:
+            self.report({'INFO'}, f'{len(new_objects)} assets Added')
         return {"FINISHED"}
 
 
@@ -5,9 +5,11 @@ Specify a search term for Alt + Click
 """
 
 import bpy
+import threading
 
 from pathlib import Path
 from bpy.types import Operator
+from bpy.app.handlers import persistent
 
 
 # region area handling
@@ -102,14 +104,33 @@ CATALOG_FILENAME = 'blender_assets.cats.txt'
 ## Nil uuid: catalog_id when browser shows all catalogs
 NIL_CATALOG_ID = '00000000-0000-0000-0000-000000000000'
 
+## Parsed catalog files: catalog file path -> ((mtime, size), catalogs)
+## Libraries can be on slow network mounts: a file is only parsed again when its stat changes
+_catalog_index = {}
+
+def get_catalog_file(library_path) -> Path:
+    return Path(bpy.path.abspath(library_path)) / CATALOG_FILENAME
+
 def read_library_catalogs(library_path) -> list:
-    """Parse the catalog definition file of an asset library.
+    """Parse the catalog definition file of an asset library (cached by file mtime and size).
     Return a list of (uuid, catalog path, simple name), empty when there is no catalog file
     Note: catalogs created in the UI are only written on save (Catalog > Save Catalogs)"""
-    catalog_file = Path(bpy.path.abspath(library_path)) / CATALOG_FILENAME
-    if not catalog_file.is_file():
+    return read_catalog_file(get_catalog_file(library_path))
+
+def read_catalog_file(catalog_file) -> list:
+    """Return parsed catalogs of a catalog definition file, from index if the file did not change
+    (no bpy access: also used from the background refresh thread)"""
+    try:
+        stat = catalog_file.stat()
+    except OSError:
+        _catalog_index.pop(str(catalog_file), None)
         return []
 
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _catalog_index.get(str(catalog_file))
+    if cached and cached[0] == key:
+        return cached[1]
+
     catalogs = []
     try:
         lines = catalog_file.read_text(encoding='utf-8').splitlines()
@@ -128,8 +149,23 @@ def read_library_catalogs(library_path) -> list:
             continue
         catalogs.append((parts[0], parts[1], parts[2] if len(parts) > 2 else ''))
 
+    _catalog_index[str(catalog_file)] = (key, catalogs)
     return catalogs
 
+def refresh_catalog_index(background=True):
+    """Read catalog files of all enabled libraries into the index, in a worker thread if background
+    (paths are resolved here, the thread does not access bpy)"""
+    catalog_files = [get_catalog_file(library.path) for library in get_user_libraries()]
+
+    def refresh():
+        for catalog_file in catalog_files:
+            read_catalog_file(catalog_file)
+
+    if not background:
+        refresh()
+        return
+    threading.Thread(target=refresh, name='stb_asset_catalogs', daemon=True).start()
+
 def find_catalog(names=(), prefix='', libraries=None) -> tuple:
     """Return the (uuid, path) of the first catalog named after one of names, searching every
     enabled library in preferences order, else of the first one starting with prefix.
@@ -154,6 +190,10 @@ def find_catalog(names=(), prefix='', libraries=None) -> tuple:
 
     return fallback
 
+## Results of has_local_object_assets: (name_prefixes, object_types, object count) -> bool
+## Cleared when objects are updated in depsgraph (added, renamed...), on undo and file load
+_local_assets_cache = {}
+
 def has_local_object_assets(name_prefixes=(), object_types=()) -> bool:
     """True when the current file holds an object marked as asset of one of object_types,
     or whose name starts with one of name_prefixes (browser is filtered on objects,
@@ -161,9 +201,24 @@ def has_local_object_assets(name_prefixes=(), object_types=()) -> bool:
     name_prefixes = tuple(prefix.lower() for prefix in name_prefixes)
     object_types = tuple(object_types)
 
-    return any(ob.asset_data
-               and (ob.type in object_types or ob.name.lower().startswith(name_prefixes))
-               for ob in bpy.data.objects)
+    key = (name_prefixes, object_types, len(bpy.data.objects))
+    if (found := _local_assets_cache.get(key)) is not None:
+        return found
+
+    found = _local_assets_cache[key] = any(
+        ob.asset_data
+        and (ob.type in object_types or ob.name.lower().startswith(name_prefixes))
+        for ob in bpy.data.objects)
+    return found
+
+@persistent
+def local_assets_depsgraph_update(scene, depsgraph):
+    if _local_assets_cache and depsgraph.id_type_updated('OBJECT'):
+        _local_assets_cache.clear()
+
+@persistent
+def asset_cache_reset_handler(*args):
+    _local_assets_cache.clear()
 
 def get_asset_sources(kind) -> list:
     """Return the sources the browser cycles through for a kind of asset, in order,
@@ -399,6 +454,24 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    bpy.app.handlers.depsgraph_update_post.append(local_assets_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(asset_cache_reset_handler)
+
+    ## Warm catalog index without blocking startup
+    if not bpy.app.background:
+        bpy.app.timers.register(refresh_catalog_index, first_interval=2.0)
+
 def unregister():
+    if bpy.app.timers.is_registered(refresh_catalog_index):
+        bpy.app.timers.unregister(refresh_catalog_index)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if asset_cache_reset_handler in handlers:
+            handlers.remove(asset_cache_reset_handler)
+    if local_assets_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(local_assets_depsgraph_update)
+    _local_assets_cache.clear()
+    _catalog_index.clear()
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
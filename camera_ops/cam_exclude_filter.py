@@ -15,6 +15,7 @@ from bpy.props import (
     IntProperty
 )
 from bpy.app.handlers import persistent
+from ..msgbus_dispatch import coalesced
 
 # Property Groups for storing exclusion lists
 class STORYTOOLS_PG_excluded_object(PropertyGroup):
@@ -36,7 +37,7 @@ class STORYTOOLS_PG_camera_exclude_props(PropertyGroup):
         name="Enable Exclusions",
         description="Enable object and collection exclusions for this camera",
         default=True,
-        update=lambda self, context: update_exclusion_visibility(context)
+        update=lambda self, context: update_exclusion_visibility(context, tag=True)
     )
     excluded_objects: CollectionProperty(type=STORYTOOLS_PG_excluded_object)
     excluded_collections: CollectionProperty(type=STORYTOOLS_PG_excluded_collection)
@@ -69,7 +70,7 @@ class STORYTOOLS_OT_add_excluded_object_from_selection(Operator):
                 item = cam.exclude_props.excluded_objects.add()
                 item.object = obj
                 
-        update_exclusion_visibility(context)
+        update_exclusion_visibility(context, tag=True)
         return {'FINISHED'}
 
 class STORYTOOLS_OT_search_add_excluded_object(Operator):
@@ -103,7 +104,7 @@ class STORYTOOLS_OT_search_add_excluded_object(Operator):
             item = cam.exclude_props.excluded_objects.add()
             item.object = obj
             
-        update_exclusion_visibility(context)
+        update_exclusion_visibility(context, tag=True)
         return {'FINISHED'}
 
 class STORYTOOLS_OT_remove_excluded_object(Operator):
@@ -128,7 +129,7 @@ class STORYTOOLS_OT_remove_excluded_object(Operator):
             cam.exclude_props.active_object_index = self.index - 1
         else:
             cam.exclude_props.active_object_index = len(cam.exclude_props.excluded_objects) - 1
-        update_exclusion_visibility(context)
+        update_exclusion_visibility(context, tag=True)
         return {'FINISHED'}
 
 class STORYTOOLS_OT_search_add_excluded_collection(Operator):
@@ -181,7 +182,7 @@ class STORYTOOLS_OT_search_add_excluded_collection(Operator):
             item = cam.exclude_props.excluded_collections.add()
             item.collection = col
             
-        update_exclusion_visibility(context)
+        update_exclusion_visibility(context, tag=True)
         return {'FINISHED'}
 
 class STORYTOOLS_OT_remove_excluded_collection(Operator):
@@ -207,7 +208,7 @@ class STORYTOOLS_OT_remove_excluded_collection(Operator):
         else:
             cam.exclude_props.active_collection_index = len(cam.exclude_props.excluded_collections) - 1
 
-        update_exclusion_visibility(context)
+        update_exclusion_visibility(context, tag=True)
         return {'FINISHED'}
 
 # UI Lists
@@ -234,30 +235,33 @@ def is_valid(obj):
     except ReferenceError:
         return False    
 
-# Function to update object visibility based on active camera's exclusion list
-def update_exclusion_visibility(context):
-    """Update visibility of objects based on active camera's exclusion list"""
-    # print('--> in update_exclusion_visibility')
-    
-    # First show all objects from all cameras
-    # show_all_excluded_objects(context)
+## Camera exclusion index, rebuilt only when exclusion lists change (see tag_exclusion_index)
+## scene session_uid -> {'cameras': {camera name: (objects set, collections set)},
+##                       'objects': excluded objects of enabled cameras, 'collections': same for collections}
+_exclusion_index = {}
 
-    ## Maybe less dangerous to use names instead of objects...
-    scn = context.scene
-    current_cam = scn.camera
+## scene session_uid -> (objects set, collections set) hidden by last visibility update
+_applied_exclusions = {}
 
-    if not current_cam or not hasattr(current_cam, 'exclude_props') or not current_cam.exclude_props:
+def tag_exclusion_index(scene=None):
+    """Mark exclusion index to be rebuilt on next visibility update (all scenes if None)
+    Call after any change in camera exclusion lists"""
+    if scene is None:
+        _exclusion_index.clear()
+        _applied_exclusions.clear()
         return
+    _exclusion_index.pop(scene.session_uid, None)
+    _applied_exclusions.pop(scene.session_uid, None)
 
-    ## return if disabled. Doing prevent restoring visibility of object in other cameras, but maybe it's preferable...
-    # if not current_cam.exclude_props.enabled:
-    #     return
-
+def build_exclusion_index(scn):
+    """Cleanup invalid exclusion items and index excluded objects and collections per camera"""
     ## list all objects targeted by exclusion in current scene
-    scene_cameras = [o for o in scn.objects if o.type == 'CAMERA' and o.exclude_props.enabled]
+    scene_cameras = [o for o in scn.objects if o.type == 'CAMERA']
 
     ## Cleanup invalid objects in excluded_objects and excluded_collections
     for cam in scene_cameras:
+        if not cam.exclude_props.enabled:
+            continue
         ## Cleanup objects
         for i in range(len(cam.exclude_props.excluded_objects) -1, -1, -1):
             item = cam.exclude_props.excluded_objects[i]
@@ -274,23 +278,72 @@ def update_exclusion_visibility(context):
                 cam.exclude_props.excluded_collections.remove(i)
                 cam.exclude_props.active_collection_index = min(cam.exclude_props.active_collection_index, len(cam.exclude_props.excluded_collections) - 1)
 
-    all_excluded_objects = [i.object for cam in scene_cameras for i in cam.exclude_props.excluded_objects]
-    all_excluded_collections = [i.collection for cam in scene_cameras for i in cam.exclude_props.excluded_collections]
+    index = {'cameras': {}, 'objects': set(), 'collections': set()}
+    for cam in scene_cameras:
+        objects = {i.object for i in cam.exclude_props.excluded_objects if i.object}
+        collections = {i.collection for i in cam.exclude_props.excluded_collections if i.collection}
+        index['cameras'][cam.name] = (objects, collections)
+        if cam.exclude_props.enabled:
+            index['objects'] |= objects
+            index['collections'] |= collections
 
-    ## early return : doing that will prevent to restore visibility from object in other cameras !
-    # if not all_excluded_objects and not all_excluded_collections:
+    _exclusion_index[scn.session_uid] = index
+    _applied_exclusions.pop(scn.session_uid, None)
+    return index
+
+# Function to update object visibility based on active camera's exclusion list
+def update_exclusion_visibility(context, tag=False):
+    """Update visibility of objects based on active camera's exclusion list
+    Only objects and collections changing state between previous and new camera exclusions are affected
+    tag: exclusion lists were changed, rebuild the index
+    """
+    # print('--> in update_exclusion_visibility')
+    scn = context.scene
+    if tag:
+        tag_exclusion_index(scn)
+
+    current_cam = scn.camera
+
+    if not current_cam or not hasattr(current_cam, 'exclude_props') or not current_cam.exclude_props:
+        return
+
+    ## return if disabled. Doing prevent restoring visibility of object in other cameras, but maybe it's preferable...
+    # if not current_cam.exclude_props.enabled:
     #     return
 
+    index = _exclusion_index.get(scn.session_uid) or build_exclusion_index(scn)
+    if (cam_exclusions := index['cameras'].get(current_cam.name)) is None:
+        ## Camera added to scene after index build
+        index = build_exclusion_index(scn)
+        cam_exclusions = index['cameras'].get(current_cam.name, (set(), set()))
+
+    ## Only excluded items of enabled cameras are affected
+    hidden_objects = cam_exclusions[0] & index['objects']
+    hidden_collections = cam_exclusions[1] & index['collections']
+
+    applied = _applied_exclusions.get(scn.session_uid)
+    if applied is None:
+        ## First update since index build: set state of all excluded items
+        objects, collections = index['objects'], index['collections']
+    else:
+        ## Items changing state between previous and current camera
+        objects = applied[0] ^ hidden_objects
+        collections = applied[1] ^ hidden_collections
+
     ## Then hide objects for current camera if enabled
     ## ? do not affect render state ?
+    ## Only write changed values (any write trigger a depsgraph update)
+    for item, hide in [(obj, obj in hidden_objects) for obj in objects] + [(col, col in hidden_collections) for col in collections]:
+        if not is_valid(item):
+            ## Removed since index build
+            update_exclusion_visibility(context, tag=True)
+            return
+        if item.hide_viewport != hide:
+            item.hide_viewport = hide
+        if item.hide_render != hide:
+            item.hide_render = hide
 
-    current_obj_exclude = [i.object for i in current_cam.exclude_props.excluded_objects]
-    for obj in all_excluded_objects:
-        obj.hide_viewport = obj.hide_render = obj in current_obj_exclude
-    
-    current_col_exclude = [i.collection for i in current_cam.exclude_props.excluded_collections]
-    for col in all_excluded_collections: 
-        col.hide_viewport = col.hide_render = col in current_col_exclude
+    _applied_exclusions[scn.session_uid] = (hidden_objects, hidden_collections)
 
 
 # def show_all_excluded_objects(context):
@@ -324,13 +377,20 @@ def subscribe_to_camera_changes():
         key=subscribe_to,
         owner=msgbus_owner,
         args=(),
-        notify=camera_change_callback,
+        ## Coalesced: update only once for the last camera when switched multiple time per tick
+        notify=coalesced(camera_change_callback),
         options={'PERSISTENT'},
     )
 
+@persistent
+def undo_redo_handler(scene, dummy=None):
+    """Exclusion lists and references may have changed on undo/redo"""
+    tag_exclusion_index()
+
 @persistent
 def load_handler(dummy):
     """Handler called when a new blend file is loaded"""
+    tag_exclusion_index()
     subscribe_to_camera_changes()
     # Update visibility based on active camera
     update_exclusion_visibility(bpy.context)
@@ -362,11 +422,17 @@ def register():
     
     # Register load handler
     bpy.app.handlers.load_post.append(load_handler)
+    bpy.app.handlers.undo_post.append(undo_redo_handler)
+    bpy.app.handlers.redo_post.append(undo_redo_handler)
 
 def unregister():
     # Remove load handler
     if load_handler in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(load_handler)
+    if undo_redo_handler in bpy.app.handlers.undo_post:
+        bpy.app.handlers.undo_post.remove(undo_redo_handler)
+    if undo_redo_handler in bpy.app.handlers.redo_post:
+        bpy.app.handlers.redo_post.remove(undo_redo_handler)
     
     # Clear msgbus subscription
     bpy.msgbus.clear_by_owner(msgbus_owner)
@@ -2,6 +2,8 @@ import bpy
 import blf
 import gpu
 
+from time import perf_counter
+from bpy.app.handlers import persistent
 from mathutils import Vector, Matrix
 from gpu_extras.batch import batch_for_shader
 from gpu_extras.presets import draw_texture_2d
@@ -55,9 +57,7 @@ def stop_callback(self, context):
         if handle := getattr(self, handle_name, None):
             bpy.types.SpaceView3D.draw_handler_remove(handle, 'WINDOW')
 
-    ## Free offscreen
-    if hasattr(self, 'pip_offscreen'):
-        self.pip_offscreen.free()
+    ## PiP offscreen is shared (see get_pip_offscreen), kept for next modal session
 
     context.area.tag_redraw()
 
@@ -373,6 +373,55 @@ def ob_lock_location_cam_draw_panel(self, context):
 
 
 
+## Offscreen buffers of zenith PiP views, reused across modal sessions:
+## (area pointer, width, height) -> [GPUOffScreen, render key of its content (None if not rendered)]
+## Least recently used first (dict order), at most PIP_OFFSCREEN_COUNT buffers kept
+_pip_offscreens = {}
+PIP_OFFSCREEN_COUNT = 4
+
+## Incremented on each depsgraph update (strokes, objects, materials, visibility...), part of PiP render key
+_pip_depsgraph_count = 0
+
+@persistent
+def pip_depsgraph_update(scene, depsgraph):
+    global _pip_depsgraph_count
+    _pip_depsgraph_count += 1
+
+def get_pip_offscreen(area, width, height):
+    '''Return [offscreen, render key] entry of the area for this size, created if missing'''
+    key = (area.as_pointer(), width, height)
+    entry = _pip_offscreens.pop(key, None)
+    if entry is None:
+        if len(_pip_offscreens) >= PIP_OFFSCREEN_COUNT:
+            ## Region was resized or other area, free least recently used buffer
+            _pip_offscreens.pop(next(iter(_pip_offscreens)))[0].free()
+        entry = [gpu.types.GPUOffScreen(width, height), None]
+    ## Move to most recently used
+    _pip_offscreens[key] = entry
+    return entry
+
+def free_pip_offscreens():
+    for offscreen, _render_key in _pip_offscreens.values():
+        offscreen.free()
+    _pip_offscreens.clear()
+
+def pip_redraw_later(self, context, delay):
+    '''Tag area redraw after delay (once), so a skipped PiP render is done when throttle/rest delay is over'''
+    if getattr(self, '_pip_redraw_pending', False):
+        return
+    self._pip_redraw_pending = True
+    area = context.area
+
+    def redraw():
+        try:
+            self._pip_redraw_pending = False
+            area.tag_redraw()
+        except ReferenceError:
+            ## Modal ended or area closed
+            pass
+
+    bpy.app.timers.register(redraw, first_interval=delay)
+
 def zenith_view_callback(self, context):
     """Draw a zenith view (perpendicular to current view) of the active object.
     Displays a picture-in-picture view in the corner of the viewport.
@@ -387,14 +436,14 @@ def zenith_view_callback(self, context):
     - pip_from_camera (bool): If True, use the camera's view instead of the current view
     - pip_object (bool): Object to track (if not set, use the active object or the operator's "self.object")
     - pip_use_crosshair (bool): If True, draw a crosshair at center
+    - pip_drag_quality (int): Quality percentage while view is changing (full quality restored at rest)
+    - pip_refresh_rate (float): Maximum number of offscreen renders per second
 
     Optional:
-    - pip_offscreen: Will be created if not present
     - current_area: Restricts drawing to the operator's original area
 
-    to free offscreen use:
-    if hasattr(self, 'pip_offscreen'):
-        self.pip_offscreen.free()
+    The offscreen render is only done when tracked object, camera, view or frame changed,
+    else the previous render is drawn again. Offscreen buffers are shared (see get_pip_offscreen)
     """
 
     # Restrict to current viewport if specified
@@ -404,6 +453,8 @@ def zenith_view_callback(self, context):
     # Get properties with fallback values
     size = getattr(self, 'pip_size', 0.25) # size as percentage of viewport
     quality = getattr(self, 'pip_quality', 95) # quality percentage
+    drag_quality = getattr(self, 'pip_drag_quality', 50) # quality percentage while moving
+    refresh_rate = getattr(self, 'pip_refresh_rate', 30.0) # max renders per second
     
     ## Use the original position from the object, or default to upper left corner
     # default_position = getattr(self, 'pip_position', (40, context.region.height - 40 - int(context.region.height * size)))
@@ -415,12 +466,6 @@ def zenith_view_callback(self, context):
     from_camera = getattr(self, 'pip_from_camera', False)
     use_crosshair = getattr(self, 'pip_use_crosshair', False)
 
-    # Get or create offscreen
-    if not hasattr(self, 'pip_offscreen'):
-        width = int(context.region.width * size * quality / 100)
-        height = int(context.region.height * size * quality / 100)
-        self.pip_offscreen = gpu.types.GPUOffScreen(width, height)
-
     # Get object's location - use active object or operator's object if available
     if hasattr(self, 'pip_object'):
         obj = self.pip_object
@@ -534,15 +579,60 @@ def zenith_view_callback(self, context):
     proj_matrix[3][2] = -1.0
     proj_matrix[3][3] = 0.0
 
-    # Draw the 3D view to offscreen
-    self.pip_offscreen.draw_view3d(
-        context.scene,
-        context.view_layer,
-        context.space_data,
-        context.region,
-        pip_view_matrix,
-        proj_matrix,
-        do_color_management=False)
+    ## Render offscreen only when something visible changed
+    now = perf_counter()
+    cam = context.scene.camera
+    key = (
+        tuple(tuple(row) for row in pip_view_matrix),
+        tuple(tuple(row) for row in obj.matrix_world),
+        tuple(tuple(row) for row in cam.matrix_world) if cam else None,
+        (cam.data.lens, cam.data.ortho_scale, cam.data.type) if cam else None,
+        context.scene.frame_current,
+        _pip_depsgraph_count,
+        width, height,
+        )
+    if key != getattr(self, '_pip_key', None):
+        ## First draw is considered at rest (full quality)
+        self._pip_changed_time = now if hasattr(self, '_pip_key') else -1.0
+        self._pip_key = key
+
+    ## Lower resolution while dragging, full quality after a short rest
+    rest_delay = 0.15
+    moving = now - self._pip_changed_time < rest_delay
+    render_quality = drag_quality if moving else quality
+    render_size = (max(1, int(width * render_quality / 100)), max(1, int(height * render_quality / 100)))
+    if moving:
+        pip_redraw_later(self, context, rest_delay)
+
+    ## Buffers are shared by area and size: content is checked with the render key stored next to it
+    area_pointer = context.area.as_pointer()
+    render_key = (key, render_size)
+    entry = _pip_offscreens.get((area_pointer, *render_size))
+    if entry is None or entry[1] != render_key:
+        last_entry = _pip_offscreens.get((area_pointer, *getattr(self, '_pip_render_size', ())))
+        elapsed = now - getattr(self, '_pip_render_time', -1.0)
+        if elapsed >= 1.0 / refresh_rate or last_entry is None:
+            # Draw the 3D view to offscreen
+            entry = get_pip_offscreen(context.area, *render_size)
+            entry[0].draw_view3d(
+                context.scene,
+                context.view_layer,
+                context.space_data,
+                context.region,
+                pip_view_matrix,
+                proj_matrix,
+                do_color_management=False)
+            entry[1] = render_key
+            self._pip_render_size = render_size
+            self._pip_render_time = now
+        else:
+            ## Throttled: draw last render and come back later
+            entry = last_entry
+            pip_redraw_later(self, context, 1.0 / refresh_rate - elapsed)
+    else:
+        ## Up to date: move to most recently used
+        get_pip_offscreen(context.area, *render_size)
+    pip_offscreen = entry[0]
 
     # Store original state
     original_blend = gpu.state.blend_get()
@@ -553,7 +643,7 @@ def zenith_view_callback(self, context):
     
     ## !! Drawing in the offscreen buffer does not work !! 
     ## Add extra Visual hints in the offscreen buffer
-    # with self.pip_offscreen.bind():
+    # with pip_offscreen.bind():
     #     ## Draw crosshair at object
     #     crosshair = [
     #         Vector((obj_loc.x - 3.0, obj_loc.y, obj_loc.z)),
@@ -571,7 +661,7 @@ def zenith_view_callback(self, context):
     #     shader.uniform_float("color", (1.0, 0.0, 0.2, 0.8))
     #     batch.draw(shader)
 
-    draw_texture_2d(self.pip_offscreen.texture_color, (x, y), width, height, is_scene_linear_with_rec709_srgb_target=True)
+    draw_texture_2d(pip_offscreen.texture_color, (x, y), width, height, is_scene_linear_with_rec709_srgb_target=True)
 
     ## Shader for all 2D line below
     shader = gpu.shader.from_builtin('UNIFORM_COLOR')
@@ -679,3 +769,12 @@ def zenith_view_callback(self, context):
     gpu.state.blend_set(original_blend)
     gpu.state.depth_test_set(original_depth_test)
     gpu.state.line_width_set(1.0)
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(pip_depsgraph_update)
+
+def unregister():
+    if pip_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(pip_depsgraph_update)
+    free_pip_offscreens()
@@ -90,6 +90,23 @@ def region_to_location(viewcoords, depthcoords) -> Vector:
     return view3d_utils.region_2d_to_location_3d(
         bpy.context.region, bpy.context.space_data.region_3d, viewcoords, depthcoords)
 
+def locations_to_region_array(coords, region=None, rv3d=None) -> np.ndarray:
+    '''Vectorized location_to_region: project a (N, 3) array of world coordinates
+    return a (N, 2) float32 array of region coordinates
+    Points behind the view are not filtered out (location_3d_to_region_2d returns None for those)
+    '''
+    region = region or bpy.context.region
+    rv3d = rv3d or bpy.context.space_data.region_3d
+    coords = np.asarray(coords, dtype=np.float32).reshape(-1, 3)
+    if not len(coords):
+        return np.empty((0, 2), dtype=np.float32)
+    homogeneous = np.hstack((coords, np.ones((len(coords), 1), dtype=np.float32)))
+    proj = homogeneous @ np.array(rv3d.perspective_matrix, dtype=np.float32).T
+    w = proj[:, 3:4]
+    w[w == 0.0] = 1e-6
+    half = np.array((region.width / 2, region.height / 2), dtype=np.float32)
+    return (half + half * proj[:, :2] / w).astype(np.float32)
+
 def reset_draw_settings(context=None):
     '''Reset placement and orientation settings according to addon preferences'''
     context = context or bpy.context
@@ -309,6 +326,19 @@ def any_point_in_box(coords, min_corner, max_corner):
     '''
     return any(min_corner.x <= co.x <= max_corner.x and min_corner.z <= co.z <= max_corner.z for co in coords)
 
+def strokes_in_box_mask(drawing, min_corner, max_corner) -> np.ndarray:
+    '''Vectorized any_point_in_box over all strokes of a drawing
+    return a boolean array, True for strokes with any point within the X-Z box (drawing space)
+    '''
+    offsets = get_curve_offsets(drawing)
+    if len(offsets) < 2:
+        return np.zeros(0, dtype=bool)
+    positions = get_attribute_array(drawing.attributes['position'])
+    in_box = ((positions[:, 0] >= min_corner.x) & (positions[:, 0] <= max_corner.x)
+              & (positions[:, 2] >= min_corner.z) & (positions[:, 2] <= max_corner.z))
+    ## Strokes always have at least one point, so reduceat ranges are never empty
+    return np.logical_or.reduceat(in_box, offsets[:-1])
+
 def to_flatten_pairs(v_list, closed=True) -> list:
     """Take a sequence of item (vector, vertices), return a lists of flattened pairs.
     ex: for continuous coordinate, return segments pairs, result is usable with gpu_shader 'LINES'
@@ -943,6 +973,96 @@ def create_gp_object(
 
     return ob
 
+### ---
+# region Drawing plane fit
+
+## Least-squares plane of drawings (drawing space), fitted on demand and kept
+## until the grease pencil data is reported updated by the depsgraph (or undo/load)
+## data session_uid -> {drawing pointer: (points count, (centroid, normal, max residual))}
+_drawing_planes = {}
+
+def tag_drawing_planes(depsgraph=None):
+    '''Invalidate cached planes of grease pencil data updated in depsgraph (all if None)'''
+    if depsgraph is None:
+        _drawing_planes.clear()
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.GreasePencil):
+            _drawing_planes.pop(update.id.original.session_uid, None)
+
+## Fallback directions to orient fitted normals (drawing space), front axis first
+PLANE_ORIENT_AXES = ((0.0, -1.0, 0.0), (0.0, 0.0, 1.0), (1.0, 0.0, 0.0))
+
+def fit_plane(positions, reference=None):
+    '''Fit a plane on (n, 3) positions with SVD of the centered coordinates
+    reference: direction the normal should point to (SVD sign is arbitrary),
+        fallback to PLANE_ORIENT_AXES when missing or perpendicular to the normal
+
+    return centroid (3,), unit normal (3,) or None when points are aligned (or less than 3), max point distance to plane
+    '''
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    centroid = positions.mean(axis=0)
+    if len(positions) < 3:
+        return centroid, None, 0.0
+    centered = positions - centroid
+    _u, singular, vt = np.linalg.svd(centered, full_matrices=False)
+    if singular[1] <= 1e-9 * max(singular[0], 1e-12):
+        return centroid, None, 0.0
+    normal = vt[2]
+    for direction in ((reference,) if reference is not None else ()) + PLANE_ORIENT_AXES:
+        dot = float(normal @ np.asarray(direction, dtype=np.float64))
+        if abs(dot) > 1e-6:
+            if dot < 0:
+                normal = -normal
+            break
+    return centroid, normal, float(np.abs(centered @ normal).max())
+
+def get_drawing_reference_normal(positions, offsets):
+    '''Cross product normal of three sampled points, as previously used to guess the drawing plane
+    (first point of first, second and last strokes, or three points of the only stroke)
+    '''
+    if len(offsets) > 3:
+        a, b, c = positions[offsets[0]], positions[offsets[1]], positions[offsets[-2]]
+    else:
+        start, pct = offsets[0], offsets[1] - offsets[0]
+        a, b, c = positions[start], positions[start + pct//3], positions[start + pct//3*2]
+    return np.cross(b - a, c - a)
+
+def get_drawing_plane(drawing):
+    '''Return cached least-squares plane of all drawing points (drawing space)
+    Positions are read with a single foreach_get, fit is recomputed only when the drawing changed
+
+    return centroid (3,), unit normal (3,) or None, max residual. None if drawing has no points
+    '''
+    point_count = drawing.attributes.domain_size('POINT')
+    if not point_count:
+        return
+    planes = _drawing_planes.setdefault(drawing.id_data.session_uid, {})
+    entry = planes.get(drawing.as_pointer())
+    if entry is None or entry[0] != point_count:
+        positions = get_attribute_array(drawing.attributes['position'])
+        reference = get_drawing_reference_normal(positions, get_curve_offsets(drawing))
+        entry = planes[drawing.as_pointer()] = (point_count, fit_plane(positions, reference=reference))
+    return entry[1]
+
+def plane_to_world(obj, centroid, normal, residual=0.0):
+    '''Convert a drawing space plane to world space using object matrix
+    return centroid Vector, unit normal Vector (None if normal is None), residual distance in world space
+    '''
+    mat = obj.matrix_world
+    co = mat @ Vector(centroid)
+    if normal is None:
+        return co, None, residual
+    ## Normals are transformed by the inverse transpose (handle non-uniform scale),
+    ## flipped with negative scale to keep the side of a cross product of world points
+    mat3 = mat.to_3x3()
+    world_no = mat3.inverted_safe().transposed() @ Vector(normal)
+    if mat3.determinant() < 0:
+        world_no.negate()
+    if world_no.length == 0:
+        return co, None, residual
+    return co, world_no.normalized(), residual / world_no.length
+
 def get_coplanar_stroke_vector(obj, s, ensure_colplanar=True, tol=0.0003):
     '''Get a GP stroke object and return plane normal vector.
     
@@ -968,47 +1088,39 @@ def get_coplanar_stroke_vector(obj, s, ensure_colplanar=True, tol=0.0003):
     plane_no = ab.cross(ac)#.normalized()
 
     if ensure_colplanar:
-        for p in s.points:
-            if abs(geometry.distance_point_to_plane(mat @ p.position, a, plane_no)) > tol:
-                return
+        ## Distance of all points to plane in a single numpy pass
+        mat_np = np.array(mat, dtype=np.float64)
+        coords = np.array([p.position for p in s.points], dtype=np.float64) @ mat_np[:3, :3].T + mat_np[:3, 3]
+        unit_no = np.array(plane_no.normalized(), dtype=np.float64)
+        if np.abs((coords - np.array(a)) @ unit_no).max() > tol:
+            return
     return plane_no
 
 def get_normal(obj, frame, tol=0.0003):
-    ct =  len(frame.drawing.strokes)
-    if ct == 0:
+    '''Return world unit normal of the least-squares plane of frame strokes (even if not coplanar within tol)
+    oriented like the cross product of sampled points, None if drawing is empty or strokes are aligned
+    '''
+    plane = get_drawing_plane(frame.drawing)
+    if plane is None:
         return
-    if ct < 3:
-        return get_coplanar_stroke_vector(obj, frame.drawing.strokes[0], ensure_colplanar=False)
-    
-    ## Use first point of 3 first strokes
-    mat = obj.matrix_world
-    a = mat @ frame.drawing.strokes[0].points[0].position
-    b = mat @ frame.drawing.strokes[1].points[0].position
-    c = mat @ frame.drawing.strokes[-1].points[0].position
-    ab = b-a
-    ac = c-a
-
-    plane_no = ab.cross(ac)
-    ## Verify coplanar ? # want to return even if it's not...
-    # for p in s.points:
-    #     if abs(geometry.distance_point_to_plane(mat @ p.position, a, plane_no)) > tol:
-    #         return
-    return plane_no
+    return plane_to_world(obj, *plane)[1]
 
 def get_coord(obj, frame):
-    coords = [p.position for s in frame.drawing.strokes for p in s.points]
-    mean_coord = sum(coords, Vector()) / len(coords)
-    return obj.matrix_world @ mean_coord
+    plane = get_drawing_plane(frame.drawing)
+    if plane is None:
+        return
+    return obj.matrix_world @ Vector(plane[0])
 
 def get_frame_coord_and_normal(obj, frame, tol=0.0003):
-    '''Get a GP frame object return normal plane if strokes are coplanar (with a tolerance).
-    return normal vector if coplanar else None
+    '''Get a GP frame object return plane center and normal of strokes (least-squares fit).
+    return (plane_co, plane_no), plane_no is None when drawing is empty or strokes are aligned
     '''
 
-    ## get plane_co
-    plane_co = get_coord(obj, frame)
-
-    plane_no = get_normal(obj, frame, tol=tol)
+    ## Single cached fit for both plane_co and plane_no
+    plane = get_drawing_plane(frame.drawing)
+    if plane is None:
+        return None, None
+    plane_co, plane_no, _residual = plane_to_world(obj, *plane)
 
     # if plane_no:
     #     ## Get bbox center
@@ -1020,6 +1132,188 @@ def get_frame_coord_and_normal(obj, frame, tol=0.0003):
     return plane_co, plane_no
 
 
+### ---
+# region GP bulk attributes
+
+## Drawing attribute data type -> (foreach_get/foreach_set key, components, numpy dtype)
+ATTRIBUTE_TYPE_ITEMS = {
+    'FLOAT': ('value', 1, np.float32),
+    'INT': ('value', 1, np.int32),
+    'INT8': ('value', 1, np.int8),
+    'BOOLEAN': ('value', 1, bool),
+    'FLOAT2': ('vector', 2, np.float32),
+    'INT32_2D': ('value', 2, np.int32),
+    'FLOAT_VECTOR': ('vector', 3, np.float32),
+    'FLOAT_COLOR': ('color', 4, np.float32),
+    'BYTE_COLOR': ('color', 4, np.float32),
+    'QUATERNION': ('value', 4, np.float32),
+    'FLOAT4X4': ('value', 16, np.float32),
+}
+
+def get_attribute_array(attr) -> np.ndarray:
+    '''Read a whole drawing attribute in a numpy array with a single foreach_get
+    return shape (n,) for single component types, (n, components) otherwise
+    '''
+    key, components, dtype = ATTRIBUTE_TYPE_ITEMS[attr.data_type]
+    shape = (len(attr.data),) if components == 1 else (len(attr.data), components)
+    data = np.empty(shape, dtype=dtype)
+    attr.data.foreach_get(key, np.ravel(data))
+    return data
+
+def set_attribute_array(attr, data) -> None:
+    '''Write a whole drawing attribute from a numpy array with a single foreach_set'''
+    key, _components, dtype = ATTRIBUTE_TYPE_ITEMS[attr.data_type]
+    attr.data.foreach_set(key, np.ravel(np.ascontiguousarray(data, dtype=dtype)))
+
+def get_named_attribute_array(drawing, name, domain='POINT', default=None) -> np.ndarray:
+    '''Read a drawing attribute by name,
+    filled with default (or attribute implicit value) when the attribute does not exist'''
+    if (attr := drawing.attributes.get(name)) is not None:
+        return get_attribute_array(attr)
+    if default is None:
+        default = ATTRIBUTE_IMPLICIT_VALUES.get(name, 0)
+    return np.full(drawing.attributes.domain_size(domain), default)
+
+def get_curve_offsets(drawing) -> np.ndarray:
+    '''Return drawing curve offsets as int array (curves count + 1),
+    points of curve i are in range(offsets[i], offsets[i+1])'''
+    offsets = np.empty(len(drawing.curve_offsets), dtype=np.int32)
+    drawing.curve_offsets.foreach_get('value', offsets)
+    return offsets
+
+def ranges_to_indices(starts, sizes) -> np.ndarray:
+    '''Concatenate index ranges [start, start + size) without python loop'''
+    starts = np.asarray(starts, dtype=np.int64)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if not len(sizes):
+        return np.empty(0, dtype=np.int64)
+    return np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+
+## Value of builtin attributes while their attribute layer does not exist
+## (a new attribute layer is zero initialized, existing points must get the implicit value)
+ATTRIBUTE_IMPLICIT_VALUES = {
+    'radius': 0.01,
+    'opacity': 1.0,
+}
+
+def add_strokes_bulk(drawing, positions, sizes, radius=None, cyclic=None, material_index=None) -> int:
+    '''Append strokes with a single add_strokes call, then write each attribute with one foreach_set
+
+    drawing: GP drawing to add strokes to
+    positions: (points, 3) array of all new points (drawing space), stroke after stroke
+    sizes: points count of each new stroke
+    radius: point radius, scalar or (points,) array (None: keep default)
+    cyclic: bool or (strokes,) array (None: keep default)
+    material_index: int or (strokes,) array (None: keep default)
+
+    return index of the first added stroke
+    '''
+    sizes = np.asarray(sizes, dtype=np.int64)
+    first_stroke = drawing.attributes.domain_size('CURVE')
+    if not len(sizes):
+        return first_stroke
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    first_point = drawing.attributes.domain_size('POINT')
+
+    drawing.add_strokes(sizes.tolist())
+
+    values = (
+        ('position', 'FLOAT_VECTOR', 'POINT', first_point, positions),
+        ('radius', 'FLOAT', 'POINT', first_point, radius),
+        ('cyclic', 'BOOLEAN', 'CURVE', first_stroke, cyclic),
+        ('material_index', 'INT', 'CURVE', first_stroke, material_index),
+    )
+    for name, data_type, domain, start, value in values:
+        if value is None:
+            continue
+        attr = drawing.attributes.get(name)
+        if attr is None:
+            attr = drawing.attributes.new(name, data_type, domain)
+            data = get_attribute_array(attr)
+            data[:start] = ATTRIBUTE_IMPLICIT_VALUES.get(name, 0)
+        else:
+            data = get_attribute_array(attr)
+        data[start:] = value
+        set_attribute_array(attr, data)
+
+    drawing.tag_positions_changed()
+    return first_stroke
+
+def add_strokes_from_chains(drawing, chains, matrix=None, radius=None, cyclic=None, material_index=None) -> int:
+    '''Append one stroke per point chain (single add_strokes call and one foreach_set per attribute)
+
+    drawing: GP drawing to add strokes to
+    chains: sequence of point chains, ex: [[vec3, vec3, vec3], [vec3, vec3]]
+    matrix: optional 4x4 matrix applied to all points (ex: world to drawing space)
+    radius, cyclic, material_index: see add_strokes_bulk
+
+    return index of the first added stroke
+    '''
+    sizes = [len(chain) for chain in chains if len(chain)]
+    if not sizes:
+        return drawing.attributes.domain_size('CURVE')
+    positions = np.array([co[:] for chain in chains for co in chain], dtype=np.float32).reshape(-1, 3)
+    if matrix is not None:
+        matrix = np.array(matrix, dtype=np.float32)
+        positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+    return add_strokes_bulk(drawing, positions, sizes,
+                            radius=radius, cyclic=cyclic, material_index=material_index)
+
+def duplicate_strokes(drawing, curve_indices, translations) -> int:
+    '''Append copies of the given strokes in a single add_strokes call and bulk attribute pass.
+    All point and curve attributes are copied (position, radius, opacity, material_index, fill_color...)
+
+    drawing: GP drawing to duplicate strokes into
+    curve_indices: indices of the strokes to duplicate
+    translations: sequence of (x, y, z) offsets (drawing space), one copy of all strokes per offset
+
+    return number of added strokes
+    '''
+    curve_indices = np.asarray(curve_indices, dtype=np.int64)
+    translations = np.asarray(translations, dtype=np.float32).reshape(-1, 3)
+    copies = len(translations)
+    if not len(curve_indices) or not copies:
+        return 0
+
+    offsets = get_curve_offsets(drawing)
+    sizes = np.diff(offsets)[curve_indices]
+    point_indices = ranges_to_indices(offsets[curve_indices], sizes)
+    domain_indices = {'POINT': point_indices, 'CURVE': curve_indices}
+
+    ## Read all attributes before allocation (add_strokes appends new elements at the end of each domain)
+    copied = {}
+    for attr in drawing.attributes:
+        if attr.domain not in domain_indices or attr.data_type not in ATTRIBUTE_TYPE_ITEMS:
+            continue
+        if attr.name.startswith('.'):
+            ## Internal attributes (selection...)
+            continue
+        data = get_attribute_array(attr)
+        new_data = np.tile(data[domain_indices[attr.domain]], (copies,) + (1,) * (data.ndim - 1))
+        if attr.name == 'position':
+            new_data += np.repeat(translations, len(point_indices), axis=0)
+        copied[attr.name] = (data, new_data)
+
+    drawing.add_strokes(np.tile(sizes, copies).tolist())
+
+    for name, (data, new_data) in copied.items():
+        set_attribute_array(drawing.attributes[name], np.concatenate((data, new_data)))
+    drawing.tag_positions_changed()
+    return len(curve_indices) * copies
+
+def translate_strokes(drawing, stroke_offsets) -> None:
+    '''Move strokes of a drawing with a single foreach_get/foreach_set on the position attribute
+    stroke_offsets: (curves count, 3) array, translation applied to all points of each stroke
+    '''
+    offsets = get_curve_offsets(drawing)
+    if len(offsets) < 2:
+        return
+    position_attr = drawing.attributes['position']
+    positions = get_attribute_array(position_attr)
+    positions += np.repeat(np.asarray(stroke_offsets, dtype=np.float32), np.diff(offsets), axis=0)
+    set_attribute_array(position_attr, positions)
+    drawing.tag_positions_changed()
+
 ### ---
 # region Palette
 
@@ -1157,6 +1451,36 @@ def set_stroke_type(brush, stroke_type) -> None:
     if brush and brush.gpencil_settings and brush.gpencil_settings.stroke_type != stroke_type:
         brush.gpencil_settings.stroke_type = stroke_type
 
+## In-memory mirror of INDIVIDUAL per-layer brush pairings (stored as object custom props)
+## object session_uid -> {layer name: [brush reference, stroke type]}
+## Built from custom props on first access, cleared on file load and undo (see handles.py)
+_layer_brush_store = {}
+
+def get_layer_brush_store(ob) -> dict:
+    '''Return the per-layer brush pairings of the object: {layer name: [brush reference, stroke type]}'''
+    store = _layer_brush_store.get(ob.session_uid)
+    if store is None:
+        store = _layer_brush_store[ob.session_uid] = {}
+        for k, v in ob.items():
+            if k.startswith(LAYERBRUSH_PREFIX):
+                store.setdefault(k[len(LAYERBRUSH_PREFIX):], [None, None])[0] = v
+            elif k.startswith(LAYERSTROKE_PREFIX):
+                store.setdefault(k[len(LAYERSTROKE_PREFIX):], [None, None])[1] = v
+    return store
+
+def clear_layer_brush_store() -> None:
+    _layer_brush_store.clear()
+
+def remove_stale_layer_pairings(ob, prefixes) -> None:
+    '''Delete per-layer pairing custom props (with given prefixes) of layers that no longer exists (renamed/deleted)'''
+    layer_names = {l.name for l in ob.data.layers}
+    for prefix in prefixes:
+        for k in [k for k in ob.keys() if k.startswith(prefix) and k[len(prefix):] not in layer_names]:
+            del ob[k]
+    if store := _layer_brush_store.get(ob.session_uid):
+        for name in [name for name in store if name not in layer_names]:
+            del store[name]
+
 def store_layer_brush(scn, ob, layer, mode) -> None:
     '''Store the active gp brush reference + stroke_type for (ob, layer) according to the sync mode.
     INDIVIDUAL: object custom props keyed by layer name. GLOBAL: session dict keyed by layer name
@@ -1177,10 +1501,12 @@ def store_layer_brush(scn, ob, layer, mode) -> None:
             bpy.types.Scene.gp_brush_by_layer = {}
         scn.gp_brush_by_layer[layer.name] = (ref, stroke)
     else: # INDIVIDUAL
-        if ref:
-            ob[LAYERBRUSH_PREFIX + layer.name] = ref
-        if stroke:
-            ob[LAYERSTROKE_PREFIX + layer.name] = stroke
+        ## Only write custom props when pairing changed
+        pairing = get_layer_brush_store(ob).setdefault(layer.name, [None, None])
+        if ref and pairing[0] != ref:
+            ob[LAYERBRUSH_PREFIX + layer.name] = pairing[0] = ref
+        if stroke and pairing[1] != stroke:
+            ob[LAYERSTROKE_PREFIX + layer.name] = pairing[1] = stroke
 
 def restore_layer_brush(scn, ob, layer, mode, skip_brush=False, skip_stroke=False) -> None:
     '''Activate the brush + stroke_type stored for (ob, layer) according to the sync mode.
@@ -1191,8 +1517,7 @@ def restore_layer_brush(scn, ob, layer, mode, skip_brush=False, skip_stroke=Fals
         data = getattr(scn, 'gp_brush_by_layer', {}).get(layer.name)
         ref, stroke = data if data else (None, None)
     else: # INDIVIDUAL
-        ref = ob.get(LAYERBRUSH_PREFIX + layer.name)
-        stroke = ob.get(LAYERSTROKE_PREFIX + layer.name)
+        ref, stroke = get_layer_brush_store(ob).get(layer.name, (None, None))
     if ref and not skip_brush:
         set_brush_by_reference(ref)
     if stroke and not skip_stroke:
@@ -1206,9 +1531,9 @@ def transfer_brush_pairing_to_global(scn, ob) -> None:
         return
     if not hasattr(bpy.types.Scene, 'gp_brush_by_layer'):
         bpy.types.Scene.gp_brush_by_layer = {}
+    store = get_layer_brush_store(ob)
     for l in ob.data.layers:
-        ref = ob.get(LAYERBRUSH_PREFIX + l.name)
-        stroke = ob.get(LAYERSTROKE_PREFIX + l.name)
+        ref, stroke = store.get(l.name, (None, None))
         if ref or stroke:
             scn.gp_brush_by_layer[l.name] = (ref, stroke)
 
@@ -1523,6 +1848,93 @@ def set_gizmo_settings(gz, icon,
     gz.use_draw_offset_scale = True
     # gz.line_width = 1.0 # no affect on 2D gizmo ?
 
+## Toolbar gizmo layouts, computed once per set of inputs (region sizes, ui scale, toolbar settings)
+## layout key -> layout dict (see get_toolbar_layout)
+_toolbar_layouts = {}
+
+## Counters (read from python console to check layout caching)
+## ex: from storytools.fn import toolbar_layout_stats
+## hit: gizmo group already placed with same layout, applied: layout set on gizmos, computed: new layout
+toolbar_layout_stats = {'hit': 0, 'applied': 0, 'computed': 0}
+
+def get_toolbar_layout(context, sections, upline_count=0, gap_size=44, backdrop_size=24, margin=36):
+    '''Return toolbar gizmos layout, computed only when region sizes, ui scale or toolbar settings change
+    sections: gizmo count of each main line section (separator added before each section but the first)
+    upline_count: number of gizmos on the upper line
+
+    return (key, layout) with layout dict:
+        'scale_basis': button backdrop size (reduced when toolbar is compressed)
+        'matrices': matrix_basis of main line gizmos, then upper line gizmos
+        'settings_matrix': matrix_basis of a small button at upper line left
+    '''
+    px_scale = context.preferences.system.ui_scale
+    region = context.region
+    ## Overlapping regions (sidebar, headers, asset shelf) sizes are part of the key
+    key = (tuple(sections), upline_count, gap_size, backdrop_size, margin, px_scale,
+           context.preferences.system.use_region_overlap, region.width,
+           tuple((r.type, r.alignment, r.width, r.height) for r in context.area.regions))
+    layout = _toolbar_layouts.get(key)
+    if layout is not None:
+        return key, layout
+
+    toolbar_layout_stats['computed'] += 1
+    section_separator = int(gap_size / 2) # Fixed at 20 ?
+    count = sum(sections)
+    sidebar_width = next((r.width for r in context.area.regions if r.type == 'UI'), 0)
+
+    ## Using only direct offset
+    bar_width = (count - 1) * (gap_size * px_scale) + (section_separator * 2) * px_scale
+
+    vertical_pos = margin * px_scale + get_header_margin(context, overlap=False)
+    left_pos = region.width / 2 - bar_width / 2
+
+    ## Responsive width adjustment
+    visible_region = region.width - sidebar_width
+    ## Sidebar push control bar to the left
+    overlap = (left_pos + bar_width + section_separator) - visible_region
+    if overlap > 0:
+        left_pos -= overlap
+
+    ## Compress if left side is reached
+    if left_pos < section_separator:
+        out_size = abs(left_pos - section_separator)
+        reduction_factor = visible_region / (visible_region + out_size)
+
+        left_pos = section_separator # Reset left side
+        # Reduce gap_size and section separator, clamped amount (factor of available space)
+        # First reduce button size
+        backdrop_size = max(backdrop_size * reduction_factor, 14)
+        # then gap size
+        gap_size = max(gap_size * reduction_factor, backdrop_size * 2)
+        section_separator = max(section_separator * reduction_factor, gap_size / 2)
+
+    init_left_pos = left_pos
+    next_pos = gap_size * px_scale
+    upline_left_pos = left_pos + (gap_size * px_scale) / 2
+
+    matrices = []
+    for section_index, size in enumerate(sections):
+        if section_index:
+            ## Add separator
+            left_pos += section_separator
+        for _ in range(size):
+            matrices.append(Matrix.Translation((left_pos + (len(matrices) * next_pos), vertical_pos, 0)))
+
+    upline_pos = vertical_pos + (backdrop_size * px_scale) * 2
+    matrices += [Matrix.Translation((upline_left_pos + (i * next_pos), upline_pos, 0)) for i in range(upline_count)]
+
+    layout = {
+        'scale_basis': backdrop_size,
+        'matrices': matrices,
+        'settings_matrix': Matrix.Translation((init_left_pos - section_separator/1.5, upline_pos - (section_separator/3), 0)),
+        }
+
+    ## Sizes change continuously when resizing regions, keep only recent layouts
+    if len(_toolbar_layouts) > 64:
+        _toolbar_layouts.clear()
+    _toolbar_layouts[key] = layout
+    return key, layout
+
 def circle_2d(x, y, radius, segments):
     m = (1.0 / (segments - 1)) * (pi * 2)
     
@@ -1854,6 +2266,55 @@ def list_attr(obj, rna_path_step, ct=0, data=None, recursion_limit=0, get_defaul
     return data
 
 
+### ---
+# region World bounds cache
+
+## World axis-aligned bound box per object, computed on demand and kept
+## until the object (or its data) is reported updated by the depsgraph or frame changes
+## object session_uid -> (data session_uid, frame, min (3,), max (3,))
+_world_bounds = {}
+
+def tag_world_bounds(depsgraph=None):
+    '''Invalidate cached world bounds of objects updated in depsgraph (all objects if None)'''
+    if depsgraph is None:
+        _world_bounds.clear()
+        return
+
+    for update in depsgraph.updates:
+        id_data = update.id
+        uid = id_data.original.session_uid
+        if isinstance(id_data, bpy.types.Object):
+            if update.is_updated_transform or update.is_updated_geometry:
+                _world_bounds.pop(uid, None)
+        elif update.is_updated_geometry:
+            ## Data edited (drawing, mesh...): invalidate all users
+            for ob_uid in [ob_uid for ob_uid, entry in _world_bounds.items() if entry[0] == uid]:
+                del _world_bounds[ob_uid]
+
+def get_object_world_bounds(ob, frame):
+    '''Return cached world bound box (min, max) numpy arrays of one object'''
+    entry = _world_bounds.get(ob.session_uid)
+    if entry is None or entry[1] != frame:
+        corners = np.array(ob.bound_box, dtype=np.float64)
+        mat = np.array(ob.matrix_world, dtype=np.float64)
+        world_corners = corners @ mat[:3, :3].T + mat[:3, 3]
+        entry = _world_bounds[ob.session_uid] = (ob.data.session_uid if ob.data else None,
+                                                 frame,
+                                                 world_corners.min(axis=0),
+                                                 world_corners.max(axis=0))
+    return entry[2], entry[3]
+
+def get_objects_world_bounds(objects, scene=None):
+    '''Return world bound box (min, max) numpy arrays enclosing all objects
+    Only objects updated since last call are recomputed'''
+    frame = (scene or bpy.context.scene).frame_current
+    mins = np.empty((len(objects), 3), dtype=np.float64)
+    maxs = np.empty((len(objects), 3), dtype=np.float64)
+    for i, ob in enumerate(objects):
+        mins[i], maxs[i] = get_object_world_bounds(ob, frame)
+    return mins.min(axis=0), maxs.max(axis=0)
+
+
 def frame_objects(context, target='NONE', objects=None, apply=True):
     '''frame objects in view using BBox
     target (str): string to define what to frame (ALL: GP object + Camera, GP: GP object, ACTIVE: active object)
@@ -1884,25 +2345,19 @@ def frame_objects(context, target='NONE', objects=None, apply=True):
     ## Trying a full homemade method
 
     # calculate x/y Bbox
-    global_bbox = [ob.matrix_world @ Vector(v) for ob in objects for v in ob.bound_box]
-    # global_bbox_center = Vector(np.mean(global_bbox, axis=0))
-    sorted_x = sorted(global_bbox,key = lambda x : x.x)
-    sorted_y = sorted(global_bbox,key = lambda x : x.y)
-    sorted_z = sorted(global_bbox,key = lambda x : x.z)
-
-    down_left = Vector((sorted_x[0].x, sorted_y[0].y, sorted_z[0].z))
-    top_right = Vector((sorted_x[-1].x, sorted_y[-1].y, sorted_z[-1].z))
+    bbox_min, bbox_max = get_objects_world_bounds(objects, scene=context.scene)
+    down_left = Vector(bbox_min)
+    top_right = Vector(bbox_max)
     
     global_bbox_center = (down_left + top_right) / 2
-    # bbox_2d = [sorted_x[0].x, sorted_x[-1].x, sorted_y[0].y, sorted_y[-1].y]
 
     ## Debug
     # context.scene.cursor.location = down_left
     # fn.empty_at(down_left, name='DL', size=0.2)
     # fn.empty_at(top_right, name='TR', size=0.2)
 
-    width = sorted_x[-1].x - sorted_x[0].x
-    height = sorted_y[-1].y - sorted_y[0].y
+    width = top_right.x - down_left.x
+    height = top_right.y - down_left.y
     val = width if width > height else height
     
     if target == 'ACTIVE':
@@ -75,6 +75,9 @@ class STORYTOOLS_GGT_toolbar(GizmoGroup):
         return not fn.is_minimap_viewport(context)
 
     def setup(self, context):
+        ## Key of the layout applied in draw_prepare
+        self.layout_key = None
+
         ## --- Object
 
         self.object_gizmos = []
@@ -241,51 +244,12 @@ class STORYTOOLS_GGT_toolbar(GizmoGroup):
     def draw_prepare(self, context):
         prefs = get_addon_prefs()
         settings = context.scene.storytools_settings
-        gap_size = prefs.toolbar_gap_size
-        backdrop_size = prefs.toolbar_backdrop_size
-        
-        section_separator = int(gap_size / 2) # Fixed at 20 ?
-        px_scale = context.preferences.system.ui_scale
         hide_gizmos = not settings.show_session_toolbar or not context.space_data.show_gizmo
         for gz in self.gizmos:
             gz.hide = hide_gizmos
         if hide_gizmos:
             return
 
-        region = context.region
-        # count = len(self.gizmos) # Wrong with gizmo added out of main line (GP gizmos)
-        count = len(self.object_gizmos + self.camera_gizmos + self.interact_gizmos)
-        sidebar_width = next((r.width for r in context.area.regions if r.type == 'UI'), 0)
-
-        ## Using only direct offset
-        bar_width = (count - 1) * (gap_size * px_scale) + (section_separator * 2) * px_scale
-
-        vertical_pos = prefs.toolbar_margin * px_scale + fn.get_header_margin(context, overlap=False)
-        left_pos = region.width / 2 - bar_width / 2
-
-        ## Responsive width adjustment
-        visible_region = region.width - sidebar_width
-        ## Sidebar push control bar to the left
-        overlap = (left_pos + bar_width + section_separator) - visible_region
-        if overlap > 0:
-            left_pos -= overlap
-        
-        ## Compress if left side is reached
-        if left_pos < section_separator:
-            out_size = abs(left_pos - section_separator)
-            reduction_factor = visible_region / (visible_region + out_size)
-            
-            left_pos = section_separator # Reset left side
-            # Reduce gap_size and section separator, clamped amount (factor of available space)
-            # First reduce button size
-            backdrop_size = max(backdrop_size * reduction_factor, 14)
-            # then gap size
-            gap_size = max(gap_size * reduction_factor, backdrop_size * 2)
-            section_separator = max(section_separator * reduction_factor, gap_size / 2)
-
-        init_left_pos = left_pos
-        next_pos = gap_size * px_scale
-
         ## Prefs gizmo colors
         obj_color = prefs.object_gz_color
         obj_color_hl = [i + 0.1 for i in obj_color]
@@ -296,54 +260,47 @@ class STORYTOOLS_GGT_toolbar(GizmoGroup):
         gp_color = prefs.gp_gz_color
         gp_color_hl = [i + 0.1 for i in gp_color]
 
-        upline_left_pos = left_pos + (gap_size * px_scale) / 2
-
-        for i, gz in enumerate(self.gizmos):
-            gz.scale_basis = backdrop_size
-            if gz in self.object_gizmos:
-                gz.color = obj_color
-                gz.color_highlight = obj_color_hl
-
-            if gz in self.camera_gizmos:
-                if gz == self.camera_gizmos[0]:
-                    ## Add separator
-                    left_pos += section_separator
-                gz.color = cam_color
-                gz.color_highlight = cam_color_hl
-
-            if gz in self.interact_gizmos:
-                if gz == self.interact_gizmos[0]:
-                    ## Add separator
-                    left_pos += section_separator
-                gz.color = obj_color
-                gz.color_highlight = obj_color_hl
-
-            ## Matrix world is readonly
-            gz.matrix_basis = Matrix.Translation((left_pos + (i * next_pos), vertical_pos, 0))
-
-            ## this loop actualy set gz.scale_basis = backdrop_size on gp_gizmos as well
-
-        ## --- Set upper line
+        ## Positions are recomputed only when region sizes, ui scale or toolbar prefs change
+        layout_key, layout = fn.get_toolbar_layout(
+            context,
+            (len(self.object_gizmos), len(self.camera_gizmos), len(self.interact_gizmos)),
+            upline_count=len(self.gpencil_gizmos),
+            gap_size=prefs.toolbar_gap_size,
+            backdrop_size=prefs.toolbar_backdrop_size,
+            margin=prefs.toolbar_margin)
+        layout_key = (layout_key, obj_color[:], cam_color[:], gp_color[:])
+
+        if self.layout_key == layout_key:
+            fn.toolbar_layout_stats['hit'] += 1
+        else:
+            fn.toolbar_layout_stats['applied'] += 1
+            self.layout_key = layout_key
+            main_gizmos = self.object_gizmos + self.camera_gizmos + self.interact_gizmos
+            for gz, matrix in zip(main_gizmos + self.gpencil_gizmos, layout['matrices']):
+                gz.scale_basis = layout['scale_basis']
+                ## Matrix world is readonly
+                gz.matrix_basis = matrix
+
+            for gizmos, color, color_hl in (
+                (self.object_gizmos, obj_color, obj_color_hl),
+                (self.camera_gizmos, cam_color, cam_color_hl),
+                (self.interact_gizmos, obj_color, obj_color_hl),
+                (self.gpencil_gizmos, gp_color, gp_color_hl),
+                ):
+                for gz in gizmos:
+                    gz.color = color
+                    gz.color_highlight = color_hl
+
+            ## Re-set position of GP settiong Gizmo button
+            self.gz_gp_setting.scale_basis = 10
+            self.gz_gp_setting.matrix_basis = layout['settings_matrix']
+
+        ## --- Upper line visibility
 
         gpencil_hide_state = not context.object or context.object.type != 'GREASEPENCIL'
-
-        ## Second line at center        
-        # gp_bar_width = (len(self.gpencil_gizmos) - 1) * (gap_size * px_scale) # + (section_separator * 2) * px_scale
-        # middle = visible_region / 2
-        # upline_left_pos = middle - gp_bar_width / 2
-
-        vertical_pos = vertical_pos + (backdrop_size * px_scale) * 2
-        for i, gz in enumerate(self.gpencil_gizmos):
-            gz.color = gp_color
-            gz.color_highlight = gp_color_hl
+        for gz in self.gpencil_gizmos:
             gz.hide = gpencil_hide_state
 
-            gz.matrix_basis = Matrix.Translation((upline_left_pos + (i * next_pos), vertical_pos, 0))
-
-        ## Re-set position of GP settiong Gizmo button
-        self.gz_gp_setting.scale_basis = 10
-        self.gz_gp_setting.matrix_basis = Matrix.Translation((init_left_pos - section_separator/1.5, vertical_pos-(section_separator/3), 0)).copy()
-
         red = (0.5, 0.1, 0.1)
         red_hl = (0.7, 0.2, 0.2)
         ## Show color when out of cam view ? : context.space_data.region_3d.view_perspective != 'CAMERA'
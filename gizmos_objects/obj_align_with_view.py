@@ -225,10 +225,14 @@ class STORYTOOLS_OT_align_view_to_object(Operator):
                 if not ob.data.layers.active:
                     bpy.ops.view3d.view_axis(align_active=True, type='FRONT', relative=False)
                 else:
-                    _co, no = fn.get_frame_coord_and_normal(ob, ob.data.layers.active.current_frame())
-                    
-                    ## Align with 
-                    align_view_to_vector(-no) # inverted ? (probably not always right)
+                    frame = ob.data.layers.active.current_frame()
+                    no = fn.get_frame_coord_and_normal(ob, frame)[1] if frame else None
+                    if no is None:
+                        ## Empty or aligned strokes, no plane to guess
+                        bpy.ops.view3d.view_axis(align_active=True, type='FRONT', relative=False)
+                    else:
+                        ## Align with 
+                        align_view_to_vector(-no) # inverted ? (probably not always right)
 
                 ## Compare with view vector to align with closest side ?
                 # view_vec = context.space_data.region_3d.view_rotation @ Vector((0,0,1))
@@ -1,4 +1,5 @@
 import bpy
+import numpy as np
 
 from mathutils import Vector, Matrix
 from bpy.props import (FloatProperty,
@@ -9,6 +10,7 @@ from bpy.props import (FloatProperty,
                         PointerProperty,
                         CollectionProperty)
 from bpy.types import Operator
+from bpy.app.handlers import persistent
 
 from .. import fn
 
@@ -24,6 +26,62 @@ def check_for_frames(ob, active_only=True):
 
     return False
 
+### ---
+# region Keyframe index
+
+## Sorted keyframe numbers and types per layer, built on first jump and dropped when
+## the grease pencil data is updated (keyframes added, moved, removed, retyped...)
+## data session_uid -> {layer name: {'numbers': array, 'types': array, key type: filtered numbers}}
+_keyframe_index = {}
+
+def get_layer_keyframes(layer, key_type='ALL'):
+    '''Return sorted frame numbers array of layer keyframes, filtered by keyframe type'''
+    layers = _keyframe_index.setdefault(layer.id_data.session_uid, {})
+    entry = layers.get(layer.name)
+    if entry is None:
+        numbers = np.array([f.frame_number for f in layer.frames], dtype=np.int32)
+        types = np.array([f.keyframe_type for f in layer.frames])
+        order = np.argsort(numbers, kind='stable')
+        entry = layers[layer.name] = {'numbers': numbers[order], 'types': types[order]}
+
+    if key_type == 'ALL':
+        return entry['numbers']
+    if (numbers := entry.get(key_type)) is None:
+        numbers = entry[key_type] = entry['numbers'][entry['types'] == key_type]
+    return numbers
+
+def get_keyframe_type_at(layer, frame):
+    '''Return keyframe type of layer keyframe at frame, None if there is no key'''
+    get_layer_keyframes(layer)
+    entry = _keyframe_index[layer.id_data.session_uid][layer.name]
+    i = np.searchsorted(entry['numbers'], frame)
+    if i < len(entry['numbers']) and entry['numbers'][i] == frame:
+        return str(entry['types'][i])
+    return None
+
+def get_surrounding_keyframes(layer, frame, key_type='ALL'):
+    '''Return (previous, next) keyframe numbers around frame on layer (None when missing)'''
+    numbers = get_layer_keyframes(layer, key_type)
+    i = np.searchsorted(numbers, frame, side='left')
+    j = np.searchsorted(numbers, frame, side='right')
+    prev_frame = int(numbers[i - 1]) if i > 0 else None
+    next_frame = int(numbers[j]) if j < len(numbers) else None
+    return prev_frame, next_frame
+
+def clear_keyframe_index():
+    _keyframe_index.clear()
+
+@persistent
+def keyframe_index_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.GreasePencil):
+            _keyframe_index.pop(update.id.original.session_uid, None)
+
+@persistent
+def keyframe_index_reset_handler(*args):
+    clear_keyframe_index()
+
+# endregion
 
 ## Ops partially copied from GP Toolbox (Public, GPL, same author ^^)
 class STORYTOOLS_OT_greasepencil_frame_jump(Operator):
@@ -139,9 +197,6 @@ class STORYTOOLS_OT_greasepencil_frame_jump(Operator):
         current = context.scene.frame_current
         p = n = None
 
-        mins = []
-        maxs = []
-
         ## Filter key_type according to preferences
         key_type = self.keyframe_type
         if key_type == 'FILTERED':
@@ -150,26 +205,12 @@ class STORYTOOLS_OT_greasepencil_frame_jump(Operator):
         ## Filter key_type by hovered one
         if key_type == 'CURRENT':
             ## Find current hover type (fallback to all)
-            key_type = next((f.keyframe_type for l in gpl for f in l.frames if f.frame_number == current), 'ALL')
-
-        for l in gpl:
-            for f in l.frames:
-                # keyframe type filter
-                if key_type != 'ALL' and key_type != f.keyframe_type:
-                    continue
-
-                if f.frame_number < current:
-                    p = f.frame_number
-                if f.frame_number > current:
-                    n = f.frame_number
-                    break
+            key_type = next((kt for l in gpl if (kt := get_keyframe_type_at(l, current)) is not None), 'ALL')
 
-            mins.append(p)
-            maxs.append(n)
-            p = n = None
-
-        mins = [i for i in mins if i is not None]
-        maxs = [i for i in maxs if i is not None]
+        ## Bisect in cached sorted keyframes of each layer
+        surrounding = [get_surrounding_keyframes(l, current, key_type) for l in gpl]
+        mins = [prev_frame for prev_frame, _next_frame in surrounding if prev_frame is not None]
+        maxs = [next_frame for _prev_frame, next_frame in surrounding if next_frame is not None]
 
         if mins:
             p = max(mins)
@@ -275,6 +316,17 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    bpy.app.handlers.depsgraph_update_post.append(keyframe_index_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(keyframe_index_reset_handler)
+
 def unregister():
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if keyframe_index_reset_handler in handlers:
+            handlers.remove(keyframe_index_reset_handler)
+    if keyframe_index_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(keyframe_index_depsgraph_update)
+    clear_keyframe_index()
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
\ No newline at end of file
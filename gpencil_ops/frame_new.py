@@ -1,4 +1,5 @@
 import bpy
+import numpy as np
 
 from mathutils import Vector, Matrix
 
@@ -7,42 +8,83 @@ from bpy.props import BoolProperty
 
 from .. import fn
 
-def add_frame(available_layers, frame_number, reference_num=None, duplicate=False):
+def get_layers_frame_numbers(layers):
+    '''Return list of sorted frame numbers array for each layer (read once, reused by add/offset functions)'''
+    return [np.sort(np.array([f.frame_number for f in l.frames], dtype=np.int32)) for l in layers]
+
+def add_frame(available_layers, frame_number, reference_num=None, duplicate=False, layers_frame_numbers=None):
     """On available layers list, add frame at frame_number
     if reference frame number is passed, look for 
+    layers_frame_numbers: sorted frame numbers of each layer (see get_layers_frame_numbers), read from layers if not passed
     """
     if reference_num is None:
         reference_num = frame_number
+    if layers_frame_numbers is None and duplicate:
+        layers_frame_numbers = get_layers_frame_numbers(available_layers)
     
-    for l in available_layers:
+    for i, l in enumerate(available_layers):
         if not duplicate:
             ## Simple add
             l.frames.new(frame_number=frame_number)
             l.frames.update()
             continue
 
-        ## Case of duplication
-        prev_frame = next((f for f in reversed(l.frames) if f.frame_number <= reference_num), None)
+        ## Case of duplication: bisect for previous key
+        numbers = layers_frame_numbers[i]
+        prev_index = np.searchsorted(numbers, reference_num, side='right') - 1
         
-        if prev_frame is None:
+        if prev_index < 0:
             # New plain key
             l.frames.new(frame_number=frame_number)
 
         else:
             # Copy from previous key
-            l.frames.copy(prev_frame.frame_number, frame_number)
+            l.frames.copy(int(numbers[prev_index]), frame_number)
         
         l.frames.update()
 
-def apply_offset_at_frame(available_layers, frame_number, offset):
-    '''Apply offset value on frames in layer list where frames >= frame_number'''
-    for layer in available_layers:
-        for frame in reversed(layer.frames):
-            if frame.frame_number >= frame_number:
-                if bpy.app.version < (4, 4, 0):
-                    frame.frame_number = frame.frame_number + offset
-                else:
-                    layer.frames.move(frame.frame_number, frame.frame_number + offset)
+def apply_offset_at_frame(available_layers, frame_number, offset, layers_frame_numbers=None):
+    '''Apply offset value on frames in layer list where frames >= frame_number
+    New frame numbers of all layers are computed at once, then frames are moved
+    in an order where a moved key never lands on a key still to be moved
+    (from last frame for positive offset, from first frame for negative offset)
+    A key is left in place if a non-moved key already exists at its destination
+
+    return updated layers_frame_numbers
+    '''
+    if layers_frame_numbers is None:
+        layers_frame_numbers = get_layers_frame_numbers(available_layers)
+
+    updated_frame_numbers = []
+    for layer, numbers in zip(available_layers, layers_frame_numbers):
+        sources = numbers[numbers >= frame_number]
+        if offset > 0:
+            ## All moved keys shift by the same amount: no collision starting from last
+            sources = sources[::-1]
+        else:
+            ## Negative offset can collide with keys before frame_number (or keys left in place)
+            occupied = set(numbers.tolist())
+            valid = []
+            for src in sources.tolist():
+                if src + offset in occupied:
+                    continue
+                occupied.discard(src)
+                occupied.add(src + offset)
+                valid.append(src)
+            sources = np.array(valid, dtype=np.int32)
+
+        if bpy.app.version < (4, 4, 0):
+            frames = {f.frame_number: f for f in layer.frames}
+            for src in sources.tolist():
+                frames[src].frame_number = src + offset
+        else:
+            for src in sources.tolist():
+                layer.frames.move(src, src + offset)
+
+        numbers = numbers.copy()
+        numbers[np.isin(numbers, sources)] += offset
+        updated_frame_numbers.append(np.sort(numbers))
+    return updated_frame_numbers
 
 class STORYTOOLS_OT_new_frame(Operator):
     bl_idname = "storytools.new_frame"
@@ -104,8 +146,11 @@ class STORYTOOLS_OT_new_frame(Operator):
         elif target_layer == 'VISIBLE':
             layer_pool = [l for l in context.object.data.layers if not l.hide]
 
+        ## Sorted frame numbers per layer, read once
+        layers_frame_numbers = get_layers_frame_numbers(layer_pool)
+
         ## All frames (on all unlocked layers)
-        frames_nums = sorted(set([f.frame_number for l in layer_pool for f in l.frames]))
+        frames_nums = np.unique(np.concatenate(layers_frame_numbers)).tolist() if layers_frame_numbers else []
 
         current = context.scene.frame_current
 
@@ -114,7 +159,7 @@ class STORYTOOLS_OT_new_frame(Operator):
 
             ## Apply gap offset from previous frame ?
 
-            add_frame(layer_pool, current, duplicate=self.duplicate)
+            add_frame(layer_pool, current, duplicate=self.duplicate, layers_frame_numbers=layers_frame_numbers)
 
             if self.offset_next_frames:
                 ## Offset next frame to respect gap (if needed)
@@ -128,6 +173,7 @@ class STORYTOOLS_OT_new_frame(Operator):
                     if prev_frame_num is not None:
                         missing_offset = min((next_frame_num - prev_frame_num) - (next_frame_num - current), missing_offset)
 
+                    ## Frames numbers changed with new frame at current
                     apply_offset_at_frame(layer_pool, next_frame_num, missing_offset)
                     
                     ## IDEA ? Should offset affect spa-sequencer subsequents in-out values in scene ?...
@@ -154,10 +200,10 @@ class STORYTOOLS_OT_new_frame(Operator):
                     ## Optionnaly force exact gap between new and next
                     # offset = gap + max(current_gap, gap) 
 
-                    apply_offset_at_frame(layer_pool, current + 1, offset)
+                    layers_frame_numbers = apply_offset_at_frame(layer_pool, current + 1, offset, layers_frame_numbers)
 
             new_num = current + gap
-            add_frame(layer_pool, new_num, reference_num=current, duplicate=self.duplicate)
+            add_frame(layer_pool, new_num, reference_num=current, duplicate=self.duplicate, layers_frame_numbers=layers_frame_numbers)
             bpy.context.scene.frame_set(new_num)
             self.report({'INFO'}, f'Create frame(s), jumping {new_num - current} forward')
             return {'FINISHED'}
@@ -194,7 +240,7 @@ class STORYTOOLS_OT_new_frame(Operator):
             self.report({'ERROR'}, f'Error, a frame is already at {new_num}')
             return {'CANCELLED'}
 
-        add_frame(layer_pool, new_num, reference_num=current, duplicate=self.duplicate)
+        add_frame(layer_pool, new_num, reference_num=current, duplicate=self.duplicate, layers_frame_numbers=layers_frame_numbers)
 
         ## Jump at frame
         
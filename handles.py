@@ -6,12 +6,33 @@ from .fn import (get_addon_prefs,
                  restore_layer_brush,
                  store_layer_material,
                  restore_layer_material,
-                 brush_sync_suppressed)
+                 brush_sync_suppressed,
+                 clear_layer_brush_store,
+                 remove_stale_layer_pairings,
+                 tag_drawing_planes)
+from .msgbus_dispatch import coalesced
 
 ## Tracks the previously active layer as (object_name, layer_name) so a layer change can
 ## attribute the outgoing layer's brush before restoring the incoming one. Reset on file load.
 _prev_layer = None
 
+## Stale pairing keys cleanup is deferred to a timer (scan of all object custom props),
+## to keep layer/material switch instant. object name -> set of key prefixes to clean
+_pending_cleanup = {}
+
+def cleanup_stale_pairings():
+    for ob_name, prefixes in _pending_cleanup.items():
+        ob = bpy.data.objects.get(ob_name)
+        if ob and ob.type == 'GREASEPENCIL':
+            remove_stale_layer_pairings(ob, tuple(prefixes))
+    _pending_cleanup.clear()
+    return None
+
+def schedule_pairing_cleanup(ob, prefixes):
+    if not _pending_cleanup:
+        bpy.app.timers.register(cleanup_stale_pairings, first_interval=1.0)
+    _pending_cleanup.setdefault(ob.name, set()).update(prefixes)
+
 def get_object_and_scene():# -> tuple[None, None] | tuple[Any | None, Any]:
     """return scene and active object if object is a GP
     If there are mutliple main windows, return the scene and active GP object from first window with active GP
@@ -82,10 +103,7 @@ def layer_change_callback():
         restore_layer_brush(scn, ob, cur, brush_mode)
         ## cleanup per-object keys of layers that no longer exists (renamed/deleted)
         if brush_mode == 'INDIVIDUAL':
-            layer_names = [l.name for l in ob.data.layers]
-            for prefix in (LAYERBRUSH_PREFIX, LAYERSTROKE_PREFIX):
-                for k in [k for k in ob.keys() if k.startswith(prefix) and k[len(prefix):] not in layer_names]:
-                    del ob[k]
+            schedule_pairing_cleanup(ob, (LAYERBRUSH_PREFIX, LAYERSTROKE_PREFIX))
 
     ## Keep the previous-layer tracker up to date whatever the sync/skip state
     if cur:
@@ -107,7 +125,8 @@ def subscribe_layer():
         # Args passed to callback function (tuple)
         args=(),
         # Callback function for property update
-        notify=layer_change_callback,
+        ## Coalesced: rapid switches only restore for the last active layer
+        notify=coalesced(layer_change_callback),
         options={'PERSISTENT'},
     )
 
@@ -116,8 +135,26 @@ def subscribe_layer_handler(dummy):
     ## reset the previous-layer tracker so a freshly opened file cannot mis-attribute a brush
     global _prev_layer
     _prev_layer = None
+    _pending_cleanup.clear()
+    clear_layer_brush_store()
     subscribe_layer()
 
+@persistent
+def pairing_store_undo_handler(*args):
+    ## custom props may be restored to another state
+    clear_layer_brush_store()
+
+## Drawing plane fit cache (fn.get_drawing_plane)
+@persistent
+def drawing_plane_depsgraph_update(scene, depsgraph):
+    ## only grease pencil data updates are considered (see tag_drawing_planes)
+    tag_drawing_planes(depsgraph)
+
+@persistent
+def drawing_plane_reset_handler(*args):
+    ## drawings pointers are not valid anymore
+    tag_drawing_planes()
+
 ## material callback
 def material_change_callback():
     # print(f'{bpy.context.object.name}: Material has changed!')
@@ -151,9 +188,7 @@ def material_change_callback():
 
     ## cleanup per-object keys of layers that no longer exists (renamed/deleted)
     if mode == 'INDIVIDUAL':
-        layer_names = [l.name for l in ob.data.layers]
-        for k in [k for k in ob.keys() if k.startswith(LAYERMAT_PREFIX) and k[len(LAYERMAT_PREFIX):] not in layer_names]:
-            del ob[k]
+        schedule_pairing_cleanup(ob, (LAYERMAT_PREFIX,))
 
     ## Set selection to active object ot avoid un-sync selection on Layers stack
     ## (happen when an objet is selected but not active with 'lock object mode')
@@ -169,7 +204,7 @@ def subscribe_material():
         key=subscribe_to,
         owner=bpy.types.GreasePencil,
         args=(),
-        notify=material_change_callback,
+        notify=coalesced(material_change_callback),
         options={'PERSISTENT'},
     )
 
@@ -191,11 +226,27 @@ def register():
     # Add a load handler when opening other blends (does not seeem to add msgbus twice)
     bpy.app.handlers.load_post.append(subscribe_layer_handler)
     bpy.app.handlers.load_post.append(subscribe_material_handler) # Need to restart after first activation
+    bpy.app.handlers.undo_post.append(pairing_store_undo_handler)
+    bpy.app.handlers.redo_post.append(pairing_store_undo_handler)
+    bpy.app.handlers.depsgraph_update_post.append(drawing_plane_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(drawing_plane_reset_handler)
 
 
 def unregister():
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if drawing_plane_reset_handler in handlers:
+            handlers.remove(drawing_plane_reset_handler)
+    if drawing_plane_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(drawing_plane_depsgraph_update)
+    tag_drawing_planes()
+    bpy.app.handlers.redo_post.remove(pairing_store_undo_handler)
+    bpy.app.handlers.undo_post.remove(pairing_store_undo_handler)
     bpy.app.handlers.load_post.remove(subscribe_material_handler)
     bpy.app.handlers.load_post.remove(subscribe_layer_handler)
+    if bpy.app.timers.is_registered(cleanup_stale_pairings):
+        bpy.app.timers.unregister(cleanup_stale_pairings)
+    _pending_cleanup.clear()
 
     # delete layer index trigger
     bpy.msgbus.clear_by_owner(bpy.types.GreasePencil)
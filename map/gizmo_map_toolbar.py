@@ -29,6 +29,8 @@ class STORYTOOLS_GGT_map_toolbar(GizmoGroup):
         return fn.is_minimap_viewport(context)
 
     def setup(self, context):
+        ## Key of the layout applied in draw_prepare
+        self.layout_key = None
 
         ## --- Minimap
         self.map_gizmos = []
@@ -104,89 +106,49 @@ class STORYTOOLS_GGT_map_toolbar(GizmoGroup):
 
     def draw_prepare(self, context):
         prefs = get_addon_prefs()
-        settings = context.scene.storytools_settings
-        gap_size = 30 # prefs.toolbar_gap_size # 44
-        backdrop_size = 14 # prefs.toolbar_backdrop_size
-        
-        section_separator = int(gap_size / 2) # Fixed at 20 ?
-        px_scale = context.preferences.system.ui_scale
 
         # for gz in self.gizmos:
         #     gz.hide = not settings.show_session_toolbar
         # if not settings.show_session_toolbar:
         #     return
-        
-        region = context.region
-        # count = len(self.gizmos) # Wrong with gizmo added out of main line (GP gizmos)
-        count = len(self.map_gizmos + self.object_gizmos + self.view_gizmos)
-        sidebar_width = next((r.width for r in context.area.regions if r.type == 'UI'), 0)
-
-        ## Using only direct offset
-        bar_width = (count - 1) * (gap_size * px_scale) + (section_separator * 2) * px_scale
-
-        # vertical_pos = prefs.toolbar_margin * px_scale + fn.get_header_margin(context, overlap=False) # default 36
-        vertical_pos = 18 * px_scale + fn.get_header_margin(context, overlap=False)
-        left_pos = region.width / 2 - bar_width / 2
-
-        ## Responsive width adjustment
-        visible_region = region.width - sidebar_width
-        ## Sidebar push control bar to the left
-        overlap = (left_pos + bar_width + section_separator) - visible_region
-        if overlap > 0:
-            left_pos -= overlap
-        
-        ## Compress if left side is reached
-        if left_pos < section_separator:
-            out_size = abs(left_pos - section_separator)
-            reduction_factor = visible_region / (visible_region + out_size)
-            
-            left_pos = section_separator # Reset left side
-            # Reduce gap_size and section separator, clamped amount (factor of available space)
-            # First reduce button size
-            backdrop_size = max(backdrop_size * reduction_factor, 14)
-            # then gap size
-            gap_size = max(gap_size * reduction_factor, backdrop_size * 2)
-            section_separator = max(section_separator * reduction_factor, gap_size / 2)
-
-        next_pos = gap_size * px_scale
 
         ## Prefs gizmo colors
         obj_color = prefs.object_gz_color
-        obj_color_hl = [i + 0.1 for i in obj_color]
-
         view_color = prefs.camera_gz_color
-        view_color_hl = [i + 0.1 for i in view_color]
-
-        # upline_left_pos = left_pos + (gap_size * px_scale) / 2
-
-        for i, gz in enumerate(self.gizmos):
-            gz.scale_basis = backdrop_size
-
-            if gz in self.map_gizmos:
-                gz.color = view_color
-                gz.color_highlight = view_color_hl
 
-            if gz in self.object_gizmos:
-                if gz == self.object_gizmos[0]:
-                    left_pos += section_separator
-                gz.color = obj_color
-                gz.color_highlight = obj_color_hl
+        ## Positions are recomputed only when region sizes or ui scale change
+        # margin = prefs.toolbar_margin # default 36
+        layout_key, layout = fn.get_toolbar_layout(
+            context,
+            (len(self.map_gizmos), len(self.object_gizmos), len(self.view_gizmos)),
+            gap_size=30, # prefs.toolbar_gap_size # 44
+            backdrop_size=14, # prefs.toolbar_backdrop_size
+            margin=18)
+        layout_key = (layout_key, obj_color[:], view_color[:])
+
+        if self.layout_key == layout_key:
+            fn.toolbar_layout_stats['hit'] += 1
+            return
 
-            if gz in self.view_gizmos:
-                if gz == self.view_gizmos[0]:
-                    left_pos += section_separator
-                gz.color = view_color
-                gz.color_highlight = view_color_hl
+        fn.toolbar_layout_stats['applied'] += 1
+        self.layout_key = layout_key
 
-            # if gz in self.interact_gizmos:
-            #     if gz == self.interact_gizmos[0]:
-            #         ## Add separator
-            #         left_pos += section_separator
-            #     gz.color = obj_color
-            #     gz.color_highlight = obj_color_hl
+        obj_color_hl = [i + 0.1 for i in obj_color]
+        view_color_hl = [i + 0.1 for i in view_color]
 
+        for gizmos, color, color_hl in (
+            (self.map_gizmos, view_color, view_color_hl),
+            (self.object_gizmos, obj_color, obj_color_hl),
+            (self.view_gizmos, view_color, view_color_hl),
+            ):
+            for gz in gizmos:
+                gz.color = color
+                gz.color_highlight = color_hl
+
+        for gz, matrix in zip(self.map_gizmos + self.object_gizmos + self.view_gizmos, layout['matrices']):
+            gz.scale_basis = layout['scale_basis']
             ## Matrix world is readonly
-            gz.matrix_basis = Matrix.Translation((left_pos + (i * next_pos), vertical_pos, 0))
+            gz.matrix_basis = matrix
 
 """
 
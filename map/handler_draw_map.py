@@ -7,12 +7,179 @@ from gpu_extras.presets import draw_circle_2d
 from gpu_extras.batch import batch_for_shader
 from bpy_extras.view3d_utils import location_3d_to_region_2d
 from mathutils import Vector, Color
-from time import time
+from time import time, perf_counter
 
 from bpy.app.handlers import persistent
 from .. import fn
 
 
+### ---
+# region Batch cache
+
+## The minimap callback runs on every redraw of every 3D viewport (hover, pan, gizmo highlight...)
+## Scene data (GP bbox centers, colors, camera frustum) is gathered only when the depsgraph reports
+## an update or frame changes. Then projected and merged into one batch per minimap region,
+## rebuilt only when scene data or minimap view changes.
+
+DOT_SEGMENTS = 20
+
+## Incremented on each depsgraph update, cheap "scene changed" key
+_depsgraph_update_count = 0
+
+## Gathered scene data (shared by all minimap regions)
+_scene_data = {'key': None}
+
+## Per region batches: region pointer -> dict of view key and batches
+_region_batches = {}
+
+## Draw cost of the minimap callback (read from python console to check scaling)
+## ex: from storytools.map.handler_draw_map import map_draw_stats
+map_draw_stats = {
+    'draws': 0,
+    'scene_rebuilds': 0,
+    'batch_rebuilds': 0,
+    'objects': 0,
+    'last_ms': 0.0,
+    'max_ms': 0.0,
+    'total_ms': 0.0,
+}
+
+def clear_map_cache():
+    global _depsgraph_update_count
+    _depsgraph_update_count += 1
+    _scene_data.clear()
+    _scene_data['key'] = None
+    _region_batches.clear()
+    fn.tag_world_bounds()
+
+def frame_minimap_viewports():
+    '''Timer: frame GP objects and camera in all minimap viewports, then redraw them
+    (map_always_frame_objects, runs after scene changes, never from the draw callback)'''
+    if not fn.get_addon_prefs().map_always_frame_objects:
+        return None
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != 'VIEW_3D' or not fn.is_minimap_viewport(space_data=area.spaces.active):
+                continue
+            region = next((r for r in area.regions if r.type == 'WINDOW'), None)
+            if region is None:
+                continue
+            with bpy.context.temp_override(window=window, area=area, region=region):
+                fn.frame_objects(bpy.context, target='ALL')
+            area.tag_redraw()
+    return None
+
+def schedule_minimap_framing():
+    '''Frame minimap viewports on next event loop tick (merged when scene changes repeatedly)'''
+    if not bpy.app.timers.is_registered(frame_minimap_viewports):
+        bpy.app.timers.register(frame_minimap_viewports, first_interval=0.0)
+
+@persistent
+def map_depsgraph_update(scene, depsgraph):
+    global _depsgraph_update_count
+    _depsgraph_update_count += 1
+    fn.tag_world_bounds(depsgraph)
+    if fn.get_addon_prefs().map_always_frame_objects:
+        schedule_minimap_framing()
+
+@persistent
+def map_frame_change(scene, depsgraph=None):
+    ## Animated objects may have moved (cached world bounds are per frame)
+    if fn.get_addon_prefs().map_always_frame_objects:
+        schedule_minimap_framing()
+
+@persistent
+def map_cache_load_handler(dummy):
+    clear_map_cache()
+
+@persistent
+def map_cache_undo_handler(scene, dummy=None):
+    clear_map_cache()
+
+def get_map_scene_data(context):
+    '''Return cached dict of visible GP objects data (names, world centers, colors) and camera frustum
+    Rebuilt only when the depsgraph was updated or scene/frame/active object changed
+    '''
+    scn = context.scene
+    cam = scn.camera
+    active = context.object
+    key = (_depsgraph_update_count, scn.name, scn.frame_current,
+           active.name if active else None, cam.name if cam else None)
+    if _scene_data['key'] == key:
+        return _scene_data
+
+    gp_list = [o for o in scn.objects if o.type == 'GREASEPENCIL' and o.visible_get()]
+    centers = np.empty((len(gp_list), 3), dtype=np.float32)
+    colors = np.empty((len(gp_list), 4), dtype=np.float32)
+    for i, ob in enumerate(gp_list):
+        ## BBox median point (feel probably better for user perspective than origin)
+        ## Transform is affine: mean of transformed corners == transformed mean of corners
+        centers[i] = ob.matrix_world @ Vector(np.mean(np.array(ob.bound_box, dtype=np.float32), axis=0))
+
+        color = Color((0.9, 0.9, 0.6) if active == ob else (0.7, 0.7, 0.0))
+        color.h = fn.name_to_hue(ob.name) # Hue by name
+        colors[i] = (*color, 1.0) # Add alpha
+
+    _scene_data.update(
+        key=key,
+        names=[ob.name if len(ob.name) <= 24 else ob.name[:21] + '...' for ob in gp_list],
+        centers=centers,
+        colors=colors,
+        cam_frustum=np.array(fn.get_camera_frustum(cam, context=context), dtype=np.float32).reshape(-1, 3),
+    )
+    map_draw_stats['scene_rebuilds'] += 1
+    map_draw_stats['objects'] = len(gp_list)
+    return _scene_data
+
+def dots_coords(locs, radius, segments=DOT_SEGMENTS):
+    '''Return merged triangles coordinates (N * segments * 3, 3) of 2D disks centered on each loc'''
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    ring = np.stack((np.cos(angles), np.sin(angles)), axis=-1) * radius
+    ## Triangle fan expanded as triangles: (center, ring[i], ring[i+1])
+    tri = np.stack((np.zeros_like(ring), ring, np.roll(ring, -1, axis=0)), axis=1).reshape(-1, 2)
+    coords = np.zeros((len(locs), len(tri), 3), dtype=np.float32)
+    coords[:, :, :2] = locs[:, None, :] + tri[None, :, :]
+    return coords.reshape(-1, 3)
+
+def get_map_region_batches(context, data, radius, shader_flat, shader_uniform):
+    '''Return cached dict with projected 2D locations, merged dot batch and camera lines batch for current region'''
+    region = context.region
+    rv3d = context.space_data.region_3d
+    view_key = (data['key'], tuple(v for row in rv3d.perspective_matrix for v in row),
+                region.width, region.height, radius)
+
+    cache = _region_batches.get(region.as_pointer())
+    if cache and cache['key'] == view_key:
+        return cache
+
+    locs = fn.locations_to_region_array(data['centers'], region=region, rv3d=rv3d)
+    dots_batch = None
+    if len(locs):
+        segment_ct = DOT_SEGMENTS * 3
+        dots_batch = batch_for_shader(shader_flat, 'TRIS', {
+            "pos": dots_coords(locs, radius),
+            "color": np.repeat(data['colors'], segment_ct, axis=0),
+            })
+
+    cam_batch = None
+    if len(data['cam_frustum']):
+        cam_view = fn.locations_to_region_array(data['cam_frustum'], region=region, rv3d=rv3d)
+        cam_batch = batch_for_shader(shader_uniform, 'LINES', {"pos": cam_view})
+
+    cache = {'key': view_key, 'locs': locs, 'dots': dots_batch, 'cam': cam_batch}
+    _region_batches[region.as_pointer()] = cache
+    map_draw_stats['batch_rebuilds'] += 1
+    return cache
+
+def record_draw_cost(start):
+    elapsed = (perf_counter() - start) * 1000
+    map_draw_stats['draws'] += 1
+    map_draw_stats['last_ms'] = elapsed
+    map_draw_stats['total_ms'] += elapsed
+    map_draw_stats['max_ms'] = max(map_draw_stats['max_ms'], elapsed)
+
+# endregion
+
 ## 2D minimap drawing
 def draw_map_callback_2d():
     context = bpy.context
@@ -21,91 +188,58 @@ def draw_map_callback_2d():
 
     # if context.region_data.view_perspective != 'CAMERA':
     #     return
-    
+
+    start = perf_counter()
     shadow_offset = Vector((1,-1))
     settings = fn.get_addon_prefs()
     gpu.state.blend_set('ALPHA')
     shader_uniform = gpu.shader.from_builtin('UNIFORM_COLOR')
+    shader_flat = gpu.shader.from_builtin('FLAT_COLOR')
     font_id = 0
 
-    cam = bpy.context.scene.camera
-    ### Trace GP objects 
-    color = (0.8, 0.8, 0.0, 0.9)
-    # gps = [o for o in bpy.context.scene.objects if o.type == 'GREASEPENCIL' and o.visible_get()]
-
     # scale = context.region_data.view_distance # TODO: define scaling
     radius = settings.map_dot_size * context.preferences.system.ui_scale
     offset_vector = Vector((0, radius + radius * 0.1))
-    # for gp in gps:
-    #     draw_circle_2d(fn.location_to_region(gp.matrix_world.translation), color, scale)
-    # active = context.object
-    # if active and active.type == 'GREASEPENCIL':
-    #     draw_circle_2d(fn.location_to_region(active.matrix_world.translation), (0.9, 0.9, 0.0, 0.9), scale)
-
-    gp_list = [o for o in bpy.context.scene.objects if o.type == 'GREASEPENCIL' and o.visible_get()]
-
-    ## Always recenter map (expensive! Need better object-frame function)
-    # if settings.map_always_frame_objects:
-    #     obj_list = gp_list
-    #     if cam:
-    #         obj_list = obj_list + [cam]
-    #     fn.frame_objects(context, objects=obj_list)
-
-    for ob in gp_list:
-        if context.object and context.object == ob:
-            # color = (0.9, 0.9, 0.6, 0.9) # All same color
-            color = (0.9, 0.9, 0.6)
-        else:
-            # color = (0.7, 0.7, 0.0, 0.85) # All same color
-            color = (0.7, 0.7, 0.0)
-        color = Color(color)
-        color.h = fn.name_to_hue(ob.name) # Hue by name
-        color = (*color, 1.0) # Add alpha
-
-        loc = fn.location_to_region(Vector(np.mean([ob.matrix_world @ Vector(corner) for corner in ob.bound_box], axis=0)))
-        if settings.use_map_dot:
-            ## Draw location
-            ## On origin
-            # loc = fn.location_to_region(ob.matrix_world.to_translation()) # On origin ?
-
-            ## On BBox median point (feel probably better for user perspective)
-            ## note: can use "4" circle to mark another object type
-            circle_co = fn.circle_2d(*loc, radius, 20) # Scaled to dist radius
-            batch = batch_for_shader(shader_uniform, 'TRI_FAN', {"pos":  circle_co})
-            shader_uniform.bind()
-            shader_uniform.uniform_float("color", color)
-            batch.draw(shader_uniform)
-
-        ## Names
-        if settings.use_map_name:
-            display_name = ob.name if len(ob.name) <= 24 else ob.name[:21] + '...'
+
+    data = get_map_scene_data(context)
+
+    ## Auto framing (map_always_frame_objects) is done from a timer after scene changes, see schedule_minimap_framing
+
+    batches = get_map_region_batches(context, data, radius, shader_flat, shader_uniform)
+
+    ## Draw location (all dots in one batch)
+    ## note: can use "4" circle to mark another object type
+    if settings.use_map_dot and batches['dots']:
+        shader_flat.bind()
+        batches['dots'].draw(shader_flat)
+
+    ## Names
+    if settings.use_map_name:
+        blf.size(font_id, settings.map_name_size)
+        for display_name, loc, color in zip(data['names'], batches['locs'], data['colors']):
+            loc = Vector(loc) + offset_vector
             ## Draw text shadow
-            blf.position(font_id, *(loc + offset_vector + shadow_offset), 0)
-            blf.size(font_id, settings.map_name_size)
+            blf.position(font_id, *(loc + shadow_offset), 0)
             blf.color(font_id, 0,0,0, 0.8) # shadow color
             blf.draw(font_id, display_name)
 
             ## Draw text 
-            blf.position(font_id, *(loc + offset_vector), 0)
-            blf.size(font_id, settings.map_name_size)
+            blf.position(font_id, *loc, 0)
             blf.color(font_id, *color)
             blf.draw(font_id, display_name)
 
-    if cam:
+    if batches['cam']:
         ## ? Instead highlight camera basic Gizmo ?
 
-        cam_view = fn.get_camera_frustum(cam, context=context) # get in 3D space
-        cam_view = [fn.location_to_region(v) for v in cam_view] # convert to 2D space
-
         ## TODO : Trace cam Tri  
         gpu.state.line_width_set(3.0) # Thick only on camera tri ?
-        cam_lines = batch_for_shader(shader_uniform, 'LINES', {"pos": cam_view})
         shader_uniform.bind()
         shader_uniform.uniform_float("color", (0.5, 0.5, 1.0, 0.5))
-        cam_lines.draw(shader_uniform)
+        batches['cam'].draw(shader_uniform)
 
     ## return here to skip viewport frustum display
     gpu.state.line_width_set(1.0) # reset line width
+    record_draw_cost(start)
     return
 
     # FIXME: Can Works by setting a property in loop. Need a proper method to refresh view trace, or activate only in specific cases
@@ -193,6 +327,12 @@ def register():
     if bpy.app.background:
         return
 
+    bpy.app.handlers.depsgraph_update_post.append(map_depsgraph_update)
+    bpy.app.handlers.frame_change_post.append(map_frame_change)
+    bpy.app.handlers.load_post.append(map_cache_load_handler)
+    bpy.app.handlers.undo_post.append(map_cache_undo_handler)
+    bpy.app.handlers.redo_post.append(map_cache_undo_handler)
+
     global draw_handle
     draw_handle = bpy.types.SpaceView3D.draw_handler_add(
         draw_map_callback_2d, (), "WINDOW", "POST_PIXEL")
@@ -206,5 +346,18 @@ def unregister():
     if draw_handle:
         bpy.types.SpaceView3D.draw_handler_remove(draw_handle, 'WINDOW')
 
+    if map_cache_load_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(map_cache_load_handler)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if map_cache_undo_handler in handlers:
+            handlers.remove(map_cache_undo_handler)
+    if map_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(map_depsgraph_update)
+    if map_frame_change in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(map_frame_change)
+    if bpy.app.timers.is_registered(frame_minimap_viewports):
+        bpy.app.timers.unregister(frame_minimap_viewports)
+    clear_map_cache()
+
 if __name__ == "__main__":
     register()
@@ -0,0 +1,48 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+## Coalescing dispatcher for msgbus notifications
+## Notified callbacks are queued and run once on the next event loop tick (bpy.app.timers).
+## Notifications of a callback already waiting in queue are merged (last arguments win),
+## so rapid or scripted changes (layer stepping, camera markers binding...) run the work once.
+
+import bpy
+
+## Queued callbacks in notification order: callback -> args of last notification
+_queue = {}
+
+## Counters per callback name (read from python console to check coalescing)
+## ex: from storytools.msgbus_dispatch import dispatch_stats
+dispatch_stats = {}
+
+def _run_queue():
+    queue = list(_queue.items())
+    _queue.clear()
+    for callback, args in queue:
+        dispatch_stats[callback.__name__]['run'] += 1
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f'Storytools: error in "{callback.__name__}" notification callback:', e)
+    return None
+
+def dispatch(callback, *args):
+    '''Queue callback to run on next tick, merged with pending notification of the same callback'''
+    stats = dispatch_stats.setdefault(callback.__name__, {'notified': 0, 'run': 0, 'coalesced': 0})
+    stats['notified'] += 1
+    if callback in _queue:
+        stats['coalesced'] += 1
+    _queue[callback] = args
+    if not bpy.app.timers.is_registered(_run_queue):
+        bpy.app.timers.register(_run_queue, first_interval=0.0)
+
+def coalesced(callback):
+    '''Return a msgbus notify function dispatching callback through the coalescing queue'''
+    def notify(*args):
+        dispatch(callback, *args)
+    notify.__name__ = f'coalesced_{callback.__name__}'
+    return notify
+
+def clear_dispatch_queue():
+    if bpy.app.timers.is_registered(_run_queue):
+        bpy.app.timers.unregister(_run_queue)
+    _queue.clear()
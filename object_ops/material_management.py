@@ -2,7 +2,9 @@ import bpy
 import re
 
 from mathutils import Color
-from math import isclose
+from mathutils.kdtree import KDTree
+from math import isclose, sqrt
+from bpy.app.handlers import persistent
 from bpy.types import Operator, PropertyGroup
 from bpy.props import (
     StringProperty,
@@ -12,6 +14,100 @@ from bpy.props import (
 
 from .. import fn
 
+### ---
+# region Material color index
+
+## KD-trees of stroke and fill colors of all GP materials, built on first query
+## and rebuilt when materials are added/removed or edited (depsgraph), undo or file load
+## keys: 'count' (materials count), 'materials' (GP materials), 'uids' (their session_uid), 'stroke', 'fill'
+_material_index = {}
+
+## GP materials used by GP objects of a scene: scene session_uid -> (materials, session_uids)
+_scene_materials = {}
+
+def tag_material_index(depsgraph=None):
+    '''Invalidate material color index and scene materials (all if depsgraph is None)'''
+    if depsgraph is None:
+        _material_index.clear()
+        _scene_materials.clear()
+        return
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, bpy.types.Material):
+            _material_index.clear()
+        elif isinstance(id_data, (bpy.types.GreasePencil, bpy.types.Object, bpy.types.Collection, bpy.types.Scene)):
+            ## Material stack edited or objects added/removed
+            _scene_materials.clear()
+
+def is_valid_material(mat, session_uid):
+    '''Return True if a stored material reference was not freed or replaced since stored'''
+    try:
+        return mat.session_uid == session_uid
+    except ReferenceError:
+        return False
+
+def get_material_color_index():
+    '''Return material color index, (re)build it if missing or materials count changed'''
+    if _material_index.get('count') == len(bpy.data.materials):
+        return _material_index
+
+    materials = [m for m in bpy.data.materials if m.is_grease_pencil]
+    index = {'count': len(bpy.data.materials), 'materials': materials, 'uids': [m.session_uid for m in materials]}
+    for key, attr in (('stroke', 'color'), ('fill', 'fill_color')):
+        tree = KDTree(len(materials))
+        for i, mat in enumerate(materials):
+            tree.insert(getattr(mat.grease_pencil, attr)[:3], i)
+        tree.balance()
+        index[key] = tree
+
+    _material_index.clear()
+    _material_index.update(index)
+    return _material_index
+
+def get_index_materials():
+    '''Return all GP materials of the color index, rebuilt first if a stored material was freed'''
+    index = get_material_color_index()
+    if not all(is_valid_material(m, uid) for m, uid in zip(index['materials'], index['uids'])):
+        _material_index.clear()
+        index = get_material_color_index()
+    return index['materials']
+
+def find_similar_materials(color, colors='stroke', tol=0.0001):
+    '''Return GP materials with stroke (or fill) color within tolerance of color (per channel)
+    colors: 'stroke' or 'fill'
+    '''
+    index = get_material_color_index()
+    color = color[:3]
+    ## Range search on the bounding sphere of the tolerance cube, then exact per channel check
+    similar = []
+    for co, i, _dist in index[colors].find_range(color, tol * sqrt(3)):
+        if all(isclose(co[c], color[c], abs_tol=tol) for c in range(3)):
+            similar.append(i)
+    ## Keep bpy.data order
+    materials, uids = index['materials'], index['uids']
+    return [materials[i] for i in sorted(similar) if is_valid_material(materials[i], uids[i])]
+
+def get_scene_materials(scene):
+    '''Return cached list of GP materials used by Grease Pencil objects of scene
+    (objects order then stack order, without duplicates)'''
+    cached = _scene_materials.get(scene.session_uid)
+    if cached is None or not all(is_valid_material(m, uid) for m, uid in zip(*cached)):
+        gp_datas = dict.fromkeys(o.data for o in scene.objects if o.type == 'GREASEPENCIL')
+        materials = list(dict.fromkeys(
+            mat for gp in gp_datas for mat in gp.materials if mat and mat.is_grease_pencil))
+        cached = _scene_materials[scene.session_uid] = (materials, [m.session_uid for m in materials])
+    return cached[0]
+
+@persistent
+def material_index_depsgraph_update(scene, depsgraph):
+    tag_material_index(depsgraph)
+
+@persistent
+def material_index_reset_handler(*args):
+    tag_material_index()
+
+# endregion
+
 def get_other_gp_objects(self, context):
     """Return a list of Grease Pencil object, without the active
     as tuple to use as reference object (for dynamic enum prop update)"""
@@ -129,10 +225,9 @@ class STORYTOOLS_OT_add_existing_materials(Operator):
     #     return True
 
     def invoke(self, context, event):
-        self.data_materials = [mat for mat in bpy.data.materials if mat.is_grease_pencil]
+        self.data_materials = get_index_materials()
 
-        self.scene_materials = [mat for obj in context.scene.objects if obj.type == 'GREASEPENCIL' for mat in obj.data.materials if mat.is_grease_pencil]
-        self.scene_materials = list(set(self.scene_materials))
+        self.scene_materials = get_scene_materials(context.scene)
 
         self.re_dup = re.compile(r'\.\d{3}$')
 
@@ -208,26 +303,15 @@ class STORYTOOLS_OT_create_material_from_color(bpy.types.Operator):
         ## Add alpha 1.0 (need 4 components)
         self.color = (color[0], color[1], color[2], 1.0)
 
-        self.similar_materials = []
-        for material in bpy.data.materials:
-            if not material.is_grease_pencil:
-                continue
-            if self.mode == 'STROKE' and (not material.grease_pencil.show_stroke or material.grease_pencil.show_fill):
-                continue
-            if self.mode == 'FILL' and (material.grease_pencil.show_stroke or not material.grease_pencil.show_fill):
-                continue
-            if self.mode == 'BOTH' and (not material.grease_pencil.show_stroke or not material.grease_pencil.show_fill):
-                continue
-
-            if self.mode in ('STROKE', 'BOTH'):
-                ref = material.grease_pencil.color
-            else:
-                ref = material.grease_pencil.fill_color
-
-            if material.grease_pencil.color:
-                # if not all(abs(ref[i] - self.color[i]) > 0.00000001 for i in range(3)):
-                if all(isclose(ref[i], self.color[i], abs_tol=0.0001) for i in range(3)):
-                    self.similar_materials.append(material)
+        ## Materials with matching stroke and fill visibility
+        visibility = {
+            'STROKE': (True, False),
+            'FILL': (False, True),
+            'BOTH': (True, True),
+            }[self.mode]
+        colors = 'fill' if self.mode == 'FILL' else 'stroke'
+        self.similar_materials = [m for m in find_similar_materials(self.color, colors=colors)
+                                  if (m.grease_pencil.show_stroke, m.grease_pencil.show_fill) == visibility]
 
         if not self.similar_materials:
             return self.execute(context)
@@ -285,6 +369,17 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    bpy.app.handlers.depsgraph_update_post.append(material_index_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(material_index_reset_handler)
+
 def unregister():
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if material_index_reset_handler in handlers:
+            handlers.remove(material_index_reset_handler)
+    if material_index_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(material_index_depsgraph_update)
+    tag_material_index()
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
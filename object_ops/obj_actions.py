@@ -1,8 +1,10 @@
 import bpy
+import numpy as np
 
 from math import pi
 from mathutils import Vector, Matrix
 
+from bpy.app.handlers import persistent
 from bpy.types import Operator, PropertyGroup
 from bpy.props import (
     StringProperty,
@@ -561,6 +563,49 @@ class STORYTOOLS_OT_grease_pencil_options(bpy.types.Operator):
     def execute(self, context):
         return {"FINISHED"}
 
+## GP objects list filter result per scene, kept until objects are updated in depsgraph (or undo/load)
+## scene session_uid -> (key, flt_flags, flt_neworder)
+_gp_list_filter = {}
+
+## Sidebar width (ui scale independent) per area, computed once per list redraw in filter_items
+_sidebar_widths = {}
+
+def tag_gp_list_filter(depsgraph=None):
+    '''Invalidate cached GP objects list filters (all if depsgraph is None or an object was updated)'''
+    if depsgraph is None or any(isinstance(u.id, (bpy.types.Object, bpy.types.Scene, bpy.types.Collection))
+                                for u in depsgraph.updates):
+        _gp_list_filter.clear()
+
+def get_sidebar_width(context):
+    return next((r.width for r in context.area.regions if r.type == 'UI'), 0) / context.preferences.system.ui_scale
+
+def filter_gp_objects(objs, camera=None):
+    '''Return flags (True for listed GP objects) and new order of objects collection
+    camera: sort listed GP objects by distance to camera (nearest first), other items after
+    '''
+    flags = np.array([o.type == 'GREASEPENCIL' and not o.name.startswith('.') for o in objs], dtype=bool)
+    if camera is None:
+        return flags, None
+
+    listed = np.flatnonzero(flags)
+    positions = np.array([objs[int(i)].matrix_world.translation for i in listed], dtype=np.float64).reshape(-1, 3)
+    cam_mat = np.array(camera.matrix_world, dtype=np.float64)
+    ## Euclidean distance, so objects behind camera are not listed first
+    distances = np.linalg.norm(positions - cam_mat[:3, 3], axis=1)
+    order = np.concatenate((listed[np.argsort(distances, kind='stable')], np.flatnonzero(~flags)))
+    ## UIList new order maps original index -> new index
+    neworder = np.empty(len(order), dtype=np.int32)
+    neworder[order] = np.arange(len(order), dtype=np.int32)
+    return flags, neworder
+
+@persistent
+def gp_list_filter_depsgraph_update(scene, depsgraph):
+    tag_gp_list_filter(depsgraph)
+
+@persistent
+def gp_list_filter_reset_handler(*args):
+    tag_gp_list_filter()
+
 class STORYTOOLS_UL_gp_objects_list(bpy.types.UIList):
     # Constants (flags)
     # Be careful not to shadow FILTER_ITEM (i.e. UIList().bitflag_filter_item)!
@@ -571,6 +616,10 @@ class STORYTOOLS_UL_gp_objects_list(bpy.types.UIList):
     #     name="Filter Empty", default=False, options=set(),
     #     description="Whether to filter empty vertex groups",
     # )
+    use_sort_camera_distance: BoolProperty(
+        name="Sort By Camera Distance", default=False, options=set(),
+        description="Sort objects by distance to scene camera, nearest first",
+    )
 
     # The draw_item function is called for each item of the collection that is visible in the list.
     #   data is the RNA object containing the collection,
@@ -597,7 +646,9 @@ class STORYTOOLS_UL_gp_objects_list(bpy.types.UIList):
         # row.prop(item, 'hide', text='', icon=hide_ico, invert_checkbox=True)
 
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index): # , flt_flag
-        sidebar_width = next((r.width for r in context.area.regions if r.type == 'UI'), 0) / context.preferences.system.ui_scale
+        sidebar_width = _sidebar_widths.get(context.area.as_pointer())
+        if sidebar_width is None:
+            sidebar_width = get_sidebar_width(context)
         settings = context.scene.storytools_settings
         row = layout.row(align=True)
         if item == context.view_layer.objects.active:
@@ -668,8 +719,9 @@ class STORYTOOLS_UL_gp_objects_list(bpy.types.UIList):
         row.operator('storytools.grease_pencil_options', text='', icon='THREE_DOTS', emboss=False).object_name = item.name
 
     # Called once to draw filtering/reordering options.
-    # def draw_filter(self, context, layout):
-    #     pass
+    def draw_filter(self, context, layout):
+        row = layout.row()
+        row.prop(self, 'use_sort_camera_distance', icon='VIEW_CAMERA')
 
     # Called once to filter/reorder items.
     def filter_items(self, context, data, propname):
@@ -683,25 +735,29 @@ class STORYTOOLS_UL_gp_objects_list(bpy.types.UIList):
         # If you do not make filtering and/or ordering, return empty list(s) (this will be more efficient than
         # returning full lists doing nothing!).
 
-        # Default return values.
-        flt_flags = []
-        flt_neworder = []
+        ## Sidebar width used by all draw_item calls of this redraw
+        _sidebar_widths[context.area.as_pointer()] = get_sidebar_width(context)
 
-        #### Do filtering/reordering here...
         ## data : scene struct -> propname: 'objects' string 
         objs = getattr(data, propname)
         # objs: scene objects collection
 
-        flt_flags = [self.bitflag_filter_item if o.type == 'GREASEPENCIL'
-                     and not o.name.startswith('.') else 0 for o in objs]
-
         ## By name
         # helper_funcs = bpy.types.UI_UL_list
         # flt_flags = helper_funcs.filter_items_by_name(self.filter_name, self.bitflag_filter_item, objs, "name", reverse=False)
 
-        ## BONUS option: By distance to camera ? (need to be computed OTF... possible ?)
+        ## Filter result is reused until objects are updated (cleared by depsgraph handler)
+        ## names are part of the key since renaming does not always send a depsgraph update
+        camera = data.camera if self.use_sort_camera_distance else None
+        key = (tuple(objs.keys()), camera.name if camera else None)
+        cached = _gp_list_filter.get(data.session_uid)
+        if cached is None or cached[0] != key:
+            flags, neworder = filter_gp_objects(objs, camera=camera)
+            flt_flags = np.where(flags, self.bitflag_filter_item, 0).tolist()
+            flt_neworder = neworder.tolist() if neworder is not None else []
+            cached = _gp_list_filter[data.session_uid] = (key, flt_flags, flt_neworder)
 
-        return flt_flags, flt_neworder
+        return cached[1], cached[2]
 
 
 ## Cannot append to GPencil 'Add' menu, being an operator_menu_enum "object.gpencil_add"
@@ -728,12 +784,24 @@ def register():
         bpy.utils.register_class(cls)
     
     bpy.types.Scene.gp_object_props = PointerProperty(type=STORYTOOLS_object_collection)
+
+    bpy.app.handlers.depsgraph_update_post.append(gp_list_filter_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(gp_list_filter_reset_handler)
     
     # bpy.types.GREASE_PENCIL_MT_....append(menu_add_storytools_gp)
 
 def unregister():
     # bpy.types.GREASE_PENCIL_MT_....remove(menu_add_storytools_gp)
 
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if gp_list_filter_reset_handler in handlers:
+            handlers.remove(gp_list_filter_reset_handler)
+    if gp_list_filter_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(gp_list_filter_depsgraph_update)
+    tag_gp_list_filter()
+    _sidebar_widths.clear()
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     
@@ -49,6 +49,11 @@ def toggle_toolpreset_buttons(self, _):
         return
     set_class_registered(gizmo_toolpreset_bar.STORYTOOLS_GGT_toolpreset_bar, self.active_presetbar)
 
+def map_always_frame_update(self, _):
+    from .map import handler_draw_map
+    if self.map_always_frame_objects and not bpy.app.background:
+        handler_draw_map.schedule_minimap_framing()
+
 def reload_toolpreset_buttons():
     from . import gizmo_toolpreset_bar
     bpy.utils.unregister_class(gizmo_toolpreset_bar.STORYTOOLS_GGT_toolpreset_bar)
@@ -302,7 +307,7 @@ class STORYTOOLS_prefs(bpy.types.AddonPreferences):
     map_always_frame_objects : BoolProperty(
         name='Always Frame Objects',
         description="Constantly set pan and zoom to frame GP objects and camera",
-        default=False)
+        default=False, update=map_always_frame_update)
 
     use_map_name : BoolProperty(
         name='Show Map names',
@@ -657,7 +662,7 @@ class STORYTOOLS_prefs(bpy.types.AddonPreferences):
             tool_col.prop(self, 'map_name_size')
             tool_col.prop(self, 'use_map_dot')
             tool_col.prop(self, 'map_dot_size')
-            # tool_col.prop(self, 'map_always_frame_objects')
+            tool_col.prop(self, 'map_always_frame_objects')
 
             ## Potential future Customization
             # tool_col.prop(self, 'map_toolbar_margin')
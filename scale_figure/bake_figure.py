@@ -2,7 +2,7 @@ import bpy
 from mathutils import Vector, Matrix
 from .figure_shapes import build_scale_figure_shape
 from .draw_scale_figure import get_canvas_scale_figure_matrix
-import numpy as np
+from .. import fn
 ### --- Create as GP layer
 
 def split_vector_chains(vectors):
@@ -57,17 +57,13 @@ def scale_figure_as_layer():
     ## Get scale figure settings
     settings = bpy.context.scene.storytools_settings
     
-    ## Get strokes points
-    points = build_scale_figure_shape()
-    
-    ## Apply canvas matrix and convert to object local coordinates
-    canvas_matrix = get_canvas_scale_figure_matrix(bpy.context)
-    points = [bpy.context.object.matrix_world.inverted() @ canvas_matrix @ v for v in points]
-
     obj = bpy.context.object
     if not obj:
         return
-    
+
+    ## Get strokes points
+    points = build_scale_figure_shape()
+
     gp = obj.data
     if not (layer := gp.layers.get('ScaleFigure')):
         layer = gp.layers.new('ScaleFigure', set_active=False)
@@ -87,52 +83,12 @@ def scale_figure_as_layer():
     chains = split_vector_chains(points)
     
     ## chains is list of point sequence   [[vec3, vec3, vec3, ...], [vec3, vec3, ...]]
-    
-    ## Add strokes with right number of points
-    chains_individual_pt_count = [len(chain) for chain in chains]
-    # print('chains_individual_pt_count: ', chains_individual_pt_count)
-    
-    drawing = frame.drawing
-    drawing.add_strokes(chains_individual_pt_count)
-
-    ### Set points positions -- 3 working methods
-    ### Also set radius to 0.008
-
-    ### 1. reading, modifying and writing the whole attribute array (https://projects.blender.org/blender/blender/pulls/130287)
-    # # Reading attribute into numpy array
-    # flat_positions = sum(chains, []) # list of vec3
-    # position_attr = drawing.attributes['position']
-    # position_data = np.empty((len(position_attr.data), 3), dtype=np.float32)
-    # position_attr.data.foreach_get("vector", np.ravel(position_data))
-    # # Replace positions in numpy array
-    # start = drawing.curve_offsets[len(drawing.strokes) - len(chains)].value
-    # end = drawing.curve_offsets[len(drawing.strokes)].value
-    # position_data[start:end] = flat_positions
-    # # Write back to the attribute
-    # position_attr.data.foreach_set("vector", np.ravel(position_data))
 
-    ### 2. Apply flattened positions list, iterating on a slice of position attr array
-    flat_positions = sum(chains, []) # list of vec3
-    start = drawing.curve_offsets[len(drawing.strokes) - len(chains)].value
-    end = drawing.curve_offsets[len(drawing.strokes)].value
-
-    ## Ensure the 'radius' attribute exists (had error in blender 4.4.3)
-    if drawing.attributes.get('radius') is None:
-        drawing.attributes.new("radius", 'FLOAT', 'POINT')
-
-    for i in range(start, end):
-        drawing.attributes['position'].data[i].vector = flat_positions[i-start]
-        drawing.attributes['radius'].data[i].value = 0.008
-    
-    ### 3. Classic loop method on strokes
-    ## iterate from the end to affect only strokes at the end of the stack
-    # for i in range(1, len(chains) + 1):
-    #     idx = -i
-    #     chain = chains[idx]
-    #     stroke = drawing.strokes[idx]
-    #     for pt, coord in zip(stroke.points, chain):
-    #         pt.position = coord
-    #         pt.radius = 0.008
+    ## Add strokes and write positions (canvas matrix then object local coordinates) and radius in bulk
+    canvas_matrix = get_canvas_scale_figure_matrix(bpy.context)
+    fn.add_strokes_from_chains(frame.drawing, chains,
+                               matrix=obj.matrix_world.inverted() @ canvas_matrix,
+                               radius=0.008)
 
     return layer
 
@@ -17,6 +17,18 @@ from .figure_shapes import build_scale_figure_shape
 
 draw_handle = None
 
+## Figure lines batch in local space, uploaded once per figure settings (type, height, subdivision)
+## and drawn with the canvas matrix pushed on the GPU matrix stack
+_figure_batch = {'key': None, 'batch': None}
+
+def get_scale_figure_batch(shader, settings):
+    key = (settings.scale_figure_type, settings.scale_figure_height, settings.scale_figure_subdivision)
+    if _figure_batch['key'] != key:
+        lines = build_scale_figure_shape()
+        _figure_batch['batch'] = batch_for_shader(shader, 'LINES', {"pos": [v[:] for v in lines]})
+        _figure_batch['key'] = key
+    return _figure_batch['batch']
+
 def get_canvas_scale_figure_matrix(context=None):
     context = context or bpy.context
     settings = context.scene.tool_settings
@@ -93,19 +105,16 @@ def draw_scale_figure_callback():
     # canvas_matrix = fn.get_gp_draw_plane_matrix(context) # Truly follow canvas
     canvas_matrix = get_canvas_scale_figure_matrix(bpy.context) # Custom function
 
-    ## Local shape
-    ## TODO: separate local figure builing in a function for external usage
-    lines = build_scale_figure_shape()
+    ## Local shape (cached batch)
+    line_batch = get_scale_figure_batch(shader_uniform, settings)
 
-    ## Apply canvas matrix
-    lines = [canvas_matrix @ v for v in lines]
-    
-    ## Draw
-    line_batch = batch_for_shader(shader_uniform, 'LINES', {"pos": lines})
+    ## Draw with canvas matrix as model matrix
     shader_uniform.bind()
     shader_uniform.uniform_float("color", (*settings.scale_figure_color, settings.scale_figure_opacity))
     # shader_uniform.uniform_float("color", (1.0, 0, 0, 0.0))
-    line_batch.draw(shader_uniform)
+    with gpu.matrix.push_pop():
+        gpu.matrix.multiply_matrix(canvas_matrix)
+        line_batch.draw(shader_uniform)
 
     ## Restore values
     gpu.state.line_width_set(1.0)
@@ -129,6 +138,7 @@ def unregister():
     global draw_handle
     if draw_handle:
         bpy.types.SpaceView3D.draw_handler_remove(draw_handle, 'WINDOW')
+    _figure_batch.update(key=None, batch=None)
 
 if __name__ == "__main__":
     register()
@@ -3,6 +3,8 @@ from . import (
     workspace_setup,
     reset_draw_settings,
     story_palettes,
+    text_pool,
+    panel_index,
     create_static_storyboard,
     storyboard_add_pages,
     storyboard_panel_management,
@@ -14,6 +16,8 @@ modules = (
     workspace_setup,
     reset_draw_settings,
     story_palettes,
+    text_pool,
+    panel_index,
     create_static_storyboard,
     storyboard_add_pages,
     storyboard_panel_management,
@@ -22,6 +26,16 @@ modules = (
     ui,
 )
 
+## Storyboard generator and render modules (no UI), registered alone in background mode
+background_modules = (
+    text_pool,
+    panel_index,
+    create_static_storyboard,
+    storyboard_add_pages,
+    generate_marker_animatic,
+    render_static_storyboard,
+)
+
 def register():
     for module in modules:
         module.register()
@@ -1,15 +1,17 @@
 ## Create pages of panel grid, suitable for static storyboard or quick thumbnails
 
 import bpy
+import numpy as np
 
+from time import perf_counter
 from bpy.props import FloatProperty, IntProperty, EnumProperty, BoolProperty, StringProperty
 from bpy.types import Operator
 
-from mathutils import Vector
 from pathlib import Path
 
 from ..constants import FONT_DIR, PRESETS_DIR, IMAGES_DIR
 from .. import fn
+from . import text_pool
 
 notes_default_bodys = {
     'None' : '',
@@ -19,6 +21,60 @@ notes_default_bodys = {
     'ActionDialogLighting' : 'Action:\n\n\n\nDialog:\n\n\n\nLighting:\n',
     }
 
+## Settings affecting position of every generated element (any change reposition all groups)
+layout_settings = (
+    'canvas_x', 'canvas_y', 'canvas_margin', 'line_radius',
+    'rows', 'columns', 'panel_margin_x', 'panel_margin_y',
+    'coverage', 'frame_ratio', 'custom_ratio_x', 'custom_ratio_y', 'use_custom_xy', 'ratio_preset',
+    'include_notes', 'notes_width_percent', 'notes_header_height', 'show_notes_frames',
+    'show_canvas_frame',
+    'num_pages', 'page_spacing',
+    'include_page_header', 'page_header_height',
+    'include_page_footer', 'page_footer_height',
+)
+
+## Generated element groups for incremental update:
+## name: (object name prefixes, own settings, settings requiring a rebuild)
+## A group is updated (existing objects reused) when a layout or own setting changed,
+## and removed then recreated when a setting changing text content or linking changed
+generated_groups = {
+    'notes': (
+        ('panel_',),
+        ('create_text_objects', 'note_text_format', 'use_custom_font'),
+        ('note_text_format', 'use_custom_font'),
+    ),
+    'panel_header': (
+        ('stb_shot_num_', 'stb_panel_num_'),
+        ('create_text_objects', 'panel_header_left', 'panel_header_right', 'use_custom_font'),
+        ('panel_header_left', 'panel_header_right', 'use_custom_font'),
+    ),
+    'page_header': (
+        ('stb_page_header_',),
+        ('enable_page_head_left', 'page_head_left', 'page_head_left_linked',
+         'enable_page_head_center', 'page_head_center', 'page_head_center_linked',
+         'enable_page_head_right', 'page_head_right', 'page_head_right_linked', 'use_custom_font'),
+        ('page_head_left', 'page_head_left_linked', 'page_head_center', 'page_head_center_linked',
+         'page_head_right', 'page_head_right_linked', 'use_custom_font'),
+    ),
+    'page_footer': (
+        ('stb_page_footer_',),
+        ('enable_page_foot_left', 'page_foot_left', 'page_foot_left_linked',
+         'enable_page_foot_center', 'page_foot_center', 'page_foot_center_linked', 'enable_page_foot_right',
+         'enable_footer_logo', 'footer_logo_height', 'use_custom_font'),
+        ('page_foot_left', 'page_foot_left_linked', 'page_foot_center', 'page_foot_center_linked', 'use_custom_font'),
+    ),
+    'logo': (
+        ('stb_logo_',),
+        ('enable_footer_logo', 'footer_logo_path', 'footer_logo_height'),
+        ('footer_logo_path', 'footer_logo_height'),
+    ),
+    'cameras': (
+        ('stb_cam_',),
+        ('create_camera', 'camera_margin', 'add_timeline_markers'),
+        (),
+    ),
+}
+
 class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
     bl_idname = "storytools.create_static_storyboard_pages"
     bl_label = "Create Static Storyboard Pages"
@@ -492,6 +548,14 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
         default=True,
         options={'SKIP_PRESET'}
     )
+
+    incremental_update: BoolProperty(
+        name="Incremental Update",
+        description="When regenerating an existing storyboard, only update strokes and elements affected by changed settings\
+            \nUnchanged text objects, cameras and markers are kept as is (much faster on long boards)",
+        default=True,
+        options={'SKIP_PRESET'}
+    )
     
     def _validate_image_path(self, filepath):
         """Validate if the path points to a valid image file"""
@@ -539,11 +603,8 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     # Skip properties that can't be set (e.g., different types)
                     pass
     
-    def _save_settings_to_object(self, obj):
-        """Save current settings to object's custom properties"""
-        if not obj:
-            return
-
+    def _get_settings(self):
+        """Return dict of current settings (saved on object)"""
         ## All prop except Preset
         saved_prop = [
         'canvas_x', 'canvas_y',
@@ -568,14 +629,20 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
         'enable_footer_logo', 'footer_logo_path', 'footer_logo_height',
         'show_canvas_frame',
         'create_camera', 'camera_margin', 'add_timeline_markers',
-        'force_new_object', 'remove_pre_generated',
+        'force_new_object', 'remove_pre_generated', 'incremental_update',
         ]
         # Get all property names from the operator
         settings = {}
         for prop_name in saved_prop:
             settings[prop_name] = getattr(self, prop_name)
+        return settings
 
-        obj['stb_settings'] = settings
+    def _save_settings_to_object(self, obj):
+        """Save current settings to object's custom properties"""
+        if not obj:
+            return
+
+        obj['stb_settings'] = self._get_settings()
     
     def _remove_pre_generated_elements(self, context):
         """Remove all pre-generated storyboard elements"""
@@ -631,8 +698,13 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
             scene.timeline_markers.remove(marker)
             removed_count['markers'] += 1
         
-        # Remove unused text datablocks
+        self._remove_orphan_text_data()
+        return removed_count
+
+    def _remove_orphan_text_data(self):
+        """Remove unused text datablocks of generated elements"""
         text_prefixes = [
+            text_pool.POOL_PREFIX,
             "panel_",
             "stb_shot_num_",
             "stb_panel_num_",
@@ -643,8 +715,43 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
         for text_data in list(bpy.data.curves):
             if text_data.users == 0 and any(text_data.name.startswith(prefix) for prefix in text_prefixes):
                 bpy.data.curves.remove(text_data)
-        
-        return removed_count
+
+    def _get_changed_groups(self, context, previous_settings):
+        """Compare current settings with the ones saved by previous generation
+        return (groups to update, groups to rebuild), all groups are updated when there is no previous settings
+        """
+        if previous_settings is None:
+            return set(generated_groups), set()
+
+        changed = {name for name, value in self._get_settings().items() if previous_settings.get(name) != value}
+
+        ## Pages added afterwards (Add Storyboard Pages) are not in settings, consider page count changed
+        if previous_settings.get('create_camera') and previous_settings.get('add_timeline_markers'):
+            page_markers = [m for m in context.scene.timeline_markers if m.camera and m.name.startswith('stb_')]
+            if len(page_markers) != previous_settings.get('num_pages'):
+                changed.add('num_pages')
+
+        layout_changed = not changed.isdisjoint(layout_settings)
+        update_groups, rebuild_groups = set(), set()
+        for group, (_prefixes, own_settings, rebuild_settings) in generated_groups.items():
+            if layout_changed or not changed.isdisjoint(own_settings):
+                update_groups.add(group)
+            if not changed.isdisjoint(rebuild_settings):
+                rebuild_groups.add(group)
+        return update_groups, rebuild_groups
+
+    def _get_group_objects(self, groups):
+        """Return existing generated objects of given groups"""
+        prefixes = tuple(prefix for group in groups for prefix in generated_groups[group][0])
+        if not prefixes:
+            return []
+        return [obj for obj in bpy.data.objects if obj.name.startswith(prefixes)]
+
+    def _remove_generated_objects(self, objects):
+        """Remove given objects and their unused text datablocks"""
+        for obj in objects:
+            bpy.data.objects.remove(obj, do_unlink=True)
+        self._remove_orphan_text_data()
     
     def invoke(self, context, event):
         # Load settings from active object if it has stb_settings
@@ -847,6 +954,9 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
         col.label(text="Object Settings", icon='OUTLINER_OB_GREASEPENCIL')
         col.prop(self, "force_new_object")
         col.prop(self, "remove_pre_generated")
+        row = col.row()
+        row.enabled = self.remove_pre_generated
+        row.prop(self, "incremental_update")
         
         # Preview info
         layout.separator()
@@ -878,22 +988,21 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
         
         ## Apply custom Typography
         if self.use_custom_font:
-            ## Aileron, CC0 font by Sora Sagano
-            regular = bpy.data.fonts.load(str(FONT_DIR / 'Aileron' / "Aileron-Regular.otf"), check_existing=True)
-            italic = bpy.data.fonts.load(str(FONT_DIR / 'Aileron' / "Aileron-Italic.otf"), check_existing=True)
-            bold = bpy.data.fonts.load(str(FONT_DIR / 'Aileron' / "Aileron-Bold.otf"), check_existing=True)
-            bold_italic = bpy.data.fonts.load(str(FONT_DIR / 'Aileron' / "Aileron-BoldItalic.otf"), check_existing=True)
-
-            obj.data.font = regular
-            obj.data.font_bold = bold
-            obj.data.font_italic = italic
-            obj.data.font_bold_italic = bold_italic
-
-            ## Pack the font to avoid link issues
-            regular.pack()
-            bold.pack()
-            italic.pack()
-            bold_italic.pack()
+            ## Fonts are loaded and packed once per generation, then shared by all texts
+            if self._custom_fonts is None:
+                ## Aileron, CC0 font by Sora Sagano
+                regular = bpy.data.fonts.load(str(FONT_DIR / 'Aileron' / "Aileron-Regular.otf"), check_existing=True)
+                italic = bpy.data.fonts.load(str(FONT_DIR / 'Aileron' / "Aileron-Italic.otf"), check_existing=True)
+                bold = bpy.data.fonts.load(str(FONT_DIR / 'Aileron' / "Aileron-Bold.otf"), check_existing=True)
+                bold_italic = bpy.data.fonts.load(str(FONT_DIR / 'Aileron' / "Aileron-BoldItalic.otf"), check_existing=True)
+                self._custom_fonts = (regular, bold, italic, bold_italic)
+
+                ## Pack the font to avoid link issues
+                for font in self._custom_fonts:
+                    if not font.packed_file:
+                        font.pack()
+
+            obj.data.font, obj.data.font_bold, obj.data.font_italic, obj.data.font_bold_italic = self._custom_fonts
 
     def _get_create_material(self, gp, name, color=(0.0, 0.0, 0.0, 1.0), fill_color=(1.0, 1.0, 1.0, 1.0)):
         if not (mat := gp.materials.get(name)):
@@ -1120,8 +1229,8 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     if self.page_head_left_linked and 'left' in shared_text_data:
                         text_data = shared_text_data['left']
                     else:
-                        text_data = bpy.data.curves.new(obj_name, 'FONT')
-                        text_data.body = self.page_head_left
+                        ## Unlinked: pages share text data until edited
+                        text_data = text_pool.get_pooled_text_data('page_header_left', self.page_head_left)
                     
                     obj = bpy.data.objects.new(obj_name, text_data)
                     self._setup_text(obj)
@@ -1146,8 +1255,8 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     if self.page_head_center_linked and 'center' in shared_text_data:
                         text_data = shared_text_data['center']
                     else:
-                        text_data = bpy.data.curves.new(obj_name, 'FONT')
-                        text_data.body = self.page_head_center
+                        ## Unlinked: pages share text data until edited
+                        text_data = text_pool.get_pooled_text_data('page_header_center', self.page_head_center)
                     
                     obj = bpy.data.objects.new(obj_name, text_data)
                     self._setup_text(obj)
@@ -1172,8 +1281,8 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     if self.page_head_right_linked and 'right' in shared_text_data:
                         text_data = shared_text_data['right']
                     else:
-                        text_data = bpy.data.curves.new(obj_name, 'FONT')
-                        text_data.body = self.page_head_right
+                        ## Unlinked: pages share text data until edited
+                        text_data = text_pool.get_pooled_text_data('page_header_right', self.page_head_right)
                     
                     obj = bpy.data.objects.new(obj_name, text_data)
                     self._setup_text(obj)
@@ -1251,8 +1360,8 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     if self.page_foot_left_linked and 'left' in shared_text_data:
                         text_data = shared_text_data['left']
                     else:
-                        text_data = bpy.data.curves.new(obj_name, 'FONT')
-                        text_data.body = self.page_foot_left
+                        ## Unlinked: pages share text data until edited
+                        text_data = text_pool.get_pooled_text_data('page_footer_left', self.page_foot_left)
                     
                     obj = bpy.data.objects.new(obj_name, text_data)
                     self._setup_text(obj)
@@ -1279,8 +1388,8 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     if self.page_foot_center_linked and 'center' in shared_text_data:
                         text_data = shared_text_data['center']
                     else:
-                        text_data = bpy.data.curves.new(obj_name, 'FONT')
-                        text_data.body = self.page_foot_center
+                        ## Unlinked: pages share text data until edited
+                        text_data = text_pool.get_pooled_text_data('page_footer_center', self.page_foot_center)
                     
                     obj = bpy.data.objects.new(obj_name, text_data)
                     self._setup_text(obj)
@@ -1341,6 +1450,10 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
         notes_width = space_x * self.notes_width_percent / 100
         text_width = notes_width * 0.9  # 90% of notes area width
 
+        ## Unedited notes share a single text datablock
+        default_body = notes_default_bodys.get(self.note_text_format, '')
+        configured_data = set()
+
         panel_count = 0
         for page in range(self.num_pages):
             page_y_offset = -(page * (self.canvas_y + self.page_spacing))
@@ -1366,13 +1479,13 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     text_name = f"panel_{panel_count:04d}"
                     text_obj = bpy.data.objects.get(text_name)
 
-                    is_new_text = False
                     if text_obj and text_obj.type == 'FONT': # and text_obj.data.body not in notes_default_bodys.values()
                         # Reuse existing text object
                         reused_count += 1
+                        text_pool.use_pooled_text_data(text_obj, 'notes', default_body)
                     else:
                         # Create new text object
-                        text_data = bpy.data.curves.new(text_name, 'FONT')
+                        text_data = text_pool.get_pooled_text_data('notes', default_body)
                         text_obj = bpy.data.objects.new(text_name, text_data)
                         self._setup_text(text_obj)
                         
@@ -1384,33 +1497,30 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                         
                         text_collection.objects.link(text_obj)
                         created_count += 1
-                        is_new_text = True
                     
-                    # Configure text object
+                    # Configure text object (once per shared text data)
                     text_data = text_obj.data
-                    
-                    # Set text content only for new objects
-                    if is_new_text:
-                        text_data.body = notes_default_bodys.get(self.note_text_format, '')
+                    if text_data not in configured_data:
+                        configured_data.add(text_data)
 
-                    # Set overflow to NONE (default)
-                    text_data.overflow = 'NONE'
-                    text_data.size = 0.15
-                    
-                    # Set text box width to 90% of notes area width
-                    if not text_data.text_boxes:
-                        text_data.text_boxes.new()
-                    text_data.text_boxes[0].width = text_width
-                    text_data.text_boxes[0].height = 0  # Auto height
+                        # Set overflow to NONE (default)
+                        text_data.overflow = 'NONE'
+                        text_data.size = 0.15
+                        
+                        # Set text box width to 90% of notes area width
+                        if not text_data.text_boxes:
+                            text_data.text_boxes.new()
+                        text_data.text_boxes[0].width = text_width
+                        text_data.text_boxes[0].height = 0  # Auto height
+
+                        # Set alignment
+                        text_data.align_x = 'LEFT'
+                        text_data.align_y = 'TOP'
                     
                     # Position text object in notes area
                     text_obj.location = (notes_center_x - text_width/2, 0, panel_center_y + space_y/2 - 0.1)
                     text_obj.rotation_euler = (1.5708, 0, 0)  # 90 degrees to face camera
                     
-                    # Set alignment
-                    text_data.align_x = 'LEFT'
-                    text_data.align_y = 'TOP'
-                    
                     text_objects.append(text_obj)
         
         return text_objects, created_count, reused_count
@@ -1439,6 +1549,9 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
         # Calculate text size based on header height
         base_text_size = 0.15
         header_text_size = max(0.1, min(base_text_size, self.notes_header_height * 0.6))
+
+        ## Unedited headers share a single text datablock
+        configured_data = set()
         
         panel_count = 0
         for page in range(self.num_pages):
@@ -1470,27 +1583,24 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     shot_text_name = f"stb_shot_num_{panel_count:04d}"
                     shot_text_obj = bpy.data.objects.get(shot_text_name)
                     
-                    is_new_shot = False
                     if shot_text_obj and shot_text_obj.type == 'FONT':
                         reused_count += 1
+                        text_pool.use_pooled_text_data(shot_text_obj, 'shot_num', self.panel_header_left)
                     else:
-                        shot_text_data = bpy.data.curves.new(shot_text_name, 'FONT')
+                        shot_text_data = text_pool.get_pooled_text_data('shot_num', self.panel_header_left)
                         shot_text_obj = bpy.data.objects.new(shot_text_name, shot_text_data)
                         self._setup_text(shot_text_obj)
                         header_collection.objects.link(shot_text_obj)
                         created_count += 1
-                        is_new_shot = True
                     
-                    # Configure shot text object
+                    # Configure shot text object (once per shared text data)
                     shot_text_data = shot_text_obj.data
-                    
-                    if is_new_shot:
-                        shot_text_data.body = self.panel_header_left
-                    
-                    shot_text_data.overflow = 'NONE'
-                    shot_text_data.size = header_text_size
-                    shot_text_data.align_x = 'LEFT'
-                    shot_text_data.align_y = 'CENTER'
+                    if shot_text_data not in configured_data:
+                        configured_data.add(shot_text_data)
+                        shot_text_data.overflow = 'NONE'
+                        shot_text_data.size = header_text_size
+                        shot_text_data.align_x = 'LEFT'
+                        shot_text_data.align_y = 'CENTER'
                     
                     # Position shot text at left side of header area
                     shot_text_obj.location = (panel_left + header_margin, 0, header_y)
@@ -1502,27 +1612,24 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                     panel_text_name = f"stb_panel_num_{panel_count:04d}"
                     panel_text_obj = bpy.data.objects.get(panel_text_name)
                     
-                    is_new_panel = False
                     if panel_text_obj and panel_text_obj.type == 'FONT':
                         reused_count += 1
+                        text_pool.use_pooled_text_data(panel_text_obj, 'panel_num', self.panel_header_right)
                     else:
-                        panel_text_data = bpy.data.curves.new(panel_text_name, 'FONT')
+                        panel_text_data = text_pool.get_pooled_text_data('panel_num', self.panel_header_right)
                         panel_text_obj = bpy.data.objects.new(panel_text_name, panel_text_data)
                         self._setup_text(panel_text_obj)
                         header_collection.objects.link(panel_text_obj)
                         created_count += 1
-                        is_new_panel = True
                     
-                    # Configure panel text object
+                    # Configure panel text object (once per shared text data)
                     panel_text_data = panel_text_obj.data
-                    
-                    if is_new_panel:
-                        panel_text_data.body = self.panel_header_right
-                    
-                    panel_text_data.overflow = 'NONE'
-                    panel_text_data.size = header_text_size
-                    panel_text_data.align_x = 'RIGHT'
-                    panel_text_data.align_y = 'CENTER'
+                    if panel_text_data not in configured_data:
+                        configured_data.add(panel_text_data)
+                        panel_text_data.overflow = 'NONE'
+                        panel_text_data.size = header_text_size
+                        panel_text_data.align_x = 'RIGHT'
+                        panel_text_data.align_y = 'CENTER'
                     
                     # Position panel text at right side of header area (with margin)
                     header_right = panel_left + drawing_width
@@ -1599,8 +1706,9 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
         return camera_objects
     
     def _create_timeline_markers(self, context, camera_objects):
-        """Create timeline markers for each camera"""
+        """Create timeline markers for each camera, return created (or updated) marker names"""
         scene = context.scene
+        marker_names = []
         
         for page, camera_obj in enumerate(camera_objects):
             marker_name = camera_obj.name # Use same name as camera
@@ -1615,92 +1723,149 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                 marker = scene.timeline_markers.new(marker_name, frame=frame_number)
             ## Assign camera
             marker.camera = camera_obj
-    
-    def _create_canvas_frame(self, drawing, mat_index, page_y_offset=0):
-        """Create a border frame around the canvas"""
-        half_width = self.canvas_x / 2
-        half_height = self.canvas_y / 2
-        
-        corners = [
-            Vector((-half_width, 0, half_height + page_y_offset)),    # top-left
-            Vector((half_width, 0, half_height + page_y_offset)),     # top-right
-            Vector((half_width, 0, -half_height + page_y_offset)),    # bottom-right
-            Vector((-half_width, 0, -half_height + page_y_offset)),   # bottom-left
-        ]
-        
-        drawing.add_strokes([4])
-        stroke = drawing.strokes[-1]
-        stroke.cyclic = True
-        stroke.material_index = mat_index
-        
-        for i, pt in enumerate(stroke.points):
-            pt.position = corners[i]
-            pt.radius = 0.0007
-    
-    def _create_panel_frame(self, drawing, panels_mat_index, center_x, center_y, width, height, drawing_area_height=None):
-        """Create a frame around the entire panel area with notes separator lines"""
-        half_width = width / 2
-        half_height = height / 2
-
-        # Create outer frame around entire panel
-        corners = [
-            Vector((center_x - half_width, 0, center_y + half_height)),  # top-left
-            Vector((center_x + half_width, 0, center_y + half_height)),  # top-right
-            Vector((center_x + half_width, 0, center_y - half_height)),  # bottom-right
-            Vector((center_x - half_width, 0, center_y - half_height)),  # bottom-left
-        ]
-        
-        drawing.add_strokes([4])
-        stroke = drawing.strokes[-1]
-        stroke.cyclic = True
-        stroke.material_index = panels_mat_index
-        
-        for i, pt in enumerate(stroke.points):
-            pt.position = corners[i]
-            pt.radius = self.line_radius
-        
-        # Add vertical separator line between drawing and notes area
-        notes_width_ratio = self.notes_width_percent / 100
-        separator_x = center_x - half_width + width * (1 - notes_width_ratio)
-        
-        drawing.add_strokes([2])
-        stroke = drawing.strokes[-1]
-        stroke.material_index = panels_mat_index
-        
-        stroke.points[0].position = Vector((separator_x, 0, center_y + half_height))
-        stroke.points[1].position = Vector((separator_x, 0, center_y - half_height))
-        stroke.points[0].radius = self.line_radius
-        stroke.points[1].radius = self.line_radius
-
-        # Add header separator line above the drawing frame area if header height > 0
-        if self.include_notes and self.notes_header_height > 0:
-            # Calculate the drawing area bounds
-            notes_width_ratio = self.notes_width_percent / 100
-            drawing_area_width = width * (1 - notes_width_ratio)
-            drawing_left = center_x - half_width
-            
-            # Position header separator above the drawing area
-            if drawing_area_height is not None:
-                header_y = center_y + (drawing_area_height/2 - self.notes_header_height/2)
-            else:
-                header_y = center_y + half_height - self.notes_header_height
-            
-            drawing.add_strokes([2])
-            stroke = drawing.strokes[-1]
-            stroke.material_index = panels_mat_index
-            
-            # Header separator spans the width of the drawing area only
-            stroke.points[0].position = Vector((drawing_left, 0, header_y))
-            stroke.points[1].position = Vector((drawing_left + drawing_area_width, 0, header_y))
-            stroke.points[0].radius = self.line_radius
-            stroke.points[1].radius = self.line_radius
-    
+            marker_names.append(marker.name)
+        return marker_names
+    
+    def _build_grid_strokes(self, frames_mat_index, panels_mat_index, panels_start_y, effective_canvas_x,
+                            space_x, space_y, drawing_width, frame_width, frame_height, drawing_area_height):
+        """Compute all strokes of all pages as arrays (single bulk write with fn.add_strokes_bulk)
+        Stroke order per page: canvas frame, then for each panel: drawing frame, notes frame strokes
+        (panel frame, notes separator, header separator)
+
+        return positions (points, 3), sizes (strokes,), radii (points,), cyclic (strokes,), materials (strokes,)
+        """
+        ## Panels of one page, row by row (same order as reading)
+        r_idx, c_idx = np.divmod(np.arange(self.rows * self.columns), self.columns)
+        panel_left = -(effective_canvas_x / 2) + c_idx * (space_x + self.panel_margin_x)
+        panel_top = panels_start_y - r_idx * (space_y + self.panel_margin_y)
+        panel_center_x = panel_left + space_x / 2
+        panel_center_y = panel_top - space_y / 2
+
+        # Adjust panel center if header is above drawing area
+        use_notes_frames = self.include_notes and self.show_notes_frames and panels_mat_index is not None
+        drawing_center_y = panel_center_y
+        if self.include_notes and self.show_notes_frames and self.notes_header_height > 0:
+            # Shift drawing area down by half the header height
+            drawing_center_y = panel_center_y - self.notes_header_height / 2
+
+        # Drawing area is on the left side of the panel with notes, else centered in the panel
+        drawing_left = panel_left if self.include_notes else panel_left + (space_x - drawing_width) / 2
+        drawing_center_x = drawing_left + drawing_width / 2
+
+        ## Strokes of each panel as X-Z coordinates: (panels, points, 2)
+        ## rectangle corners order: top-left, top-right, bottom-right, bottom-left
+        rect_signs = np.array(((-1, 1), (1, 1), (1, -1), (-1, -1)))
+        panel_strokes = [np.stack((drawing_center_x, drawing_center_y), axis=-1)[:, None, :]
+                         + rect_signs * (frame_width / 2, frame_height / 2)]
+        sizes = [4]
+        cyclic = [True]
+        materials = [frames_mat_index]
+
+        if use_notes_frames:
+            # Frame around the entire panel area (not just notes portion)
+            panel_strokes.append(np.stack((panel_center_x, panel_center_y), axis=-1)[:, None, :]
+                                 + rect_signs * (space_x / 2, space_y / 2))
+            # Vertical separator line between drawing and notes area
+            separator_x = panel_left + space_x * (1 - self.notes_width_percent / 100)
+            panel_strokes.append(np.stack((
+                np.stack((separator_x, panel_center_y + space_y / 2), axis=-1),
+                np.stack((separator_x, panel_center_y - space_y / 2), axis=-1)), axis=1))
+            sizes += [4, 2]
+            cyclic += [True, False]
+            materials += [panels_mat_index, panels_mat_index]
+
+            # Header separator above the drawing area, spans the width of the drawing area only
+            if self.notes_header_height > 0:
+                header_y = panel_center_y + (drawing_area_height / 2 - self.notes_header_height / 2)
+                panel_strokes.append(np.stack((
+                    np.stack((panel_left, header_y), axis=-1),
+                    np.stack((separator_x, header_y), axis=-1)), axis=1))
+                sizes += [2]
+                cyclic += [False]
+                materials += [panels_mat_index]
+
+        ## Concatenate per panel to keep strokes of the same panel together
+        page_xz = np.concatenate(panel_strokes, axis=1).reshape(-1, 2)
+        page_sizes = np.tile(sizes, len(panel_left))
+        page_cyclic = np.tile(cyclic, len(panel_left))
+        page_materials = np.tile(materials, len(panel_left))
+        page_radii = np.full(len(page_xz), self.line_radius)
+
+        # Canvas border frame first
+        if self.show_canvas_frame:
+            canvas_xz = rect_signs * (self.canvas_x / 2, self.canvas_y / 2)
+            page_xz = np.concatenate((canvas_xz, page_xz))
+            page_sizes = np.concatenate(([4], page_sizes))
+            page_cyclic = np.concatenate(([True], page_cyclic))
+            page_materials = np.concatenate(([panels_mat_index], page_materials))
+            page_radii = np.concatenate((np.full(4, 0.0007), page_radii))
+
+        ## Repeat page for all pages, with a vertical offset
+        page_y_offsets = -(np.arange(self.num_pages) * (self.canvas_y + self.page_spacing))
+        positions = np.zeros((self.num_pages, len(page_xz), 3), dtype=np.float32)
+        positions[:, :, 0] = page_xz[:, 0]
+        positions[:, :, 2] = page_xz[:, 1] + page_y_offsets[:, None]
+
+        return (positions.reshape(-1, 3),
+                np.tile(page_sizes, self.num_pages),
+                np.tile(page_radii, self.num_pages),
+                np.tile(page_cyclic, self.num_pages).astype(bool),
+                np.tile(page_materials, self.num_pages))
+    
+    def _update_grid_strokes(self, drawing, positions, sizes, radii, cyclic, materials):
+        """Rewrite only strokes that differ from the existing drawing strokes
+        Existing strokes are kept up to the first difference
+        (e.g: only new pages strokes are written when increasing page count)
+
+        return number of written strokes
+        """
+        offsets = fn.get_curve_offsets(drawing)
+        old_count = len(offsets) - 1
+        new_offsets = np.concatenate(([0], np.cumsum(sizes)))
+
+        ## Keep strokes until first point count difference
+        common = min(old_count, len(sizes))
+        same_size = np.diff(offsets)[:common] == sizes[:common]
+        keep = common if same_size.all() else int(np.argmin(same_size))
+
+        ## Then until first stroke with different points or curve attributes
+        if keep:
+            end = new_offsets[keep]
+            old_positions = fn.get_named_attribute_array(drawing, 'position')[:end]
+            old_radii = fn.get_named_attribute_array(drawing, 'radius')[:end]
+            point_diff = ((np.abs(old_positions - positions[:end]) > 1e-6).any(axis=1)
+                          | (np.abs(old_radii - radii[:end]) > 1e-6))
+            stroke_diff = np.logical_or.reduceat(point_diff, new_offsets[:keep])
+            stroke_diff |= fn.get_named_attribute_array(drawing, 'cyclic', domain='CURVE')[:keep] != cyclic[:keep]
+            stroke_diff |= fn.get_named_attribute_array(drawing, 'material_index', domain='CURVE')[:keep] != materials[:keep]
+            if stroke_diff.any():
+                keep = int(np.argmax(stroke_diff))
+
+        if keep < old_count:
+            drawing.remove_strokes(indices=range(keep, old_count))
+        start = new_offsets[keep]
+        fn.add_strokes_bulk(drawing, positions[start:], sizes[keep:],
+                            radius=radii[start:], cyclic=cyclic[keep:], material_index=materials[keep:])
+        return len(sizes) - keep
+
     def execute(self, context):
+        start_time = perf_counter()
         # Initialize logo width tracking
         self._logo_width = 0
-        
+        self._custom_fonts = None
+        
+        ## Incremental update: compare with settings of previous generation to update only what changed
+        previous_settings = None
+        if (self.remove_pre_generated and self.incremental_update and not self.force_new_object
+                and context.object and context.object.type == 'GREASEPENCIL'):
+            if (previous_settings := context.object.get('stb_settings')) is not None:
+                previous_settings = previous_settings.to_dict()
+        ## Names of markers created by previous generation (and Add Storyboard Pages)
+        previous_markers = list(context.object.get('stb_marker_names', ())) if previous_settings is not None else []
+        marker_names = previous_markers
+
         # Remove pre-generated elements if requested
-        if self.remove_pre_generated:
+        if self.remove_pre_generated and previous_settings is None:
             removed_count = self._remove_pre_generated_elements(context)
             # self.report({'INFO'}, f"Removed {removed_count['objects']} objects and {removed_count['markers']} timeline markers")
 
@@ -1717,6 +1882,11 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
             if self.custom_ratio_y > 0:
                 self.frame_ratio = self.custom_ratio_x / self.custom_ratio_y
         
+        update_groups, rebuild_groups = self._get_changed_groups(context, previous_settings)
+        if rebuild_groups:
+            ## Text content or linking changed: recreate these elements
+            self._remove_generated_objects(self._get_group_objects(rebuild_groups))
+
         # Create or get grease pencil object
         need_new_object = (self.force_new_object or 
                           not context.object or 
@@ -1786,8 +1956,9 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
                 self.report({'ERROR'}, 'No material index for Panels material')
                 return {'CANCELLED'}
         
-        # Clear existing strokes
-        drawing.remove_strokes()
+        # Clear existing strokes (incremental update only rewrite changed strokes)
+        if previous_settings is None:
+            drawing.remove_strokes()
         
         # Calculate dimensions accounting for headers and footers
         effective_canvas_x = self.canvas_x - (2 * self.canvas_margin)
@@ -1843,111 +2014,81 @@ class STORYTOOLS_OT_create_static_storyboard_pages(Operator):
             canvas_top -= self.page_header_height
         panels_start_y = canvas_top - (effective_canvas_y / 2) + (effective_canvas_y / 2)
         
-        # Create frames for all pages        
-        for page in range(self.num_pages):
-            page_y_offset = -(page * (self.canvas_y + self.page_spacing))
-            
-            # Create canvas frame if requested
-            if self.show_canvas_frame:
-                self._create_canvas_frame(drawing, panels_mat_index, page_y_offset)
-            
-            # Calculate start position for this page (top-left of the drawing area)
-            start_x = -(effective_canvas_x / 2)
-            start_y = panels_start_y + page_y_offset
-            
-            # Create panel frames
-            panel_count = 0
-            for r_idx in range(self.rows):
-                for c_idx in range(self.columns):
-                    panel_count += 1
-                    
-                    # Calculate panel boundaries (using separate X and Y margins)
-                    panel_left = start_x + c_idx * (space_x + self.panel_margin_x)
-                    panel_right = panel_left + space_x
-                    panel_top = start_y - r_idx * (space_y + self.panel_margin_y)
-                    panel_bottom = panel_top - space_y
-                    
-                    panel_center_y = (panel_top + panel_bottom) / 2
-                    
-                    # Adjust panel center if header is above drawing area
-                    drawing_center_y = panel_center_y
-                    if self.include_notes and self.show_notes_frames and self.notes_header_height > 0:
-                        # Shift drawing area down by half the header height
-                        drawing_center_y = panel_center_y - self.notes_header_height / 2
-                    
-                    # Calculate drawing area within the panel
-                    if self.include_notes:
-                        # Drawing area is on the left side of the panel
-                        drawing_left = panel_left
-                        drawing_right = panel_left + drawing_width
-                    else:
-                        # Drawing area is centered in the panel
-                        drawing_left = panel_left + (space_x - drawing_width) / 2
-                        drawing_right = drawing_left + drawing_width
-                    
-                    drawing_center_x = (drawing_left + drawing_right) / 2
-                    
-                    # Create drawing frame (centered within the drawing area) - using Frames material
-                    half_width = frame_width / 2
-                    half_height = frame_height / 2
-                    
-                    corners = [
-                        Vector((drawing_center_x - half_width, 0, drawing_center_y + half_height)),  # top-left
-                        Vector((drawing_center_x + half_width, 0, drawing_center_y + half_height)),  # top-right
-                        Vector((drawing_center_x + half_width, 0, drawing_center_y - half_height)),  # bottom-right
-                        Vector((drawing_center_x - half_width, 0, drawing_center_y - half_height)),  # bottom-left
-                    ]
-                    
-                    drawing.add_strokes([4])
-                    stroke = drawing.strokes[-1]
-                    stroke.cyclic = True
-                    stroke.material_index = frames_mat_index  # Use Frames material for drawing frames
-                    
-                    for i, pt in enumerate(stroke.points):
-                        pt.position = corners[i]
-                        pt.radius = self.line_radius
-                    
-                    # Create notes frame if requested and if show_notes_frames is enabled - using Panels material
-                    if self.include_notes and self.show_notes_frames and panels_mat_index is not None:
-                        # Create frame around the entire panel area (not just notes portion)
-                        panel_center_x = (panel_left + panel_right) / 2
-                        self._create_panel_frame(drawing, panels_mat_index, panel_center_x, panel_center_y, space_x, space_y, drawing_area_height)
+        # Create frames for all pages in a single bulk pass
+        stroke_data = self._build_grid_strokes(
+            frames_mat_index, panels_mat_index, panels_start_y, effective_canvas_x,
+            space_x, space_y, drawing_width, frame_width, frame_height, drawing_area_height)
+        positions, sizes, radii, cyclic, materials = stroke_data
+        if previous_settings is None:
+            fn.add_strokes_bulk(drawing, positions, sizes, radius=radii, cyclic=cyclic, material_index=materials)
+            written_count = len(sizes)
+        else:
+            written_count = self._update_grid_strokes(drawing, positions, sizes, radii, cyclic, materials)
         
+        ## Keep track of (re)generated objects, for incremental update cleanup
+        generated_objects = []
+
         # Create page header and footer text objects
-        if self.include_page_header:
+        if self.include_page_header and 'page_header' in update_groups:
             header_objects, created_header, reused_header = self._create_page_header_text_objects(context)
-        
-        # Create footer logo first (so we know its width for text positioning)
-        if self.include_page_footer and self.enable_footer_logo and self._validate_image_path(self.footer_logo_path):
-            logo_objects, created_logo, reused_logo = self._create_footer_logo(context)
-        
-        if self.include_page_footer:
-            footer_objects, created_footer, reused_footer = self._create_page_footer_text_objects(context)
+            generated_objects += header_objects
+        
+        ## Footer texts position depends on logo width
+        if not update_groups.isdisjoint(('page_footer', 'logo')):
+            # Create footer logo first (so we know its width for text positioning)
+            if self.include_page_footer and self.enable_footer_logo and self._validate_image_path(self.footer_logo_path):
+                logo_objects, created_logo, reused_logo = self._create_footer_logo(context)
+                generated_objects += logo_objects
+            
+            if self.include_page_footer and 'page_footer' in update_groups:
+                footer_objects, created_footer, reused_footer = self._create_page_footer_text_objects(context)
+                generated_objects += footer_objects
         
         # Create text objects if requested
         if self.include_notes and self.create_text_objects:
-            text_objects, created_text, reused_text = self._create_text_objects(context, panels_start_y, effective_canvas_y)
+            if 'notes' in update_groups:
+                text_objects, created_text, reused_text = self._create_text_objects(context, panels_start_y, effective_canvas_y)
+                generated_objects += text_objects
 
             # Create header text objects if header height > 0
-            header_text_objects, created_panel_header, reused_panel_header = self._create_header_text_objects(context, panels_start_y, effective_canvas_y)
+            if 'panel_header' in update_groups:
+                header_text_objects, created_panel_header, reused_panel_header = self._create_header_text_objects(context, panels_start_y, effective_canvas_y)
+                generated_objects += header_text_objects
         
         # Create cameras if requested
         camera_objects = []
-        if self.create_camera:
+        if 'cameras' in update_groups:
+            marker_names = []
+        if self.create_camera and 'cameras' in update_groups:
             camera_objects = self._create_cameras(context)
+            generated_objects += camera_objects
             
             # Create timeline markers
             if self.add_timeline_markers:
-                self._create_timeline_markers(context, camera_objects)
+                marker_names = self._create_timeline_markers(context, camera_objects)
                 context.scene.frame_start = 1
                 context.scene.frame_end = self.num_pages
 
-            ## Set first cam active in view
-            context.region_data.view_perspective = 'CAMERA'
+            ## Set first cam active in view (no viewport in background mode)
+            if context.region_data:
+                context.region_data.view_perspective = 'CAMERA'
+
+        if previous_settings is not None:
+            ## Remove elements of updated groups that were not regenerated (beyond new page/panel count, disabled)
+            kept = set(generated_objects)
+            self._remove_generated_objects([o for o in self._get_group_objects(update_groups) if o not in kept])
+            if 'cameras' in update_groups:
+                scene = context.scene
+                for name in set(previous_markers).difference(marker_names):
+                    if marker := scene.timeline_markers.get(name):
+                        scene.timeline_markers.remove(marker)
 
         # Save current settings to the object
         self._save_settings_to_object(obj)
+        obj['stb_marker_names'] = marker_names
 
+        ## Report generation time (keep an eye on performance regressions)
+        self.report({'INFO'}, f"Generated {self.num_pages} page(s), {written_count}/{len(sizes)} strokes written in {perf_counter() - start_time:.3f}s")
         return {'FINISHED'}
 
 """ 
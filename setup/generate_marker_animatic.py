@@ -7,6 +7,8 @@ from mathutils import Vector, Matrix
 from bpy.props import FloatProperty, IntProperty, EnumProperty, BoolProperty, StringProperty
 
 from .. import fn
+from .panel_index import get_panel_index
+from .marker_timeline import MarkerTimeline
 
 
 class STORYTOOLS_OT_create_animatic_from_board(Operator):
@@ -52,29 +54,28 @@ class STORYTOOLS_OT_create_animatic_from_board(Operator):
 
     ## need a target scene name ?
 
-    def invoke(self, context, event):
+    def scan_board(self, context):
+        """Get Frames material index, panel count and aspect ratio of the active storyboard
+        return an error message if the storyboard is not valid
+        """
         ## check if a storyboard object is active
         if not context.object:
-            self.report({'ERROR'}, "No Storyboard Grease Pencil object selected")
-            return {'CANCELLED'}
+            return "No Storyboard Grease Pencil object selected"
         
         board_obj = context.object
         self.material_index = next((i for i, ms in enumerate(board_obj.material_slots) if ms.material and ms.material.name == 'Frames'), None)
         if self.material_index is None:
-            self.report({'ERROR'}, 'Abort: Could not find any "Frames" material in the storyboard object')
-            return {'CANCELLED'}
+            return 'Abort: Could not find any "Frames" material in the storyboard object'
         
         # handle case where layer was renamed ?
         grid = board_obj.data.layers.get('Frames')
         if not grid:
-            self.report({'ERROR'}, 'Abort: There is no layer named "Frames" found')
-            return {'CANCELLED'}
+            return 'Abort: There is no layer named "Frames" found'
 
         dr = grid.current_frame().drawing
         st_frames = [s for s in dr.strokes if s.material_index == self.material_index]
         if not st_frames:
-            self.report({'ERROR'}, 'Abort: No frames stroke found in the storyboard (stroke using "Frames" material in "Frames" Layer)')
-            return {'CANCELLED'}
+            return 'Abort: No frames stroke found in the storyboard (stroke using "Frames" material in "Frames" Layer)'
         
         self.number_of_frames = len(st_frames)
 
@@ -83,6 +84,13 @@ class STORYTOOLS_OT_create_animatic_from_board(Operator):
         height = corner_max.z - corner_min.z
         self.aspect_ratio = height / width if width != 0 else 1.0
 
+    def invoke(self, context, event):
+        if error := self.scan_board(context):
+            self.report({'ERROR'}, error)
+            return {'CANCELLED'}
+
+        board_obj = context.object
+
         ## Change direction if there is only one columns
 
         # TODO: if row/column is 1x1, just hide read direction option
@@ -125,6 +133,12 @@ class STORYTOOLS_OT_create_animatic_from_board(Operator):
         # layout.label(text=f"Detected Aspect Ratio: {self.aspect_ratio:.2f}")
     
     def execute(self, context):
+        ## Scan board when run without invoke (scripting, batch)
+        if getattr(self, 'material_index', None) is None:
+            if error := self.scan_board(context):
+                self.report({'ERROR'}, error)
+                return {'CANCELLED'}
+
         ## Create new scene and link the whole storyboard object and collection
 
         ## detect all position, maybe it'
@@ -133,60 +147,18 @@ class STORYTOOLS_OT_create_animatic_from_board(Operator):
         
         ## Keep default order or reorder based on name or frame number ??
 
-        ## get all frames
-        board_obj = context.object
-        grid = board_obj.data.layers.get('Frames')
-        dr = grid.current_frame().drawing
-        stroke_frames = [s for s in dr.strokes if s.material_index == self.material_index]
-        
-        ## Get the each frame corners and center in list (min, max, center)
-        ## Exact corner position
-        # frame_corners = [fn.get_min_max_corner([p.position for p in s.points]) for s in stroke_frames]
-        ## Add center as a third element in list
-        # frames_coords = [(f[0], f[1], ((f[0] + f[1]) / 2)) for f in frame_corners]
-        
-        ## contract by radius to fit inside the frame and add center in same loop.
-        frames_coords = []
-        for s in stroke_frames:
-            min_corner, max_corner = fn.get_min_max_corner([p.position for p in s.points])
-            radius = s.points[0].radius
-            frames_coords.append((
-                min_corner + Vector((radius, 0, radius)),
-                max_corner + Vector((-radius, 0, -radius)),
-                (min_corner + max_corner) / 2
-            ))
-
-        ## group by pages (camera boundaries)
+        ## get all frames grouped by pages (camera boundaries), sorted by read direction in each groups
         ## Create a list of lists pages = [[page1 frames...], [page2 frames...]]
-        page_list = []
-        for marker in page_markers:
-            draw_frames = []
-            camera = marker.camera
-            cam_frame = fn.get_cam_frame_world(camera, scene=source_scene)
-            cam_min, cam_max = fn.get_min_max_corner(cam_frame)
-
-            for i in range(len(frames_coords)-1,-1,-1):
-                ## frame_coord -> tuple of vectors : (min_corner, max_corner, center)
-                
-                frame_coord = frames_coords[i]
-
-                if fn.any_point_in_box(frame_coord, cam_min, cam_max):
-                    ## append in current page list and remove from source list
-                    draw_frames.append(frames_coords.pop(i))
-
-            ## Todo optional: if all strokes in pages are empty, ignore pages
-            ## Easily doable, but heavy... better have a manual page range limit, start-end)
-            page_list.append(draw_frames)
-
-        ## sort by read direction in each groups
-        for frames_list in page_list:
-            ## sort frames by their center position
-            if self.read_direction == 'RIGHT':
-                # sort by Z then X
-                frames_list.sort(key=lambda vecs: (-vecs[2].z, vecs[2].x))
-            else:
-                # sort by X then Z
-                frames_list.sort(key=lambda vecs: (vecs[2].x, -vecs[2].z))
+        ## frame_coord -> tuple of vectors : (min_corner, max_corner, center)
+        ## contracted by radius to fit inside the frame
+        board_obj = context.object
+        index = get_panel_index(board_obj, source_scene, self.material_index,
+                                read_direction=self.read_direction, contract_by_radius=True,
+                                page_markers=page_markers)
+        page_list = index.page_list if index else []
+
+        ## Todo optional: if all strokes in pages are empty, ignore pages
+        ## Easily doable, but heavy... better have a manual page range limit, start-end)
 
         ## Concatenate all groups ? (not needed for now)
 
@@ -270,8 +242,9 @@ class STORYTOOLS_OT_create_animatic_from_board(Operator):
             ## continuously push ending frame            
             scn.frame_end = (frame_count * self.frame_offset) - self.frame_offset
 
-        ## make animatic scene active
-        bpy.context.window.scene = scn        
+        ## make animatic scene active (no window in background mode)
+        if context.window:
+            context.window.scene = scn
         ## Activate marker management in new scene
         scn.storytools_settings.show_marker_management = True
         return {'FINISHED'}
@@ -280,7 +253,8 @@ class STORYTOOLS_OT_create_animatic_from_board(Operator):
 class STORYTOOLS_OT_push_markers(Operator):
     bl_idname = "storytools.push_markers"
     bl_label = "Push Markers"
-    bl_description = "Push all markers to the right of the current frame by 1 (10 with Shift pressed)"
+    bl_description = "Push all markers to the right of the current frame by 1 (10 with Shift pressed)\
+        \nOnly markers until the end of the preview range when it is enabled"
     bl_options = {'REGISTER', 'UNDO'}
 
     direction: EnumProperty(
@@ -293,38 +267,52 @@ class STORYTOOLS_OT_push_markers(Operator):
         default='RIGHT'
     )
 
+    retime_keyframes: BoolProperty(
+        name="Retime Keyframes",
+        description="Also push Grease Pencil keyframes located after the current frame",
+        default=False
+    )
+
+    use_preview_range: BoolProperty(
+        name="Limit To Preview Range",
+        description="Only push markers until the end of the preview range (when enabled in scene)",
+        default=True
+    )
+
     def invoke(self, context, event):
         self.step = 10 if event.shift else 1
         return self.execute(context)
 
     def execute(self, context):
         current_frame = context.scene.frame_current
-        step = self.step if self.direction == 'RIGHT' else -self.step
-
-        moved = False
-        for marker in context.scene.timeline_markers:
-            marker.select = marker.frame > current_frame
-            if marker.frame > current_frame:
-                marker.frame += step
-                moved = True
-        
-        if not moved:
+        step = getattr(self, 'step', 1)
+        step = step if self.direction == 'RIGHT' else -step
+
+        scn = context.scene
+        timeline = MarkerTimeline(scn)
+        if self.use_preview_range and scn.use_preview_range and scn.frame_preview_end > current_frame:
+            timeline.offset_range(current_frame + 1, scn.frame_preview_end, step)
+        else:
+            timeline.push(current_frame, step)
+        if not timeline.moved_count():
             self.report({'WARNING'}, "No markers subsequent markers to move")
             return {'FINISHED'}
 
+        timeline.apply(select_moved=True)
+        if self.retime_keyframes:
+            if skipped := timeline.retime_keyframes(context.scene.objects):
+                self.report({'WARNING'}, f"{skipped} keyframe(s) not moved, destination frame already used")
+
         ## Show 
         fps = context.scene.render.fps
 
-        ordered_markers = sorted([m for m in context.scene.timeline_markers], key=lambda m: m.frame)
-
-        current_marker = max((m for m in ordered_markers if m.frame <= current_frame), key=lambda m: m.frame, default=None)
-        next_marker = min((m for m in ordered_markers if m.frame > current_frame), key=lambda m: m.frame, default=None)
-        if not current_marker or not next_marker:
+        current_marker_frame, next_marker_frame = timeline.surrounding_markers(current_frame)
+        if current_marker_frame is None or next_marker_frame is None:
             return {'FINISHED'}
 
         ## Use last marker as reference for frame padding
-        padding = len(str(next_marker.frame)) # could be ordered_markers[-1] frame ? more logic ?
-        frame_count = next_marker.frame - current_marker.frame
+        padding = len(str(next_marker_frame)) # could be ordered_markers[-1] frame ? more logic ?
+        frame_count = next_marker_frame - current_marker_frame
         marker_time = frame_count / fps
         self.report({'INFO'}, f"Current shot: {frame_count:0{padding}d} frames. Time: {marker_time:.2f}s")
         return {'FINISHED'}
@@ -346,63 +334,49 @@ class STORYTOOLS_OT_time_compression(Operator):
         default='COMPRESS'
     )
 
+    retime_keyframes: BoolProperty(
+        name="Retime Keyframes",
+        description="Also retime Grease Pencil keyframes with their shot marker",
+        default=False
+    )
+
     def invoke(self, context, event):
         self.force_compress = event.ctrl
         return self.execute(context)
 
-    def report_average_time(self, context, markers):
+    def report_average_time(self, context, timeline):
         # Calculate average time between frames
-        total_time = 0
-        frame_differences = []
-
-        for i in range(1, len(markers)):
-            frame_diff = markers[i].frame - markers[i - 1].frame
-            frame_differences.append(frame_diff)
-            total_time += frame_diff
-
-        if frame_differences:
-            avg_time = total_time / len(frame_differences)
+        frame_differences = timeline.gaps()
+        if len(frame_differences):
+            avg_time = float(frame_differences.mean())
             avg_time_seconds = avg_time / context.scene.render.fps
             self.report({'INFO'}, f"Average time between frames: {avg_time:.2f} frames ({avg_time_seconds:.2f} seconds)")
 
     def execute(self, context):
-        ## Sort markers by frame number
-        markers = sorted(context.scene.timeline_markers, key=lambda m: m.frame)
-        if len(markers) < 2:
+        ## Sorted markers frames
+        timeline = MarkerTimeline(context.scene)
+        if len(timeline) < 2:
             self.report({'WARNING'}, "Not enough markers to perform time compression or dilation")
             return {'CANCELLED'}
 
-        step = -1 if self.direction == 'COMPRESS' else 1
-
         if self.direction == 'DILATE':
-            for i in range(1, len(markers)):
-                markers[i].frame += i * step
-            
-            self.report_average_time(context, markers)
-            return {'FINISHED'}
-
-        if not self.force_compress:
-            ## Avoid first using 0
-            for i in range(len(markers) - 1, 0, -1):
-                if markers[i].frame - markers[i - 1].frame <= 1:
-                    print('Marker too close:', markers[i].name, markers[i].frame)
+            timeline.dilate()
+        else:
+            if not getattr(self, 'force_compress', False):
+                if too_close := np.flatnonzero(timeline.gaps() <= 1).tolist():
+                    print('Marker too close at frames:', [int(timeline.frames[i + 1]) for i in too_close])
                     self.report({'WARNING'}, "Some markers are too close to compress (Ctrl + Click to bypass and still compress other)")
                     return {'CANCELLED'}
-        
-        # Avoid first using 1
-        for i in range(1, len(markers)):
-            frame_numbers = [m.frame for m in markers]
-            for j in range(1, len(markers)):
-                if j < i:
-                    ## Don't touch already compressed markers
-                    continue
-
-                if frame_numbers[j - 1] >= frame_numbers[j] - 1:
-                    break
-
-                markers[j].frame -= 1
-        
-        self.report_average_time(context, markers)
+            ## Markers too close (one frame or less) are kept together
+            timeline.compress()
+
+        timeline.apply()
+        if self.retime_keyframes:
+            if skipped := timeline.retime_keyframes(context.scene.objects):
+                self.report({'WARNING'}, f"{skipped} keyframe(s) not moved, destination frame already used")
+                return {'FINISHED'}
+
+        self.report_average_time(context, timeline)
 
         # self.report({'INFO'}, f"Timeline {'compressed' if step == -1 else 'dilated'} successfully")
         return {'FINISHED'}
@@ -0,0 +1,140 @@
+## Marker retiming: scene timeline markers as a sorted frame array
+## Each retime (compress, dilate, push, range offset) is a single vectorized pass over all markers,
+## written back in one foreach_set. Grease Pencil keyframes can be retimed with the same offsets
+## (offsets are vectorized, but keyframes are still moved one by one: there is no bulk frame move in the API).
+
+import numpy as np
+
+
+class MarkerTimeline:
+    """Sorted frames of scene timeline markers
+
+    Retime methods compute `new_frames` (sorted order) and the offset applied to any frame of the timeline,
+    nothing is written until apply()
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        markers = scene.timeline_markers
+        frames = np.empty(len(markers), dtype=np.int32)
+        markers.foreach_get('frame', frames)
+
+        ## Markers collection index of each sorted frame
+        self.order = np.argsort(frames, kind='stable')
+        self.frames = frames[self.order]
+        self.new_frames = self.frames.copy()
+
+        ## Piecewise offsets for any frame: frames >= boundaries[i] get deltas[i + 1] (deltas[0] before first boundary)
+        self._boundaries = np.empty(0, dtype=np.int32)
+        self._deltas = np.zeros(1, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def gaps(self):
+        """Frame count between each consecutive markers"""
+        return np.diff(self.frames)
+
+    def _set_marker_offsets(self, offsets):
+        """Offsets per sorted marker, frames between two markers follow the previous marker"""
+        self.new_frames = self.frames + offsets
+        self._boundaries = self.frames
+        self._deltas = np.concatenate(([0], offsets)).astype(np.int32)
+
+    def compress(self):
+        """Remove one frame between each consecutive markers (markers one frame apart or less are kept together)"""
+        if len(self.frames) < 2:
+            return
+        shifts = np.concatenate(([0], np.cumsum(self.gaps() > 1)))
+        self._set_marker_offsets(-shifts)
+
+    def dilate(self):
+        """Add one frame between each consecutive markers"""
+        self._set_marker_offsets(np.arange(len(self.frames), dtype=np.int32))
+
+    def push(self, after_frame, step):
+        """Offset markers located after given frame by step"""
+        self.new_frames = np.where(self.frames > after_frame, self.frames + step, self.frames)
+        self._boundaries = np.array([after_frame + 1], dtype=np.int32)
+        self._deltas = np.array([0, step], dtype=np.int32)
+
+    def offset_range(self, frame_start, frame_end, offset):
+        """Offset markers inside the frame range (included) by offset"""
+        in_range = (self.frames >= frame_start) & (self.frames <= frame_end)
+        self.new_frames = np.where(in_range, self.frames + offset, self.frames)
+        self._boundaries = np.array([frame_start, frame_end + 1], dtype=np.int32)
+        self._deltas = np.array([0, offset, 0], dtype=np.int32)
+
+    def map_frames(self, frames):
+        """Return frames (array) retimed with offsets of the last retime operation"""
+        frames = np.asarray(frames, dtype=np.int32)
+        return frames + self._deltas[np.searchsorted(self._boundaries, frames, side='right')]
+
+    def moved_count(self):
+        return int(np.count_nonzero(self.new_frames != self.frames))
+
+    def apply(self, select_moved=False):
+        """Write new frames to markers, optionally select only moved markers"""
+        frames = np.empty(len(self.frames), dtype=np.int32)
+        frames[self.order] = self.new_frames
+        markers = self.scene.timeline_markers
+        if select_moved:
+            moved = np.empty(len(self.frames), dtype=bool)
+            moved[self.order] = self.new_frames != self.frames
+            markers.foreach_set('select', moved)
+        markers.foreach_set('frame', frames)
+
+        self.frames = np.sort(self.new_frames, kind='stable')
+        self.order = self.order[np.argsort(self.new_frames, kind='stable')]
+        self.new_frames = self.frames.copy()
+
+    def retime_keyframes(self, objects):
+        """Move keyframes of Grease Pencil objects with offsets of the last retime operation
+        Moves are ordered so keyframes never jump over each other,
+        a keyframe is left in place if its new frame is already occupied
+
+        return number of keyframes that could not be moved
+        """
+        skipped = 0
+        for ob in objects:
+            if ob.type != 'GREASEPENCIL':
+                continue
+            for layer in ob.data.layers:
+                frame_numbers = np.empty(len(layer.frames), dtype=np.int32)
+                layer.frames.foreach_get('frame_number', frame_numbers)
+                new_numbers = self.map_frames(frame_numbers)
+                moves = new_numbers - frame_numbers
+                if not moves.any():
+                    continue
+                ## Left moves first from start, then right moves from end
+                left = np.flatnonzero(moves < 0)
+                right = np.flatnonzero(moves > 0)
+                left = left[np.argsort(frame_numbers[left])]
+                right = right[np.argsort(frame_numbers[right])[::-1]]
+
+                occupied = set(frame_numbers.tolist())
+                for i in np.concatenate((left, right)):
+                    src, dst = int(frame_numbers[i]), int(new_numbers[i])
+                    if dst in occupied:
+                        skipped += 1
+                        continue
+                    layer.frames.move(src, dst)
+                    occupied.discard(src)
+                    occupied.add(dst)
+        return skipped
+
+    def surrounding_markers(self, frame):
+        """Return frames of last marker at or before frame and first marker after frame (None if missing)"""
+        idx = int(np.searchsorted(self.frames, frame, side='right'))
+        previous_frame = int(self.frames[idx - 1]) if idx > 0 else None
+        next_frame = int(self.frames[idx]) if idx < len(self.frames) else None
+        return previous_frame, next_frame
+
+
+def get_page_markers(scene, prefix='stb_'):
+    """Return storyboard page markers (bound to a camera, name starting with prefix) sorted by frame"""
+    markers = scene.timeline_markers
+    frames = np.empty(len(markers), dtype=np.int32)
+    markers.foreach_get('frame', frames)
+    sorted_markers = (markers[i] for i in np.argsort(frames, kind='stable').tolist())
+    return [m for m in sorted_markers if m.camera and m.name.startswith(prefix)]
@@ -0,0 +1,270 @@
+import bpy
+import numpy as np
+
+from bpy.app.handlers import persistent
+from mathutils import Vector
+
+from .. import fn
+
+## Built indexes: (board name, material index, read direction, point count, contract) -> (revision, PanelIndex)
+_index_cache = {}
+
+## Incremented when grease pencil data, cameras or objects are updated (depsgraph), cheap revision of the index
+_update_count = 0
+
+def tag_panel_index(depsgraph=None):
+    '''Mark built indexes as outdated if "Frames" drawing or page cameras may have changed (all if depsgraph is None)'''
+    global _update_count
+    if depsgraph is None:
+        _index_cache.clear()
+        _update_count += 1
+        return
+    if any(isinstance(u.id, (bpy.types.GreasePencil, bpy.types.Camera, bpy.types.Object)) for u in depsgraph.updates):
+        _update_count += 1
+
+@persistent
+def panel_index_depsgraph_update(scene, depsgraph):
+    tag_panel_index(depsgraph)
+
+@persistent
+def panel_index_reset_handler(*args):
+    tag_panel_index()
+
+
+class PanelIndex:
+    '''Storyboard panels rectangles (X-Z plane of the board drawing) grouped by page and sorted in read order.
+
+    Panels are bucketed in a uniform grid (cell size of the largest panel),
+    so a point lookup only tests the few panels overlapping a single cell.
+
+    panels: list of (min_corner, max_corner, center) Vectors in global read order,
+        panels outside all pages come last (from paged_count)
+    page_list: same tuples grouped by page (page markers order), without panels outside pages
+    curves: stroke index in the "Frames" drawing of each panel (global read order)
+    '''
+
+    def __init__(self, rects, ys, curves, page_rects, read_direction='RIGHT'):
+        '''
+        rects: (n, 4) array of panel rectangles (min_x, min_z, max_x, max_z), stroke order
+        ys: (n,) array of panels depth (y)
+        curves: (n,) array of panels stroke index
+        page_rects: (p, 4) array of page rectangles (min_x, min_z, max_x, max_z), page markers order
+        '''
+        ## Assign panels to first page containing one of its corners or center
+        centers = (rects[:, :2] + rects[:, 2:]) / 2
+        test_points = np.stack((rects[:, :2], rects[:, 2:], centers), axis=1) # (n, 3, 2)
+        if len(page_rects):
+            in_page = ((test_points[:, :, None, 0] >= page_rects[None, None, :, 0])
+                       & (test_points[:, :, None, 1] >= page_rects[None, None, :, 1])
+                       & (test_points[:, :, None, 0] <= page_rects[None, None, :, 2])
+                       & (test_points[:, :, None, 1] <= page_rects[None, None, :, 3])).any(axis=1) # (n, p)
+            has_page = in_page.any(axis=1)
+            page_of = np.argmax(in_page, axis=1)
+        else:
+            has_page = np.zeros(len(rects), dtype=bool)
+            page_of = np.zeros(len(rects), dtype=np.int64)
+
+        ## Sort by page, then by read direction on panel center (panels outside pages after all pages)
+        page_of = np.where(has_page, page_of, len(page_rects))
+        x, z = centers[:, 0], centers[:, 1]
+        if read_direction == 'RIGHT':
+            order = np.lexsort((x, -z, page_of))
+        else:
+            order = np.lexsort((-z, x, page_of))
+
+        self.rects = rects[order]
+        self.curves = curves[order]
+        self.page_of = page_of[order]
+        self.paged_count = int(np.count_nonzero(has_page))
+        self.panels = []
+        self.page_list = [[] for _ in range(len(page_rects))]
+        for (min_x, min_z, max_x, max_z), y, page in zip(self.rects, ys[order], self.page_of):
+            min_corner = Vector((min_x, y, min_z))
+            max_corner = Vector((max_x, y, max_z))
+            panel = (min_corner, max_corner, (min_corner + max_corner) / 2)
+            self.panels.append(panel)
+            if page < len(page_rects):
+                self.page_list[page].append(panel)
+
+        self._build_grid()
+
+    def __len__(self):
+        return len(self.panels)
+
+    def _build_grid(self):
+        self.cell_size = 1.0
+        self.origin = np.zeros(2)
+        self.cell_table = np.full((1, 1, 1), -1, dtype=np.int64)
+        if not len(self.rects):
+            return
+
+        sizes = self.rects[:, 2:] - self.rects[:, :2]
+        self.cell_size = max(float(sizes.max()), 1e-6)
+        self.origin = self.rects[:, :2].min(axis=0)
+        low = np.floor((self.rects[:, :2] - self.origin) / self.cell_size).astype(np.int64)
+        high = np.floor((self.rects[:, 2:] - self.origin) / self.cell_size).astype(np.int64)
+
+        buckets = {}
+        for i, (lo, hi) in enumerate(zip(low, high)):
+            for cx in range(lo[0], hi[0] + 1):
+                for cz in range(lo[1], hi[1] + 1):
+                    buckets.setdefault((cx, cz), []).append(i)
+
+        ## Dense (cells_x, cells_z, max candidates) table, padded with -1, for vectorized lookups
+        shape = (*(high.max(axis=0) + 1), max(len(v) for v in buckets.values()))
+        self.cell_table = np.full(shape, -1, dtype=np.int64)
+        for (cx, cz), candidates in buckets.items():
+            self.cell_table[cx, cz, :len(candidates)] = candidates
+
+    def panels_at(self, coords) -> np.ndarray:
+        '''Return index (global read order) of the panel containing each X-Z coordinate, -1 if none
+        coords: (n, 2) array of (x, z)
+        '''
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        result = np.full(len(coords), -1, dtype=np.int64)
+        if not len(self.rects) or not len(coords):
+            return result
+
+        cells = np.floor((coords - self.origin) / self.cell_size).astype(np.int64)
+        valid = ((cells >= 0) & (cells < self.cell_table.shape[:2])).all(axis=1)
+        point_ids = np.flatnonzero(valid)
+        candidates = self.cell_table[cells[point_ids, 0], cells[point_ids, 1]]
+        for column in candidates.T:
+            ## Candidates are stored in ascending order: lowest panel index wins
+            rects = self.rects[column]
+            co = coords[point_ids]
+            inside = ((column >= 0) & (result[point_ids] == -1)
+                      & (co[:, 0] >= rects[:, 0]) & (co[:, 1] >= rects[:, 1])
+                      & (co[:, 0] <= rects[:, 2]) & (co[:, 1] <= rects[:, 3]))
+            result[point_ids[inside]] = column[inside]
+        return result
+
+    def panel_at(self, co):
+        '''Return index of the panel containing a location (X-Z), None if outside all panels'''
+        index = self.panels_at(((co[0], co[2]),))[0]
+        return None if index == -1 else int(index)
+
+    def stroke_panels(self, drawing) -> np.ndarray:
+        '''Return panel index of each stroke of a drawing, -1 when no point is inside a panel
+        When a stroke crosses multiple panels, the first one in read order is used
+        '''
+        offsets = fn.get_curve_offsets(drawing)
+        if len(offsets) < 2:
+            return np.empty(0, dtype=np.int64)
+        positions = fn.get_attribute_array(drawing.attributes['position'])
+        point_panels = self.panels_at(positions[:, ::2])
+        point_panels[point_panels == -1] = len(self.panels)
+        stroke_panels = np.minimum.reduceat(point_panels, offsets[:-1])
+        stroke_panels[stroke_panels == len(self.panels)] = -1
+        return stroke_panels
+
+    def offset_table(self, panel_offsets) -> np.ndarray:
+        '''Return (panels + 1, 3) array of translation per panel index (global read order)
+        panel_offsets: {panel index: offset vector}, other panels (including panels outside pages)
+        and the last row (strokes outside panels, index -1) are not moved
+        '''
+        table = np.zeros((len(self.panels) + 1, 3), dtype=np.float32)
+        for panel_id, offset_vector in panel_offsets.items():
+            table[panel_id] = offset_vector
+        return table
+
+
+def iter_content_drawings(board_obj):
+    '''Yield drawings of all keyframes of the board layers (except "Frames" layer)
+    a drawing shared by multiple keyframes is yielded once'''
+    seen = set()
+    for layer in board_obj.data.layers:
+        if layer.name == 'Frames':
+            continue
+        for frame in layer.frames:
+            drawing = frame.drawing
+            if drawing is None or drawing.as_pointer() in seen:
+                continue
+            seen.add(drawing.as_pointer())
+            yield drawing
+
+def get_page_rects(scene, page_markers) -> np.ndarray:
+    '''Return (p, 4) array of page camera frames rectangles (min_x, min_z, max_x, max_z)'''
+    rects = np.empty((len(page_markers), 4), dtype=np.float64)
+    for i, marker in enumerate(page_markers):
+        cam_frame = np.array(fn.get_cam_frame_world(marker.camera, scene=scene))
+        rects[i] = (*cam_frame[:, ::2].min(axis=0), *cam_frame[:, ::2].max(axis=0))
+    return rects
+
+def get_panel_index(board_obj, scene, material_index, read_direction='RIGHT', point_count=None, contract_by_radius=False, page_markers=None):
+    '''Return the PanelIndex of a storyboard object, rebuilt only when the "Frames" drawing or pages changed
+
+    material_index: material index of the panel strokes in "Frames" layer
+    point_count: only consider strokes with this number of points (None: all)
+    contract_by_radius: shrink rectangles by the stroke radius (to fit inside the drawn frame line)
+    page_markers: page markers list, default to scene 'stb_' markers with camera
+    return None if there is no "Frames" layer drawing
+    '''
+    layer = board_obj.data.layers.get('Frames')
+    frame = layer.current_frame() if layer else None
+    if frame is None:
+        return
+
+    drawing = frame.drawing
+    if page_markers is None:
+        page_markers = [m for m in scene.timeline_markers if m.camera and m.name.startswith('stb_')]
+
+    ## Cheap revision: depsgraph update counter (drawing edits, camera moves), drawing and markers identity
+    revision = (_update_count, drawing.as_pointer(),
+                drawing.attributes.domain_size('POINT'), drawing.attributes.domain_size('CURVE'),
+                tuple((m.name, m.camera.name) for m in page_markers))
+    key = (board_obj.name, material_index, read_direction, point_count, contract_by_radius)
+    cached = _index_cache.get(key)
+    if cached and cached[0] == revision:
+        return cached[1]
+
+    page_rects = get_page_rects(scene, page_markers)
+    offsets = fn.get_curve_offsets(drawing)
+    positions = fn.get_attribute_array(drawing.attributes['position']) if len(offsets) > 1 else np.empty((0, 3), dtype=np.float32)
+    material_attr = drawing.attributes.get('material_index')
+    materials = fn.get_attribute_array(material_attr) if material_attr else np.zeros(len(offsets) - 1, dtype=np.int32)
+
+    sizes = np.diff(offsets)
+    mask = materials == material_index
+    if point_count is not None:
+        mask &= sizes == point_count
+    curves = np.flatnonzero(mask)
+
+    rects = np.empty((len(curves), 4), dtype=np.float64)
+    ys = np.zeros(len(curves), dtype=np.float64)
+    if len(curves):
+        starts = offsets[curves]
+        point_ids = fn.ranges_to_indices(starts, sizes[curves])
+        ## reduceat on the concatenated panel points: ranges start at cumulated sizes
+        local_starts = np.concatenate(([0], np.cumsum(sizes[curves])[:-1]))
+        xz = positions[point_ids][:, ::2]
+        rects[:, :2] = np.minimum.reduceat(xz, local_starts, axis=0)
+        rects[:, 2:] = np.maximum.reduceat(xz, local_starts, axis=0)
+        ys = np.add.reduceat(positions[point_ids][:, 1], local_starts) / sizes[curves]
+
+        if contract_by_radius:
+            radius_attr = drawing.attributes.get('radius')
+            ## 0.01 is the default radius of new grease pencil points
+            radii = fn.get_attribute_array(radius_attr)[starts] if radius_attr else np.full(len(curves), 0.01)
+            rects[:, :2] += radii[:, None]
+            rects[:, 2:] -= radii[:, None]
+
+    index = PanelIndex(rects, ys, curves, page_rects, read_direction=read_direction)
+    if len(_index_cache) > 16:
+        _index_cache.clear()
+    _index_cache[key] = (revision, index)
+    return index
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(panel_index_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(panel_index_reset_handler)
+
+def unregister():
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if panel_index_reset_handler in handlers:
+            handlers.remove(panel_index_reset_handler)
+    if panel_index_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(panel_index_depsgraph_update)
+    tag_panel_index()
@@ -0,0 +1,137 @@
+## Parallel storyboard page rendering: page frames are split in chunks,
+## each chunk is rendered by a background Blender process on the same blend file and output pattern
+
+import os
+import re
+import bpy
+import time
+import subprocess
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+## Line printed by Blender when a frame is written
+SAVED_LINE = re.compile(r"^Saved: ")
+
+
+def get_frame_chunks(frames, workers):
+    """Split sorted frames in at most `workers` chunks of contiguous pages (balanced size)"""
+    frames = sorted(set(frames))
+    workers = max(1, min(workers, len(frames)))
+    size, extra = divmod(len(frames), workers)
+    chunks = []
+    start = 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(frames[start:end])
+        start = end
+    return [c for c in chunks if c]
+
+def format_frames(frames):
+    """Return frames as Blender command line frame list, consecutive frames as ranges ('1..4,7,9..10')"""
+    parts = []
+    start = prev = frames[0]
+    for frame in frames[1:] + [None]:
+        if frame is not None and frame == prev + 1:
+            prev = frame
+            continue
+        parts.append(str(start) if start == prev else f'{start}..{prev}')
+        start = prev = frame
+    return ','.join(parts)
+
+
+class RenderDispatcher:
+    """Render frames of a blend file with multiple background Blender processes
+
+    Usage: dispatcher.start(), then poll `finished` / `done_count` (or call wait())
+    failures: list of (frames, error message) of chunks that did not render
+    """
+
+    def __init__(self, blend_path, output, frames, workers=2, scene_name=None, threads=None, remove_blend=False):
+        """remove_blend: delete the blend file on cleanup (temporary copy)"""
+        self.blend_path = str(blend_path)
+        self.remove_blend = remove_blend
+        self.output = output
+        self.scene_name = scene_name
+        self.chunks = get_frame_chunks(frames, workers)
+        self.total = sum(len(c) for c in self.chunks)
+        ## Share CPU threads between processes
+        self.threads = threads or max(1, (os.cpu_count() or 1) // max(1, len(self.chunks)))
+
+        self.done_count = 0
+        self.failures = []
+        self._lock = threading.Lock()
+        self._processes = []
+        self._cancelled = False
+        self._executor = None
+        self._futures = []
+
+    def get_command(self, frames):
+        command = [bpy.app.binary_path, '-b', self.blend_path]
+        if self.scene_name:
+            command += ['-S', self.scene_name]
+        command += ['-o', self.output, '-t', str(self.threads), '-f', format_frames(frames)]
+        return command
+
+    def _render_chunk(self, frames):
+        if self._cancelled:
+            return
+        process = subprocess.Popen(self.get_command(frames),
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT,
+                                   text=True,
+                                   errors='replace')
+        with self._lock:
+            self._processes.append(process)
+
+        last_lines = []
+        for line in process.stdout:
+            if SAVED_LINE.match(line):
+                with self._lock:
+                    self.done_count += 1
+            last_lines = (last_lines + [line.rstrip()])[-10:]
+        process.wait()
+
+        if process.returncode != 0 and not self._cancelled:
+            with self._lock:
+                self.failures.append((frames, f'Exit code {process.returncode}: ' + '\n'.join(last_lines)))
+
+    def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=len(self.chunks), thread_name_prefix='stb_render')
+        self._futures = [self._executor.submit(self._render_chunk, chunk) for chunk in self.chunks]
+        self._executor.shutdown(wait=False)
+
+    @property
+    def finished(self):
+        return all(f.done() for f in self._futures)
+
+    @property
+    def progress(self):
+        return self.done_count / self.total if self.total else 1.0
+
+    def wait(self, callback=None, interval=1.0):
+        """Block until all chunks are rendered, callback(dispatcher) is called every interval"""
+        while not self.finished:
+            time.sleep(interval)
+            if callback:
+                callback(self)
+        ## Raise unexpected errors from worker threads
+        for future in self._futures:
+            future.result()
+
+    def cleanup(self):
+        if not self.remove_blend or not os.path.exists(self.blend_path):
+            return
+        os.remove(self.blend_path)
+        ## Also remove the temporary folder if nothing else is in it
+        try:
+            os.rmdir(os.path.dirname(self.blend_path))
+        except OSError:
+            pass
+
+    def cancel(self):
+        self._cancelled = True
+        with self._lock:
+            for process in self._processes:
+                if process.poll() is None:
+                    process.terminate()
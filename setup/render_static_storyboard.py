@@ -1,8 +1,64 @@
 import bpy
+import tempfile
 from pathlib import Path
-from bpy.props import StringProperty,BoolProperty
+from bpy.props import StringProperty, BoolProperty, IntProperty
 from bpy.types import Operator
 
+from .render_dispatch import RenderDispatcher
+from .marker_timeline import get_page_markers
+
+
+def get_page_frame_range(scn):
+    """Return (start, end) frames of storyboard page camera markers, None if there is no page marker"""
+    marker_frames = [m.frame for m in scn.timeline_markers if m.camera and m.name.startswith('stb')]
+    if not marker_frames:
+        return None
+    return min(marker_frames), max(marker_frames)
+
+def get_page_frames(scn):
+    """Return sorted frames of storyboard page camera markers"""
+    return list(dict.fromkeys(m.frame for m in get_page_markers(scn, prefix='stb')))
+
+def get_default_render_path():
+    """Return default output pattern in a folder named after the blend file, None if file is not saved"""
+    if not bpy.data.is_saved:
+        return None
+    folder_name = bpy.path.clean_name(Path(bpy.data.filepath).stem)
+    return f'//{folder_name}/{folder_name}_####'
+
+def render_storyboard_images(scn, filepath, set_range_to_marker=False, invoke=True):
+    """Render storyboard pages images of given scene to filepath (output pattern)
+    invoke: render in a window with progress (disable in background mode)
+    """
+    scn.render.filepath = filepath
+
+    if set_range_to_marker and (page_range := get_page_frame_range(scn)):
+        scn.frame_start, scn.frame_end = page_range
+
+    if invoke:
+        return bpy.ops.render.render('INVOKE_DEFAULT', animation=True)
+    return bpy.ops.render.render(animation=True, scene=scn.name)
+
+def render_storyboard_parallel(scn, filepath, workers):
+    """Start rendering storyboard pages of given scene with multiple background Blender processes
+    Current file state is saved as a temporary copy rendered by all processes
+    return the started RenderDispatcher, None if there is no page marker
+    """
+    frames = get_page_frames(scn)
+    if not frames:
+        return None
+
+    ## Relative output is resolved from current file, temp copy remap its own relative paths
+    output = bpy.path.abspath(filepath)
+    blend_name = bpy.path.clean_name(Path(bpy.data.filepath).stem) if bpy.data.is_saved else 'untitled'
+    temp_blend = Path(tempfile.mkdtemp(prefix='stb_render_')) / f'{blend_name}.blend'
+    bpy.ops.wm.save_as_mainfile(filepath=str(temp_blend), copy=True, relative_remap=True, check_existing=False)
+
+    dispatcher = RenderDispatcher(temp_blend, output, frames, workers=workers,
+                                  scene_name=scn.name, remove_blend=True)
+    dispatcher.start()
+    return dispatcher
+
 class WORLD_OT_create_white_world(Operator):
     """Set World Background to White"""
     bl_idname = "world.create_white_world"
@@ -55,13 +111,22 @@ class STORYTOOLS_OT_render_storyboard_images(Operator):
         options={'SKIP_SAVE'},
     )
 
+    workers: IntProperty(
+        name="Parallel Renders",
+        description="Number of background Blender processes rendering pages at the same time\
+            \n1: Render in current session (render window)\
+            \nMore: pages are split between processes rendering a copy of the current file",
+        default=1,
+        min=1,
+        soft_max=16,
+        max=64,
+    )
+
     def invoke(self, context, event):
         ## prefill render output
         scn = context.scene
-        if bpy.data.is_saved:
-            blend_path = Path(bpy.data.filepath)
-            folder_name = bpy.path.clean_name(blend_path.stem)
-            self.filepath = f'//{folder_name}/{folder_name}_####'
+        if default_path := get_default_render_path():
+            self.filepath = default_path
 
         return context.window_manager.invoke_props_dialog(self, width=400)
 
@@ -72,6 +137,7 @@ class STORYTOOLS_OT_render_storyboard_images(Operator):
         ## Export path
         layout.label(text="Export Path:")
         layout.prop(self, "filepath", text="")
+        layout.prop(self, "workers")
         
         # layout.label(text="Some options to consider")
 
@@ -106,10 +172,8 @@ If you want "direct" colors, set it to 'Standard'"""
 
         layout.separator()
         ## Range check
-        marker_frames = [m.frame for m in scn.timeline_markers if m.camera and m.name.startswith('stb')]
-        if marker_frames:
-            min_frame = min(marker_frames)
-            max_frame = max(marker_frames)
+        if page_range := get_page_frame_range(scn):
+            min_frame, max_frame = page_range
             if min_frame != scn.frame_start or max_frame != scn.frame_end:
                 layout.label(text="Render Range", icon='TIME')
                 layout.label(text="Set timeline range to stb camera markers ?")
@@ -124,17 +188,52 @@ If you want "direct" colors, set it to 'Standard'"""
             self.report({'ERROR'}, "No filepath set for rendering")
             return {'CANCELLED'}
 
-        scn.render.filepath = self.filepath
+        if self.workers > 1:
+            return self.start_parallel_render(context)
 
-        if self.set_range_to_marker:
-            marker_frames = [m.frame for m in scn.timeline_markers if m.camera and m.name.startswith('stb')]
-            if marker_frames:
-                min_frame = min(marker_frames)
-                max_frame = max(marker_frames)
-                scn.frame_start = min_frame
-                scn.frame_end = max_frame
+        render_storyboard_images(scn, self.filepath, set_range_to_marker=self.set_range_to_marker)
+        return {'FINISHED'}
+
+    def start_parallel_render(self, context):
+        self._dispatcher = render_storyboard_parallel(context.scene, self.filepath, self.workers)
+        if self._dispatcher is None:
+            self.report({'ERROR'}, "No storyboard page marker to render")
+            return {'CANCELLED'}
 
-        bpy.ops.render.render('INVOKE_DEFAULT', animation=True)
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.5, window=context.window)
+        wm.progress_begin(0, self._dispatcher.total)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        dispatcher = self._dispatcher
+        if event.type == 'ESC' and event.value == 'PRESS':
+            dispatcher.cancel()
+            self.report({'WARNING'}, "Render cancelled")
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        context.window_manager.progress_update(dispatcher.done_count)
+        context.workspace.status_text_set(
+            f"Rendering pages: {dispatcher.done_count}/{dispatcher.total} ({len(dispatcher.chunks)} processes) - Esc to cancel")
+        if not dispatcher.finished:
+            return {'PASS_THROUGH'}
+
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        dispatcher.cleanup()
+
+        for frames, error in dispatcher.failures:
+            print(f"Storyboard render failed for frames {frames}:\n{error}")
+        if dispatcher.failures:
+            failed_count = sum(len(frames) for frames, _error in dispatcher.failures)
+            self.report({'ERROR'}, f"{failed_count} page(s) failed to render, see console for details")
+        else:
+            self.report({'INFO'}, f"Rendered {dispatcher.done_count} page(s) to {bpy.path.abspath(self.filepath)}")
         return {'FINISHED'}
 
 
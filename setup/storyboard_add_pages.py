@@ -8,6 +8,8 @@ import re
 
 from .. import fn
 from .create_static_storyboard import notes_default_bodys
+from . import text_pool
+from .marker_timeline import get_page_markers
 
 # TODO: fix bad duplications names (name_number.00...number)
 
@@ -81,9 +83,8 @@ class STORYTOOLS_OT_storyboard_add_pages(Operator):
         board_obj = context.object
         
         # Get existing page markers
-        page_markers = [m for m in scene.timeline_markers if m.camera and m.name.startswith('stb_')]
+        page_markers = get_page_markers(scene)
         # page_markers.sort(key=lambda m: int(m.name.rsplit('_', 1)[1]))
-        page_markers.sort(key=lambda m: m.frame)
         
         if self.source_page > len(page_markers):
             self.report({'ERROR'}, f"Source page {self.source_page} doesn't exist")
@@ -146,6 +147,7 @@ class STORYTOOLS_OT_storyboard_add_pages(Operator):
                     vertex_color_attr.data.foreach_set('color', vertex_color_np_array)
 
         self.current_objects = [obj for obj in stb_collection.all_objects]
+        page_offsets = []
 
         # Create new pages
         for i in range(self.num_pages):
@@ -166,18 +168,25 @@ class STORYTOOLS_OT_storyboard_add_pages(Operator):
             new_marker = scene.timeline_markers.new(f"stb_cam_{new_page_num:02d}")
             new_marker.camera = new_camera
             new_marker.frame = last_marker.frame + (i + 1)
+            ## Register marker as generated, for storyboard regeneration cleanup
+            board_obj['stb_marker_names'] = [*board_obj.get('stb_marker_names', ()), new_marker.name]
             
-            # Duplicate strokes from source page
-            self.duplicate_strokes_from_page(board_obj, source_min, source_max, new_page_offset)
-            
+            page_offsets.append(new_page_offset)
+
             # Duplicate and update text objects
             self.duplicate_objects(stb_collection, source_min, source_max, new_page_offset, new_page_num, stb_settings)
-                
+
+        # Duplicate strokes from source page for all new pages at once
+        self.duplicate_strokes_from_page(board_obj, source_min, source_max, page_offsets)
+
         self.report({'INFO'}, f"Added {self.num_pages} new pages")
         return {'FINISHED'}
     
-    def duplicate_strokes_from_page(self, board_obj, source_min, source_max, offset):
-        """Duplicate grease pencil strokes from source page to new location"""
+    def duplicate_strokes_from_page(self, board_obj, source_min, source_max, offsets):
+        """Duplicate grease pencil strokes from source page to each new page location
+        offsets: list of page offset vectors (only vertical offset is applied)
+        """
+        translations = [(0, 0, offset.z) for offset in offsets]
         for layer in board_obj.data.layers:
             if layer.name != 'Frames':  # Skip all layers except frame layer
                 continue
@@ -186,32 +195,12 @@ class STORYTOOLS_OT_storyboard_add_pages(Operator):
                 continue
             
             drawing = frame.drawing
-            strokes_to_duplicate = []
-            
-            # Find strokes within source page bounds
-            for stroke in drawing.strokes:
-                if any(source_min.x <= p.position.x <= source_max.x and 
-                       source_min.z <= p.position.z <= source_max.z for p in stroke.points):
-                    strokes_to_duplicate.append(stroke)
-
-            drawing.add_strokes([len(s.points) for s in strokes_to_duplicate])
 
-            new_strokes = drawing.strokes[-len(strokes_to_duplicate):]
-            
-            for stroke, new_stroke in zip(strokes_to_duplicate, new_strokes):
-                new_stroke.material_index = stroke.material_index
-                new_stroke.softness = stroke.softness
-                new_stroke.fill_color = stroke.fill_color
-                new_stroke.fill_opacity = stroke.fill_opacity
-                new_stroke.start_cap = stroke.start_cap
-                new_stroke.end_cap = stroke.end_cap
+            # Find strokes within source page bounds
+            in_page = fn.strokes_in_box_mask(drawing, source_min, source_max)
 
-                new_stroke.cyclic = stroke.cyclic
-                for i, point in enumerate(stroke.points):
-                    new_stroke.points[i].position = point.position + Vector((0, 0, offset.z))
-                    new_stroke.points[i].radius = point.radius
-                    new_stroke.points[i].opacity = point.opacity
-                    new_stroke.points[i].vertex_color = point.vertex_color
+            # Copy all strokes and their attributes for every new page in one pass
+            fn.duplicate_strokes(drawing, np.flatnonzero(in_page), translations)
     
     def duplicate_objects(self, collection, source_min, source_max, offset, new_page_num, stb_settings):
         """Duplicate text objects from source page and update page numbers"""
@@ -239,36 +228,39 @@ class STORYTOOLS_OT_storyboard_add_pages(Operator):
                 is_linked = True  # Always link logo objects
 
             new_obj = obj.copy()
-            if is_linked:
-                new_obj.data = obj.data
-            else:
-                new_obj.data = obj.data.copy()
             new_obj.location = obj.location + offset
             
             ## link in same collection
             obj.users_collection[0].objects.link(new_obj)
-            
+
             if is_linked:
                 continue
 
-            ## if not linked, update text content based on object type
+            ## Reset panel texts to initial content, sharing text data of unedited texts
+            ## (pooled data styled as the source text, copied from it when missing)
             ## Or maybe we want to keep original texts ?... could be an option
             if new_obj.name.startswith("stb_shot_num"):
-                # Update shot number if it contains page reference
                 content = stb_settings.get("panel_header_left", "")
-                new_obj.data.body = content
+                new_obj.data = text_pool.get_pooled_text_data('shot_num', content, source=obj.data)
+                continue
             
             elif new_obj.name.startswith("stb_panel_num"):
-                # Update panel number
                 content = stb_settings.get("panel_header_right", "")
-                new_obj.data.body = content
+                new_obj.data = text_pool.get_pooled_text_data('panel_num', content, source=obj.data)
+                continue
             
             elif new_obj.name.startswith("panel_"):
-                # Reset notes content
                 content = notes_default_bodys.get(stb_settings.get("note_text_format", ""), "")
-                new_obj.data.body = content
-            
-            elif new_obj.name.startswith("stb_page"):
+                new_obj.data = text_pool.get_pooled_text_data('notes', content, source=obj.data)
+                continue
+
+            if obj.type == 'FONT' and text_pool.is_pooled(obj.data):
+                continue
+
+            new_obj.data = obj.data.copy()
+
+            ## if not linked, update text content based on object type
+            if new_obj.name.startswith("stb_page"):
                 # Update page number in page headers/footers
                 new_obj.data.body = re.sub(r'\d+', str(new_page_num).zfill(2), new_obj.data.body)
                 ## For smart addition
@@ -0,0 +1,148 @@
+## Storyboard batch API: generate, extend, animate and render storyboards from scripts
+## Usable without UI in background mode (blender -b), see storyboard_batch_cli.py at addon root
+
+import bpy
+
+from pathlib import Path
+from time import perf_counter
+
+from .render_static_storyboard import get_default_render_path, render_storyboard_images, render_storyboard_parallel
+
+
+def get_board_object(scene=None):
+    """Return the storyboard grease pencil object of the scene (generated with storyboard settings)
+    None if there is no storyboard in scene"""
+    scene = scene or bpy.context.scene
+    return next((o for o in scene.objects if o.type == 'GREASEPENCIL' and o.get('stb_settings')), None)
+
+def run_operator(operator, scene=None, obj=None, **props):
+    """Execute an operator (without invoke) with given scene and active object
+    raise RuntimeError if operator did not finish (cancelled)
+    """
+    scene = scene or bpy.context.scene
+    view_layer = scene.view_layers[0]
+    override = {'scene': scene, 'view_layer': view_layer, 'collection': scene.collection}
+    if obj is not None:
+        override.update(object=obj, active_object=obj, selected_objects=[obj])
+    with bpy.context.temp_override(**override):
+        result = operator('EXEC_DEFAULT', **props)
+    if 'FINISHED' not in result:
+        raise RuntimeError(f'{operator.idname_py()} did not finish: {", ".join(sorted(result))}')
+    return result
+
+def generate_static_storyboard(scene=None, obj=None, new_object=False, **settings):
+    """Generate (or regenerate) a static storyboard grid
+    obj: storyboard object to regenerate, default to scene storyboard object
+    new_object: create a new storyboard object even if one exists in scene
+    settings: generator settings (same names as storytools.create_static_storyboard_pages properties)
+              settings saved on regenerated object are used for unspecified properties
+
+    return the storyboard object
+    """
+    scene = scene or bpy.context.scene
+    if obj is None and not new_object:
+        obj = get_board_object(scene)
+
+    props = {}
+    if obj is not None and (stb_settings := obj.get('stb_settings')):
+        props.update(stb_settings.to_dict())
+        ## Saved canvas size would be replaced by default preset
+        props['canvas_preset'] = 'CUSTOM'
+    props.update(settings)
+    props['force_new_object'] = obj is None
+
+    run_operator(bpy.ops.storytools.create_static_storyboard_pages, scene=scene, obj=obj, **props)
+    return scene.view_layers[0].objects.active if obj is None else obj
+
+def add_storyboard_pages(scene=None, obj=None, num_pages=1, source_page=1):
+    """Add pages to a storyboard, using an existing page as template"""
+    scene = scene or bpy.context.scene
+    obj = obj or get_board_object(scene)
+    if obj is None:
+        raise RuntimeError(f'No storyboard object found in scene {scene.name}')
+    return run_operator(bpy.ops.storytools.storyboard_add_pages, scene=scene, obj=obj,
+                        num_pages=num_pages, source_page=source_page)
+
+def generate_animatic(scene=None, obj=None, **settings):
+    """Create the 'Animatic' scene from storyboard panels
+    settings: storytools.create_animatic_from_board properties (read_direction, resolution_x, frame_offset, fps)
+
+    return the animatic scene
+    """
+    scene = scene or bpy.context.scene
+    obj = obj or get_board_object(scene)
+    if obj is None:
+        raise RuntimeError(f'No storyboard object found in scene {scene.name}')
+    ## Single column board are read top to bottom
+    if settings.get('read_direction') is None and obj.get('stb_settings', {}).get('columns') == 1:
+        settings['read_direction'] = 'DOWN'
+    run_operator(bpy.ops.storytools.create_animatic_from_board, scene=scene, obj=obj, **settings)
+    return bpy.data.scenes.get('Animatic')
+
+def print_render_progress(dispatcher):
+    print(f'  Rendered pages: {dispatcher.done_count}/{dispatcher.total}')
+
+def render_storyboard(scene=None, filepath=None, set_range_to_marker=True, workers=1):
+    """Render storyboard pages images (one image per page camera marker)
+    filepath: output pattern, default to a folder named after the blend file
+    workers: number of background Blender processes rendering pages simultaneously (1: current session)
+    """
+    scene = scene or bpy.context.scene
+    filepath = filepath or get_default_render_path()
+    if not filepath:
+        raise RuntimeError('No render filepath given and blend file is not saved')
+    if workers <= 1:
+        result = render_storyboard_images(scene, filepath, set_range_to_marker=set_range_to_marker, invoke=False)
+        if 'FINISHED' not in result:
+            raise RuntimeError(f'render.render did not finish: {", ".join(sorted(result))}')
+        return result
+
+    dispatcher = render_storyboard_parallel(scene, filepath, workers)
+    if dispatcher is None:
+        raise RuntimeError(f'No storyboard page marker to render in scene {scene.name}')
+    try:
+        dispatcher.wait(callback=print_render_progress, interval=2.0)
+    finally:
+        dispatcher.cleanup()
+    if dispatcher.failures:
+        raise RuntimeError('\n'.join(f'Frames {frames} failed: {error}' for frames, error in dispatcher.failures))
+
+def process_files(filepaths, generate=None, add_pages=0, animatic=None, render=None, workers=1, save=False):
+    """Open each blend file and apply storyboard steps in order, in the current Blender session
+    generate: dict of generator settings (None: skip generation)
+    add_pages: number of pages to add (using first page as template)
+    animatic: dict of animatic settings (None: skip animatic)
+    render: render output pattern, '' for default path (None: skip render)
+    workers: number of parallel render processes
+    save: save the blend files after processing
+
+    return dict of failed filepath: error message
+    """
+    failures = {}
+    for i, filepath in enumerate(filepaths, start=1):
+        start_time = perf_counter()
+        print(f'[{i}/{len(filepaths)}] {filepath}')
+        try:
+            bpy.ops.wm.open_mainfile(filepath=str(Path(filepath).resolve()))
+            scene = bpy.context.scene
+
+            if generate is not None:
+                generate_static_storyboard(scene=scene, **generate)
+            if add_pages:
+                add_storyboard_pages(scene=scene, num_pages=add_pages)
+            ## Render before animatic (animatic become the active scene)
+            if render is not None:
+                render_storyboard(scene=scene, filepath=render or None, workers=workers)
+            if animatic is not None:
+                generate_animatic(scene=scene, **animatic)
+            if save:
+                bpy.ops.wm.save_mainfile()
+
+        except Exception as e:
+            print(f'  Failed: {e}')
+            failures[str(filepath)] = str(e)
+            continue
+
+        print(f'  Done in {perf_counter() - start_time:.2f}s')
+
+    return failures
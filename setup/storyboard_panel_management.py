@@ -13,6 +13,8 @@ from bpy_extras.view3d_utils import location_3d_to_region_2d, region_2d_to_vecto
 
 from .. import fn
 from . create_static_storyboard import notes_default_bodys
+from . import text_pool
+from .panel_index import get_panel_index, iter_content_drawings
 
 
 class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
@@ -69,35 +71,10 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
             self.report({'ERROR'}, 'No "Frames" layer found')
             return {'CANCELLED'}
         
-        dr = grid.current_frame().drawing
-        panel_strokes = [s for s in dr.strokes if s.material_index == self.material_index and len(s.points) == 4]
-        if not panel_strokes:
+        if not self.load_panels(context):
             self.report({'ERROR'}, 'No panel strokes found')
             return {'CANCELLED'}
         
-        self.panels = panel_strokes
-        self.number_of_panels = len(panel_strokes)
-        self.panel_coords = []
-        
-        # Get panel coordinates in 3D space
-        for stroke in panel_strokes:
-            coords = [p.position for p in stroke.points]
-            min_corner, max_corner = fn.get_min_max_corner(coords.copy())
-            center = (min_corner + max_corner) / 2
-            
-            # Calculate panel normal (assuming XZ plane)
-            # For a rectangular panel in XZ plane, normal is Y-axis
-            normal = Vector((0, 1, 0))
-            
-            # Store 3D coordinates for intersection testing
-            self.panel_coords.append({
-                'world_coords': coords,
-                'min_corner': min_corner,
-                'max_corner': max_corner,
-                'center': center,
-                'normal': normal
-            })
-        
         # Add two draw handlers: one for 3D and one for 2D elements
         self.draw_handle_3d = bpy.types.SpaceView3D.draw_handler_add(
             self.draw_callback_3d, (context,), 'WINDOW', 'POST_VIEW'
@@ -108,6 +85,44 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
         
         context.window_manager.modal_handler_add(self)
         return {'RUNNING_MODAL'}
+
+    def load_panels(self, context):
+        """Get panels coordinates in current read order from the panel index
+        Selected panels are kept when the read order changes
+        return False if no panel is found
+        """
+        board_obj = context.object
+        index = get_panel_index(board_obj, context.scene, self.material_index,
+                                read_direction=self.read_direction, point_count=4)
+        if not index:
+            return False
+
+        selected_curves = [self.panel_coords[i]['curve'] if i is not None else None
+                           for i in (self.selected_start, self.selected_end)]
+
+        dr = board_obj.data.layers.get('Frames').current_frame().drawing
+        offsets = fn.get_curve_offsets(dr)
+        positions = fn.get_attribute_array(dr.attributes['position'])
+
+        self.panel_index = index
+        self.panels = list(index.curves)
+        self.number_of_panels = len(index)
+        self.panel_coords = []
+        for curve, (min_corner, max_corner, center) in zip(index.curves, index.panels):
+            # Store 3D coordinates for intersection testing
+            self.panel_coords.append({
+                'world_coords': [Vector(co) for co in positions[offsets[curve]:offsets[curve + 1]]],
+                'min_corner': min_corner,
+                'max_corner': max_corner,
+                'center': center,
+                # For a rectangular panel in XZ plane, normal is Y-axis
+                'normal': Vector((0, 1, 0)),
+                'curve': curve,
+            })
+
+        self.selected_start, self.selected_end = (
+            self.panels.index(c) if c in self.panels else None for c in selected_curves)
+        return True
     
     def modal(self, context, event):
         context.area.tag_redraw()
@@ -153,6 +168,7 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
         elif event.type == 'R' and event.value == 'PRESS':
             # Toggle read direction
             self.read_direction = 'DOWN' if self.read_direction == 'RIGHT' else 'RIGHT'
+            self.load_panels(context)
             
         elif event.type in {'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE'} or event.type.startswith('NUMPAD'):
             # Pass through navigation
@@ -172,21 +188,17 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
         view_vector = region_2d_to_vector_3d(region, rv3d, mouse_pos)
         ray_origin = region_2d_to_location_3d(region, rv3d, mouse_pos, view_vector)
         
-        for i, panel in enumerate(self.panel_coords):
-            center = panel['center']
-            normal = panel['normal']
-            min_corner = panel['min_corner']
-            max_corner = panel['max_corner']
-            
-            # Find intersection with panel plane
-            intersection = intersect_line_plane(ray_origin, ray_origin + view_vector * 1000, center, normal)
-            
-            if intersection:
-                # Check if intersection point is within panel bounds
-                if (min_corner.x <= intersection.x <= max_corner.x and 
-                    min_corner.z <= intersection.z <= max_corner.z):
-                    return i
-        return None
+        if not self.panel_coords:
+            return None
+
+        # Find intersection with panels plane (all panels are on the board plane)
+        panel = self.panel_coords[0]
+        intersection = intersect_line_plane(ray_origin, ray_origin + view_vector * 1000, panel['center'], panel['normal'])
+        if intersection is None:
+            return None
+
+        # Get panel containing intersection point
+        return self.panel_index.panel_at(intersection)
     
     def draw_callback_3d(self, context):
         """Draw 3D panel rectangles in world space"""
@@ -357,38 +369,14 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
             self.report({'ERROR'}, 'Cannot stop offset at or beyond current total panels')
             return
 
-        # Get all frames
+        # Get all panels grouped by pages (camera boundaries) and sorted by read direction
         scn = context.scene
-        grid = board_obj.data.layers.get('Frames')
-        dr = grid.current_frame().drawing
-        panel_strokes = [s for s in dr.strokes if s.material_index == self.material_index and len(s.points) == 4]
-        frame_corners = [fn.get_min_max_corner([p.position for p in s.points]) for s in panel_strokes]
-        
-        # Add center as a third element in list
-        frames_coords = [(f[0], f[1], ((f[0] + f[1]) / 2)) for f in frame_corners]
-
-        # Group by pages (camera boundaries)
-        page_markers = [m for m in scn.timeline_markers if m.camera and m.name.startswith('stb_')]
-        page_list = []
-        for marker in page_markers:
-            panel_framing = []
-            camera = marker.camera
-            cam_frame = fn.get_cam_frame_world(camera, scene=scn)
-            cam_min, cam_max = fn.get_min_max_corner(cam_frame)
-
-            for i in range(len(frames_coords)-1,-1,-1):
-                frame_coord = frames_coords[i]
-                if fn.any_point_in_box(frame_coord, cam_min, cam_max):
-                    panel_framing.append(frames_coords.pop(i))
-            
-            page_list.append(panel_framing)
-
-        # Sort by read direction in each group
-        for frames_list in page_list:
-            if self.read_direction == 'RIGHT':
-                frames_list.sort(key=lambda vecs: (-vecs[2].z, vecs[2].x))
-            else:
-                frames_list.sort(key=lambda vecs: (vecs[2].x, -vecs[2].z))
+        index = get_panel_index(board_obj, scn, self.material_index,
+                                read_direction=self.read_direction, point_count=4)
+        if not index:
+            self.report({'ERROR'}, 'No panels found to offset')
+            return
+        page_list = index.page_list
         
         # Get storyboard collection objects
         stb_collection = scn.collection.children.get('Storyboard')
@@ -396,8 +384,8 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
         if stb_collection:
             all_objects = [o for o in stb_collection.all_objects if o.type != 'CAMERA' and o != board_obj]
 
-        # Concatenate all groups
-        panels = [coords for pages in page_list for coords in pages]
+        # All groups concatenated (panels outside pages are not offset)
+        panels = index.panels[:index.paged_count]
 
         if not panels:
             self.report({'ERROR'}, 'No panels found to offset')
@@ -435,13 +423,11 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
 
         for ob in all_objects:
             if ob.type == 'FONT':
-                loc = ob.matrix_world.translation
-                if fn.any_point_in_box([loc], 
-                        panels[panel_duplication_index][0], panels[panel_duplication_index][1]):
+                panel_id = index.panel_at(ob.matrix_world.translation)
+                if panel_id == panel_duplication_index:
                     moved_text_objects[ob] = ob.location.copy()
     
-                if fn.any_point_in_box([loc], 
-                        panels[panel_to_remove_index][0], panels[panel_to_remove_index][1]):
+                if panel_id == panel_to_remove_index:
                     to_remove_text_objects.append(ob)
     
         # In delete mode, remove content from the panel to be deleted before offsetting
@@ -449,24 +435,15 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
             panel_to_clear = panels[panel_to_remove_index]
             clear_min, clear_max, clear_center = panel_to_clear
             
-            for layer in board_obj.data.layers:
-                if layer.name == 'Frames':
-                    continue
-                frame = layer.current_frame()
-                if frame is None:
-                    continue
-                drawing = frame.drawing
-                strokes_to_remove = []
-                
-                for sid, stroke in enumerate(drawing.strokes):
-                    if any(clear_min.x <= p.position.x <= clear_max.x and 
-                           clear_min.z <= p.position.z <= clear_max.z for p in stroke.points):
-                        strokes_to_remove.append(sid)
+            ## On all keyframes (animated layers)
+            for drawing in iter_content_drawings(board_obj):
+                strokes_to_remove = np.flatnonzero(fn.strokes_in_box_mask(drawing, clear_min, clear_max)).tolist()
 
                 if strokes_to_remove:
                     drawing.remove_strokes(indices=strokes_to_remove)
     
-        # Single loop for both directions
+        # Single loop for both directions: offset vector of each moved panel (from source to target)
+        panel_offsets = {}
         for i in range(start_idx, stop_idx, step):
             source_idx = get_source_idx(i)
             target_idx = get_target_idx(i)
@@ -475,73 +452,46 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
             # Skip if source panel doesn't exist
             if source_idx >= len(panels):
                 continue
-                
-            source_panel = panels[source_idx]
-            target_panel = panels[target_idx]
-            
-            source_min, source_max, source_center = source_panel
-            target_min, target_max, target_center = target_panel
-            
-            # Calculate offset vector (from source to target)
-            offset_vector = target_center - source_center
-            
-            # Find grease pencil strokes to move from source panel
-            strokes_to_move = []
-            for layer in board_obj.data.layers:
-                if layer.name == 'Frames':
-                    continue
-                frame = layer.current_frame()
-                if frame is None:
-                    continue
-                drawing = frame.drawing
-                for stroke in drawing.strokes:
-                    if any(source_min.x <= p.position.x <= source_max.x and 
-                           source_min.z <= p.position.z <= source_max.z for p in stroke.points):
-                        strokes_to_move.append(stroke)
-
-            # Apply offset to grease pencil strokes
-            for stroke in strokes_to_move:
-                for point in stroke.points:
-                    point.position += offset_vector
-            
-            # Move 3D objects from source panel
-            if all_objects:
-                objects_to_move = []
-                
-                # Iterate backward through objects to safely remove during iteration
-                for ob_idx in range(len(all_objects)-1, -1, -1):
-                    obj = all_objects[ob_idx]
-                    
-                    # Check if object origin is within source panel bounds
-                    world_pos = obj.location
-                    if (source_min.x <= world_pos.x <= source_max.x and 
-                        source_min.z <= world_pos.z <= source_max.z):
-                        objects_to_move.append(all_objects.pop(ob_idx))
-                
-                # Apply panel offset to 3D objects
-                for obj in objects_to_move:
-                    obj.location += offset_vector
+
+            panel_offsets[source_idx] = panels[target_idx][2] - panels[source_idx][2]
+
+        # Move grease pencil strokes from their source panel, on all keyframes (animated layers)
+        # Offset of each panel over all panels of the index (strokes in panels outside pages are not moved)
+        offset_table = index.offset_table(panel_offsets)
+
+        for drawing in iter_content_drawings(board_obj):
+            stroke_panels = index.stroke_panels(drawing)
+            if not np.isin(stroke_panels, list(panel_offsets)).any():
+                continue
+            fn.translate_strokes(drawing, offset_table[stroke_panels])
+
+        # Move 3D objects from source panel (object origin within source panel bounds)
+        for obj in all_objects:
+            panel_id = index.panel_at(obj.location)
+            if panel_id in panel_offsets:
+                obj.location += panel_offsets[panel_id]
 
         # Add / remove text where needed
         stb_settings = board_obj.get('stb_settings')
         for obj, loc in moved_text_objects.items():
             new_obj = obj.copy()
-            new_obj.data = obj.data.copy()
             obj.users_collection[0].objects.link(new_obj)
             new_obj.location = loc
 
-            # Reset to initial text
+            # Reset to initial text (unedited texts share text data)
+            content = None
             if stb_settings:
-                content = None
                 if new_obj.name.startswith("stb_shot_num"):
-                    content = stb_settings.get("panel_header_left")
+                    kind, content = 'shot_num', stb_settings.get("panel_header_left")
                 elif new_obj.name.startswith("stb_panel_num"):
-                    content = stb_settings.get("panel_header_right")
+                    kind, content = 'panel_num', stb_settings.get("panel_header_right")
                 elif new_obj.name.startswith("panel_"):
-                    content = notes_default_bodys.get(stb_settings.get("note_text_format",''))
-                
-                if content is not None:
-                    new_obj.data.body = content
+                    kind, content = 'notes', notes_default_bodys.get(stb_settings.get("note_text_format",''))
+
+            if content is not None:
+                new_obj.data = text_pool.get_pooled_text_data(kind, content, source=obj.data)
+            else:
+                new_obj.data = obj.data.copy()
 
         # Remove text in destination panel after offset to avoid duplication
         for obj in reversed(to_remove_text_objects):
@@ -576,36 +526,18 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
         offset_a_to_b = center_b - center_a
         offset_b_to_a = center_a - center_b
         
-        # Collect strokes from both panels
-        strokes_a = []
-        strokes_b = []
-        
-        for layer in board_obj.data.layers:
-            if layer.name == 'Frames':
+        # Swap strokes from both panels, on all keyframes (animated layers)
+        for drawing in iter_content_drawings(board_obj):
+            # Check if stroke is in panel A, else in panel B
+            in_a = fn.strokes_in_box_mask(drawing, min_a, max_a)
+            in_b = ~in_a & fn.strokes_in_box_mask(drawing, min_b, max_b)
+            if not in_a.any() and not in_b.any():
                 continue
-            frame = layer.current_frame()
-            if frame is None:
-                continue
-            drawing = frame.drawing
-            
-            for stroke in drawing.strokes:
-                # Check if stroke is in panel A
-                if any(min_a.x <= p.position.x <= max_a.x and 
-                       min_a.z <= p.position.z <= max_a.z for p in stroke.points):
-                    strokes_a.append(stroke)
-                # Check if stroke is in panel B
-                elif any(min_b.x <= p.position.x <= max_b.x and 
-                         min_b.z <= p.position.z <= max_b.z for p in stroke.points):
-                    strokes_b.append(stroke)
-        
-        # Apply swaps
-        for stroke in strokes_a:
-            for point in stroke.points:
-                point.position += offset_a_to_b
-        
-        for stroke in strokes_b:
-            for point in stroke.points:
-                point.position += offset_b_to_a
+
+            stroke_offsets = np.zeros((len(in_a), 3), dtype=np.float32)
+            stroke_offsets[in_a] = offset_a_to_b
+            stroke_offsets[in_b] = offset_b_to_a
+            fn.translate_strokes(drawing, stroke_offsets)
         
         # Swap 3D objects
         scn = context.scene
@@ -617,14 +549,12 @@ class STORYTOOLS_OT_storyboard_offset_panel_modal(Operator):
             objects_b = []
             
             for obj in all_objects:
-                world_pos = obj.location
+                panel_id = self.panel_index.panel_at(obj.location)
                 # Check if object is in panel A
-                if (min_a.x <= world_pos.x <= max_a.x and 
-                    min_a.z <= world_pos.z <= max_a.z):
+                if panel_id == self.selected_start:
                     objects_a.append(obj)
                 # Check if object is in panel B
-                elif (min_b.x <= world_pos.x <= max_b.x and 
-                      min_b.z <= world_pos.z <= max_b.z):
+                elif panel_id == self.selected_end:
                     objects_b.append(obj)
             
             # Apply swaps to objects
@@ -0,0 +1,172 @@
+## Pooled text datablocks for generated storyboard texts (panel notes, panel headers, page headers/footers)
+## Text objects with the same default body share a single curve datablock,
+## an object only gets its own datablock once the user edits its text
+
+import bpy
+from bpy.app.handlers import persistent
+
+POOL_PREFIX = 'stb_pool_'
+
+## Custom property storing the default body of a pooled datablock
+POOL_BODY_KEY = 'stb_pool_body'
+
+## Owner of the edit mode msgbus subscription (for clearing)
+_msgbus_owner = object()
+
+
+def is_pooled(text_data):
+    return text_data.get(POOL_BODY_KEY) is not None
+
+## Pooled datablock name per (kind, default body, text style), filled with a single scan of curves on first lookup
+## and reset on file load/undo (None: not built)
+_pool_names = None
+
+def clear_pool_names():
+    global _pool_names
+    _pool_names = None
+
+def get_text_style(text_data):
+    '''Return layout of a text datablock (size, alignment, text box width, font) as a string
+    pooled datablocks are only shared between texts of the same style'''
+    width = text_data.text_boxes[0].width if len(text_data.text_boxes) else 0.0
+    font = text_data.font.name if text_data.font else ''
+    return f'{text_data.size:.4f}|{text_data.align_x}|{text_data.align_y}|{width:.4f}|{font}'
+
+def get_pooled_text_data(kind, body, source=None):
+    '''Return the shared text datablock for generated texts of this kind with this default body
+    kind: type of generated text ('notes', 'shot_num', 'panel_num', 'page_header_left'...)
+    source: text datablock to take the style from (copied when there is no pooled datablock with this style),
+        when None any style is accepted and a new datablock is created if missing (style set by the caller)
+    '''
+    global _pool_names
+    name = f'{POOL_PREFIX}{kind}'
+    if _pool_names is None:
+        _pool_names = {}
+        for text_data in bpy.data.curves:
+            if text_data.name.startswith(POOL_PREFIX) and (pool_body := text_data.get(POOL_BODY_KEY)) is not None:
+                key = (text_data.name.rstrip('.0123456789'), pool_body, get_text_style(text_data))
+                _pool_names.setdefault(key, text_data.name)
+
+    style = get_text_style(source) if source is not None else None
+    ## Source already pooled with this body
+    if source is not None and source.get(POOL_BODY_KEY) == body and source.name.startswith(name):
+        return source
+
+    for (pool_name, pool_body, pool_style), data_name in _pool_names.items():
+        if pool_name != name or pool_body != body or (style is not None and pool_style != style):
+            continue
+        text_data = bpy.data.curves.get(data_name)
+        ## Renamed, removed, unshared or restyled since indexed
+        if text_data is not None and text_data.get(POOL_BODY_KEY) == body and (style is None or get_text_style(text_data) == style):
+            return text_data
+
+    if source is not None:
+        text_data = source.copy()
+        text_data.name = name
+    else:
+        text_data = bpy.data.curves.new(name, 'FONT')
+    text_data.body = body
+    text_data[POOL_BODY_KEY] = body
+    _pool_names[(name, body, get_text_style(text_data))] = text_data.name
+    return text_data
+
+def use_pooled_text_data(obj, kind, body):
+    '''Link a text object to the pooled datablock when its text is still the default body
+    (objects created before pooling, their unique datablock is left for orphan cleanup)'''
+    text_data = obj.data
+    if is_pooled(text_data) or text_data.body != body:
+        return
+    obj.data = get_pooled_text_data(kind, body)
+
+def unshare_text_data(obj):
+    '''Give its own text datablock to a pooled object, keeping current body
+    Restore default body on the pooled datablock
+    '''
+    text_data = obj.data
+    body = text_data.body
+    default_body = text_data[POOL_BODY_KEY]
+    if text_data.users > 1:
+        text_data.body = default_body
+        text_data = text_data.copy()
+        text_data.body = body
+        obj.data = text_data
+    del text_data[POOL_BODY_KEY]
+    text_data.name = obj.name
+
+@persistent
+def unshare_edited_text(scene, depsgraph):
+    '''Fallback for pooled texts edited without entering edit mode (ex: body set from python):
+    move the edited text on its own datablock and restore the pooled one'''
+    if not depsgraph.id_type_updated('CURVE'):
+        return
+    ob = bpy.context.object
+    if not ob or ob.type != 'FONT' or ob.mode != 'OBJECT':
+        return
+    text_data = ob.data
+    default_body = text_data.get(POOL_BODY_KEY)
+    if default_body is None or text_data.body == default_body:
+        return
+    unshare_text_data(ob)
+
+def is_edited_pooled_text(ob):
+    return ob and ob.type == 'FONT' and ob.mode == 'EDIT' and is_pooled(ob.data) and ob.data.users > 1
+
+def unshare_edited_object():
+    '''Timer: leave edit mode to give its own datablock to the edited pooled text, then re-enter edit mode'''
+    ob = bpy.context.object
+    if not is_edited_pooled_text(ob):
+        return
+    window = bpy.context.window or next(iter(bpy.context.window_manager.windows), None)
+    if window is None:
+        return
+    with bpy.context.temp_override(window=window):
+        bpy.ops.object.mode_set(mode='OBJECT')
+        unshare_text_data(ob)
+        bpy.ops.object.mode_set(mode='EDIT')
+
+def unshare_on_edit_mode():
+    '''Msgbus callback on object mode change: a pooled text entering edit mode gets its own datablock
+    before any key is typed (edit text is stored on the shared datablock, displayed on all panels)
+    Operators are not run from the notification, mode switch is deferred to a timer'''
+    if is_edited_pooled_text(bpy.context.object) and not bpy.app.timers.is_registered(unshare_edited_object):
+        bpy.app.timers.register(unshare_edited_object, first_interval=0)
+
+def subscribe_edit_mode():
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.Object, 'mode'),
+        owner=_msgbus_owner,
+        args=(),
+        notify=unshare_on_edit_mode,
+        options={'PERSISTENT'},
+    )
+
+@persistent
+def text_pool_load_handler(dummy):
+    clear_pool_names()
+    ## Subscriptions are cleared when opening a file
+    subscribe_edit_mode()
+
+@persistent
+def text_pool_undo_handler(*args):
+    clear_pool_names()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(unshare_edited_text)
+    bpy.app.handlers.load_post.append(text_pool_load_handler)
+    bpy.app.handlers.undo_post.append(text_pool_undo_handler)
+    bpy.app.handlers.redo_post.append(text_pool_undo_handler)
+    if not bpy.app.background:
+        bpy.app.timers.register(subscribe_edit_mode, first_interval=1)
+
+def unregister():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    if bpy.app.timers.is_registered(unshare_edited_object):
+        bpy.app.timers.unregister(unshare_edited_object)
+    for handlers, handler in ((bpy.app.handlers.redo_post, text_pool_undo_handler),
+                              (bpy.app.handlers.undo_post, text_pool_undo_handler),
+                              (bpy.app.handlers.load_post, text_pool_load_handler),
+                              (bpy.app.handlers.depsgraph_update_post, unshare_edited_text)):
+        if handler in handlers:
+            handlers.remove(handler)
+    clear_pool_names()
@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+## Command line entry to process multiple blend files in a single Blender session
+## (Storytools addon must be enabled in user preferences)
+##
+## Usage:
+## blender -b --python storyboard_batch_cli.py -- [options] file1.blend file2.blend ...
+##
+## Examples:
+## Regenerate boards with 4 rows, then render pages in default folder next to each file
+## blender -b --python storyboard_batch_cli.py -- --generate --set rows=4 --render "" *.blend
+## Render pages with 8 parallel processes
+## blender -b --python storyboard_batch_cli.py -- --render //pages/page_#### --workers 8 board.blend
+## Add 2 pages and create animatic scene, then save
+## blender -b --python storyboard_batch_cli.py -- --add-pages 2 --animatic --save board.blend
+
+import sys
+import argparse
+import importlib
+import addon_utils
+
+from ast import literal_eval
+from pathlib import Path
+
+
+def get_storytools_module():
+    """Return the Storytools addon package, enable it if needed"""
+    addon_dir = Path(__file__).resolve().parent
+    for module in addon_utils.modules():
+        if Path(module.__file__).resolve().parent != addon_dir:
+            continue
+        if not addon_utils.check(module.__name__)[1]:
+            addon_utils.enable(module.__name__, default_set=False)
+        return importlib.import_module(module.__name__)
+
+    raise ModuleNotFoundError(f'Storytools addon not found in Blender addons/extensions (searched: {addon_dir})')
+
+def parse_settings(settings):
+    """Convert list of "name=value" strings to a dict (values evaluated as python literals when possible)"""
+    result = {}
+    for item in settings or []:
+        name, _, value = item.partition('=')
+        try:
+            result[name.strip()] = literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            result[name.strip()] = value.strip()
+    return result
+
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    parser = argparse.ArgumentParser(prog='blender -b --python storyboard_batch_cli.py --',
+                                     description='Generate and render Storytools storyboards in batch')
+    parser.add_argument('files', nargs='+', help='Blend files to process')
+    parser.add_argument('--generate', action='store_true', help='Generate or regenerate the static storyboard')
+    parser.add_argument('--set', dest='settings', action='append', metavar='NAME=VALUE',
+                        help='Storyboard generation setting (repeatable), e.g. --set rows=4 --set num_pages=10')
+    parser.add_argument('--add-pages', type=int, default=0, metavar='COUNT', help='Number of pages to add')
+    parser.add_argument('--animatic', action='store_true', help='Create the animatic scene from storyboard panels')
+    parser.add_argument('--animatic-set', dest='animatic_settings', action='append', metavar='NAME=VALUE',
+                        help='Animatic setting (repeatable), e.g. --animatic-set fps=25')
+    parser.add_argument('--render', metavar='PATH', default=None,
+                        help='Render pages to output pattern ("" for a folder named after each blend file)')
+    parser.add_argument('--workers', type=int, default=1, metavar='COUNT',
+                        help='Number of background Blender processes rendering pages in parallel')
+    parser.add_argument('--save', action='store_true', help='Save blend files after processing')
+    args = parser.parse_args(argv)
+
+    storytools = get_storytools_module()
+    storyboard_batch = importlib.import_module(f'{storytools.__name__}.setup.storyboard_batch')
+
+    generate = parse_settings(args.settings) if args.generate or args.settings else None
+    animatic = parse_settings(args.animatic_settings) if args.animatic or args.animatic_settings else None
+
+    failures = storyboard_batch.process_files(args.files,
+                                              generate=generate,
+                                              add_pages=args.add_pages,
+                                              animatic=animatic,
+                                              render=args.render,
+                                              workers=args.workers,
+                                              save=args.save)
+
+    print(f'\n{len(args.files) - len(failures)}/{len(args.files)} files processed')
+    for filepath, error in failures.items():
+        print(f'Failed: {filepath}\n  {error}')
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
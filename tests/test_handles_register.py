@@ -0,0 +1,31 @@
+import sys
+import importlib
+from pathlib import Path
+
+import pytest
+
+bpy = pytest.importorskip('bpy')
+
+ADDON_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope='module')
+def handles():
+    sys.path.insert(0, str(ADDON_DIR.parent))
+    try:
+        yield importlib.import_module(f'{ADDON_DIR.name}.handles')
+    finally:
+        sys.path.remove(str(ADDON_DIR.parent))
+
+
+def test_register_unregister(handles):
+    handles.register()
+    try:
+        assert handles.drawing_plane_depsgraph_update in bpy.app.handlers.depsgraph_update_post
+        for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+            assert handles.drawing_plane_reset_handler in handlers
+    finally:
+        handles.unregister()
+
+    assert handles.drawing_plane_depsgraph_update not in bpy.app.handlers.depsgraph_update_post
+    assert handles.drawing_plane_reset_handler not in bpy.app.handlers.undo_post
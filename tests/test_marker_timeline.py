@@ -0,0 +1,79 @@
+import sys
+import importlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+## Tests are collected inside the add-on package, which requires bpy
+bpy = pytest.importorskip('bpy')
+
+ADDON_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope='module')
+def marker_timeline():
+    sys.path.insert(0, str(ADDON_DIR.parent))
+    try:
+        yield importlib.import_module(f'{ADDON_DIR.name}.setup.marker_timeline')
+    finally:
+        sys.path.remove(str(ADDON_DIR.parent))
+
+
+class Markers:
+    '''Minimal timeline markers collection (foreach_get/foreach_set on frame and select)'''
+
+    def __init__(self, frames):
+        self.values = {'frame': np.array(frames, dtype=np.int32), 'select': np.zeros(len(frames), dtype=bool)}
+
+    def __len__(self):
+        return len(self.values['frame'])
+
+    def foreach_get(self, attr, seq):
+        seq[:] = self.values[attr]
+
+    def foreach_set(self, attr, seq):
+        self.values[attr][:] = seq
+
+
+class Scene:
+    def __init__(self, frames):
+        self.timeline_markers = Markers(frames)
+
+
+@pytest.fixture
+def scene():
+    ## Unsorted marker collection
+    return Scene([30, 1, 10, 20, 40])
+
+
+def test_offset_range(marker_timeline, scene):
+    timeline = marker_timeline.MarkerTimeline(scene)
+    timeline.offset_range(10, 30, 5)
+    assert timeline.moved_count() == 3
+    timeline.apply(select_moved=True)
+    assert scene.timeline_markers.values['frame'].tolist() == [35, 1, 15, 25, 40]
+    assert scene.timeline_markers.values['select'].tolist() == [True, False, True, True, False]
+    np.testing.assert_array_equal(timeline.frames, [1, 15, 25, 35, 40])
+
+
+def test_offset_range_maps_keyframes(marker_timeline, scene):
+    timeline = marker_timeline.MarkerTimeline(scene)
+    timeline.offset_range(10, 30, -2)
+    np.testing.assert_array_equal(timeline.map_frames([5, 10, 25, 30, 31]), [5, 8, 23, 28, 31])
+
+
+def test_push(marker_timeline, scene):
+    timeline = marker_timeline.MarkerTimeline(scene)
+    timeline.push(20, 10)
+    timeline.apply()
+    assert scene.timeline_markers.values['frame'].tolist() == [40, 1, 10, 20, 50]
+    np.testing.assert_array_equal(timeline.map_frames([20, 21]), [20, 31])
+
+
+def test_compress_and_dilate(marker_timeline, scene):
+    timeline = marker_timeline.MarkerTimeline(scene)
+    timeline.compress()
+    np.testing.assert_array_equal(timeline.new_frames, [1, 9, 18, 27, 36])
+    timeline.dilate()
+    np.testing.assert_array_equal(timeline.new_frames, [1, 11, 22, 33, 44])
@@ -0,0 +1,37 @@
+import sys
+import importlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+bpy = pytest.importorskip('bpy')
+
+ADDON_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope='module')
+def panel_index():
+    sys.path.insert(0, str(ADDON_DIR.parent))
+    try:
+        yield importlib.import_module(f'{ADDON_DIR.name}.setup.panel_index')
+    finally:
+        sys.path.remove(str(ADDON_DIR.parent))
+
+
+def test_offset_table_with_unpaged_panels(panel_index):
+    ## Three panels in a row, only the first one inside the page
+    rects = np.array([(0, 0, 1, 1), (2, 0, 3, 1), (4, 0, 5, 1)], dtype=np.float64)
+    page_rects = np.array([(-0.5, -0.5, 1.5, 1.5)], dtype=np.float64)
+    index = panel_index.PanelIndex(rects, np.zeros(3), np.arange(3), page_rects)
+    assert index.paged_count == 1
+    assert len(index.page_list[0]) == 1
+
+    ## Content strokes in the paged panel, in the last unpaged panel and outside all panels
+    stroke_panels = index.panels_at(((0.5, 0.5), (4.5, 0.5), (10, 10)))
+    assert stroke_panels[1] >= index.paged_count
+    assert stroke_panels[2] == -1
+
+    table = index.offset_table({0: (1, 0, 0)})
+    offsets = table[stroke_panels]
+    np.testing.assert_array_equal(offsets, [(1, 0, 0), (0, 0, 0), (0, 0, 0)])